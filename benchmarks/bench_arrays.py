@@ -0,0 +1,79 @@
+"""Measure builtins on a Array against the same work on a list of boxed Numbers.
+
+Run with `python -m benchmarks.bench_arrays [elements]`.
+
+The column is a Array from `numbers`, like a column of numbers from a log,
+or a list of `Number` objects with every builtin called once per element.
+The memory kept by the column and the peak while making it are traced,
+the peak includes splitting the text.
+"""
+
+import sys
+import tracemalloc
+
+from bsharp import object
+from bsharp.builtins import BUILTINS
+from benchmarks.bench_engines import best_of
+
+TWO = object.makeNumber(2)
+LIMIT = object.makeNumber(500)
+LT = object.makeString("lt")
+
+
+def boxed_tasks(column: list[object.Number]) -> dict:
+    """Return every task on a list of Numbers, a builtin call per element."""
+    add, multiply, less = BUILTINS["+"], BUILTINS["*"], BUILTINS["lt"]
+    return {
+        "sum": lambda: add(column),
+        "multiply": lambda: [multiply([value, TWO]) for value in column],
+        "filter": lambda: [
+            value for value in column if less([value, LIMIT]) is object.CONST_TRUE
+        ],
+    }
+
+
+def array_tasks(column: object.Array) -> dict:
+    """Return every task on a Array, a single builtin call."""
+    return {
+        "sum": lambda: BUILTINS["sum"]([column]),
+        "multiply": lambda: BUILTINS["*"]([column, TWO]),
+        "filter": lambda: BUILTINS["filter"]([LT, column, LIMIT]),
+    }
+
+
+def memory(make) -> str:
+    """Return the memory in MB kept by a column and the peak of making it."""
+    tracemalloc.start()
+    column = make()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del column
+    return f"{kept / 2**20:.1f} MB (peak {peak / 2**20:.1f} MB)"
+
+
+def main() -> None:
+    """Print the time of every task and the memory of both columns."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    text = object.makeString(" ".join(str(index % 1000) for index in range(count)))
+
+    def makeBoxed() -> list[object.Number]:
+        return [object.makeNumber(int(field)) for field in text.value.split()]
+
+    def makeArray() -> object.Array:
+        return BUILTINS["numbers"]([text])
+
+    boxed = boxed_tasks(makeBoxed())
+    arrays = array_tasks(makeArray())
+    for task in boxed:
+        before = best_of(boxed[task], 3)
+        after = best_of(arrays[task], 3)
+        print(
+            f"{task:>8}: boxed {before * 1000:.1f} ms | array {after * 1000:.1f} ms "
+            f"({before / after:.1f}x)"
+        )
+
+    print(f"  memory: boxed {memory(makeBoxed)} | array {memory(makeArray)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Measure the memory per node of the syntax tree layouts.
+
+Run with `python -m benchmarks.bench_ast_memory [forms]`.
+
+Tokens and value strings are shared by every layout and are not counted,
+only the nodes and the lists or arrays holding them.
+"""
+
+import sys
+import tracemalloc
+
+from bsharp import ast
+from bsharp import lexer
+from bsharp import parser
+from benchmarks.workloads import arithmetic_program
+
+
+class DictNode:
+    """Node as it was before `__slots__`, every instance carries a `__dict__`."""
+
+
+def children_of(node: ast.Expression) -> list:
+    """Return the lists of children of a node."""
+    match node:
+        case ast.Program():
+            return [node.expressions]
+        case ast.ArrayExpression():
+            return [node.elements]
+        case ast.CallExpression():
+            return [node.args]
+        case ast.FunctionExpression():
+            return [node.args, node.body]
+    return []
+
+
+def copy_tree(program: ast.Program, make) -> tuple[object, int]:
+    """Copy every node of the tree with `make(node)`, return the copy and node count.
+
+    Children lists are copied as well, the copy holds the same tokens and values.
+    """
+    copies = {}
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        copies[id(node)] = make(node)
+        for children in children_of(node):
+            stack.extend(child for child in children if child is not None)
+
+    for copy in copies.values():
+        for name in ("expressions", "elements", "args", "body"):
+            children = getattr(copy, name, None)
+            if children is not None:
+                setattr(copy, name, [copies.get(id(child)) for child in children])
+
+    return copies[id(program)], len(copies)
+
+
+def make_slotted(node: ast.Expression) -> ast.Expression:
+    """Copy a node as the same slotted class."""
+    copy = object.__new__(type(node))
+    for cls in type(node).__mro__[:-1]:
+        for name in cls.__slots__:
+            if hasattr(node, name):
+                setattr(copy, name, getattr(node, name))
+    return copy
+
+
+def make_dict(node: ast.Expression) -> DictNode:
+    """Copy a node as a DictNode."""
+    copy = DictNode()
+    for cls in type(node).__mro__[:-1]:
+        for name in cls.__slots__:
+            if hasattr(node, name):
+                setattr(copy, name, getattr(node, name))
+    return copy
+
+
+def retained(build) -> tuple[int, object]:
+    """Return the bytes allocated by `build()` and still held, and it's result."""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def main() -> None:
+    """Print the memory per node of every layout."""
+    forms = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    source = arithmetic_program(forms)
+    program = parser.Parser(
+        lexer.Lexer(source, backend=lexer.BACKEND_REGEX),
+        mode=parser.MODE_ITERATIVE,
+    ).parse_program()
+
+    dict_size, (_, count) = retained(lambda: copy_tree(program, make_dict))
+    slotted_size, _ = retained(lambda: copy_tree(program, make_slotted)[0])
+    arena_size, arena = retained(lambda: ast.Arena.from_program(program))
+
+    print(f"{count} nodes ({len(arena)} arena nodes, including argument arrays)")
+    for name, size in (
+        ("__dict__ nodes", dict_size),
+        ("__slots__ nodes", slotted_size),
+        ("Arena", arena_size),
+    ):
+        print(
+            f"{name:>16}: {size / (1024 * 1024):7.1f} MB,"
+            f" {size / count:6.1f} bytes/node"
+        )
+
+
+if __name__ == "__main__":
+    main()
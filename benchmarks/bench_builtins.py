@@ -0,0 +1,48 @@
+"""Measure calls to builtins, resolved once per call site.
+
+Run with `python -m benchmarks.bench_builtins`.
+
+Every builtin is first called on it's own with 2 and 32 arguments,
+then every program is parsed and compiled ahead of time and only running it is measured.
+"""
+
+import timeit
+
+from bsharp import object
+from bsharp.builtins import BUILTINS
+from benchmarks.bench_engines import best_of, engines, parse
+from benchmarks.workloads import (
+    arithmetic_heavy_program,
+    constant_heavy_program,
+    variadic_program,
+)
+
+
+def main() -> None:
+    """Print the time of every builtin, then of every engine on every workload."""
+    for name in ("+", "-", "*", "/"):
+        results = []
+        for count in (2, 32):
+            args = [object.Number(i % 10 + 1) for i in range(count)]
+            seconds = min(
+                timeit.repeat(lambda: BUILTINS[name](args), number=10_000, repeat=10)
+            )
+            results.append(f"{count} arguments {seconds / 10_000 * 1e9:.0f}ns")
+        print(f"{name:>12}: " + " | ".join(results))
+
+    workloads = {
+        "arithmetic": arithmetic_heavy_program(5_000),
+        "in functions": constant_heavy_program(5_000),
+        "2 arguments": variadic_program(10_000, 2),
+        "32 arguments": variadic_program(2_000, 32),
+    }
+
+    for name, source in workloads.items():
+        runs = engines(parse(source))
+        times = {engine: best_of(run, 10) for engine, run in runs.items()}
+        results = [f"{engine} {seconds:.4f}s" for engine, seconds in times.items()]
+        print(f"{name:>12}: " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Measure loading scripts from the cache against parsing them.
+
+Run with `python -m benchmarks.bench_cache`.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from bsharp import cache
+from benchmarks.bench_engines import best_of
+from benchmarks.workloads import write_program
+
+
+def main() -> None:
+    """Print the time to parse and to load every script from the cache."""
+    with tempfile.TemporaryDirectory() as directory:
+        for megabytes in (0.01, 0.1, 1):
+            script = Path(directory) / f"script-{megabytes}.bs"
+            write_program(str(script), megabytes)
+
+            cold = best_of(lambda: cache.parse_file(script, cache=False))
+            cache.parse_file(script)
+            warm = best_of(lambda: cache.parse_file(script))
+
+            size = os.path.getsize(cache.cache_path(script))
+            print(
+                f"{megabytes:>5} MB: parse {cold:.4f}s | cache {warm:.4f}s "
+                f"({cold / warm:.1f}x) | cache file {size / 2**20:.2f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
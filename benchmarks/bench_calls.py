@@ -0,0 +1,45 @@
+"""Measure the cost of calls to user functions, with few and many globals.
+
+Run with `python -m benchmarks.bench_calls`.
+
+The globals and the functions are declared once, only the calls are measured.
+"""
+
+from bsharp.closures import ClosureCompiler
+from bsharp.compiler import Compiler
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.vm import VM
+from benchmarks.bench_engines import best_of, parse
+from benchmarks.workloads import call_heavy_program, globals_program
+
+CALLS = 20_000
+
+
+def main() -> None:
+    """Print calls per second of every engine."""
+    calls = parse(call_heavy_program(CALLS))
+    evaluator, compiled = Evaluator(), ClosureCompiler().compile(calls)
+    vm, code = VM(), Compiler().compile(calls)
+
+    for variables in (0, 1_000):
+        setup = parse(globals_program(variables))
+        environments = {}
+        for engine in ("eval", "closures", "vm"):
+            environments[engine] = Environment()
+            Evaluator().eval(setup, environments[engine])
+
+        runs = {
+            "eval": lambda: evaluator.eval(calls, environments["eval"]),
+            "closures": lambda: compiled(environments["closures"]),
+            "vm": lambda: vm.run(code, environments["vm"]),
+        }
+        results = [
+            f"{engine} {CALLS / best_of(run, repeat=7) / 1000:.0f}k calls/s"
+            for engine, run in runs.items()
+        ]
+        print(f"{variables:>5} globals: " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    main()
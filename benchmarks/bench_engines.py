@@ -0,0 +1,77 @@
+"""Measure the execution engines on call-heavy and arithmetic-heavy programs.
+
+Run with `python -m benchmarks.bench_engines`.
+
+Every program is parsed and compiled ahead of time, only running it is measured.
+"""
+
+import time
+
+from bsharp import ast
+from bsharp import lexer
+from bsharp import parser
+from bsharp.closures import ClosureCompiler
+from bsharp.compiler import Compiler
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.vm import VM
+from benchmarks.workloads import (
+    arithmetic_heavy_program,
+    call_heavy_program,
+    recursive_program,
+)
+
+
+def parse(source: str) -> ast.Program:
+    """Parse the source into a Program."""
+    return parser.Parser(
+        lexer.Lexer(source, backend=lexer.BACKEND_REGEX)
+    ).parse_program()
+
+
+def engines(program: ast.Program) -> dict:
+    """Return a function running the program for every engine."""
+    evaluator = Evaluator()
+    arena = ast.Arena.from_program(program)
+    compiled = ClosureCompiler().compile(program)
+    code = Compiler().compile(program)
+    vm = VM()
+
+    return {
+        "eval": lambda: evaluator.eval(program, Environment()),
+        "arena": lambda: evaluator.evalArena(arena, Environment()),
+        "closures": lambda: compiled(Environment()),
+        "vm": lambda: vm.run(code, Environment()),
+    }
+
+
+def best_of(run, repeat: int = 5) -> float:
+    """Return the best time out of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Print the time of every engine on every workload."""
+    workloads = {
+        "calls": call_heavy_program(20_000),
+        "fib 18": recursive_program(18),
+        "arithmetic": arithmetic_heavy_program(5_000),
+    }
+
+    for name, source in workloads.items():
+        runs = engines(parse(source))
+        times = {engine: best_of(run) for engine, run in runs.items()}
+        results = [
+            f"{engine} {seconds:.3f}s ({times['eval'] / seconds:.1f}x)"
+            for engine, seconds in times.items()
+        ]
+        print(f"{name:>10}: " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    main()
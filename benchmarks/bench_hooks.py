@@ -0,0 +1,52 @@
+"""Measure the cost of evaluating with hooks.
+
+Run with `python -m benchmarks.bench_hooks [n]`.
+
+`(fib n)` is evaluated by the plain Evaluator, by a HookedEvaluator with no
+callbacks, and with callbacks counting every call and every node.
+"""
+
+import sys
+
+from bsharp import ast
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.hooks import HookedEvaluator, Hooks
+from benchmarks.bench_engines import best_of, parse
+
+
+def main() -> None:
+    """Print the time of every evaluator."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    program = parse(
+        f"(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2))))) (fib {n})"
+    )
+
+    counts = {"calls": 0, "nodes": 0}
+
+    def count(key: str):
+        def counter(*_) -> None:
+            counts[key] += 1
+
+        return counter
+
+    counting = Hooks()
+    counting.on_call(count("calls"))
+    for kind in (ast.CallExpression, ast.IdentifierExpression, ast.NumberExpression):
+        counting.on_node(kind, count("nodes"))
+
+    evaluators = {
+        "Evaluator": Evaluator,
+        "no callbacks": lambda: HookedEvaluator(Hooks()),
+        "counting": lambda: HookedEvaluator(counting),
+    }
+    plain = None
+    for name, make in evaluators.items():
+        seconds = best_of(lambda: make().eval(program, Environment()), 3)
+        plain = plain or seconds
+        print(f"{name:>12}: {seconds * 1000:.1f} ms ({seconds / plain:.2f}x)")
+    print(f"per run: {counts['calls'] // 3} calls, {counts['nodes'] // 3} nodes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measure the time to parse a file again after typing a character.
+
+Run with `python -m benchmarks.bench_incremental [functions]`.
+
+The file declares and calls many functions, a digit is typed into a number in
+it's middle every run, so the changed form was never parsed before.
+`Parser` parses the whole file again, `IncrementalParser` only the changed form,
+given the edit or finding it by comparing the sources.
+"""
+
+import sys
+import time
+
+from bsharp.incremental import IncrementalParser
+from bsharp.lexer import BACKEND_REGEX, Lexer
+from bsharp.parser import Parser
+from benchmarks.bench_engines import best_of
+from benchmarks.workloads import many_functions_program
+
+RUNS = 5
+
+
+def main() -> None:
+    """Print the time of every way of parsing the edited file, for growing files."""
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    for functions in (largest // 16, largest // 4, largest):
+        source = many_functions_program(functions)
+        full = best_of(
+            lambda: Parser(Lexer(source, backend=BACKEND_REGEX)).parse_program(), 3
+        )
+
+        incremental = IncrementalParser()
+        incremental.parse(source)
+        middle = source.index(" 1)", len(source) // 2) + 1
+        edits = compares = float("inf")
+        for run in range(2 * RUNS):
+            # Typing a digit, the number grows by a character every run.
+            start = time.perf_counter()
+            if run % 2:
+                incremental.parse(source[:middle] + "7" + source[middle:])
+                compares = min(compares, time.perf_counter() - start)
+            else:
+                incremental.edit(middle, middle, "7")
+                edits = min(edits, time.perf_counter() - start)
+            source = incremental.source
+            assert incremental.reparsed == 1
+
+        print(
+            f"{len(source) / 1024:>6.0f} KB: Parser {full * 1000:7.1f} ms | "
+            f"edit {edits * 1000:5.2f} ms | compare {compares * 1000:5.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
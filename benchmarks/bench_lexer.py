@@ -0,0 +1,47 @@
+"""Measure the throughput of the lexer backends in MB/s.
+
+Run with `python -m benchmarks.bench_lexer [megabytes]`.
+"""
+
+import sys
+import time
+
+from bsharp import lexer
+from bsharp import token
+from benchmarks.workloads import program_of_bytes
+
+
+def lex_all(source: str, backend: str) -> int:
+    """Lex the whole source and return the number of tokens produced."""
+    l = lexer.Lexer(source, backend=backend)
+    count = 0
+    while l.nextToken().getType() != token.EOF:
+        count += 1
+    return count
+
+
+def measure(source: str, backend: str, repeat: int = 3) -> tuple[float, int]:
+    """Return the best MB/s out of `repeat` runs and the token count."""
+    megabytes = len(source.encode()) / (1024 * 1024)
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = lex_all(source, backend)
+        best = min(best, time.perf_counter() - start)
+    return megabytes / best, count
+
+
+def main() -> None:
+    """Print the throughput of every backend."""
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    source = program_of_bytes(megabytes)
+
+    print(f"input: {len(source.encode()) / (1024 * 1024):.2f} MB")
+    for backend in (lexer.BACKEND_SCAN, lexer.BACKEND_REGEX):
+        throughput, count = measure(source, backend)
+        print(f"{backend:>6}: {throughput:8.2f} MB/s ({count} tokens)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure `python -m bsharp -n` against the same awk and Python one-liners.
+
+Run with `python -m benchmarks.bench_lines [lines]`.
+
+Every command reads a generated file on stdin and writes to /dev/null,
+the startup of the interpreters is included.
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_engines import best_of
+
+# Every task, as a bsharp expression, a awk program and a Python loop body.
+TASKS = {
+    "filter": (
+        '(contains line "7")',
+        "/7/",
+        'if "7" in line: write(line)',
+    ),
+    "field": (
+        "(field line 2)",
+        "{print $2}",
+        "write(line.split()[1] + '\\n')",
+    ),
+    "arithmetic": (
+        "(* 2 (number (field line 2)))",
+        "{print 2 * $2}",
+        "write(str(2 * int(line.split()[1])) + '\\n')",
+    ),
+}
+
+
+def write_lines(path: Path, count: int) -> None:
+    """Write `count` lines of a word and a number."""
+    with open(path, "w") as file:
+        for index in range(count):
+            file.write(f"word{index % 97} {index}\n")
+
+
+def measure(command: list[str], path: Path) -> float:
+    """Return the best time of running the command on the file."""
+
+    def run() -> None:
+        with open(path) as input:
+            subprocess.run(command, stdin=input, stdout=subprocess.DEVNULL, check=True)
+
+    return best_of(run, 3)
+
+
+def main() -> None:
+    """Print the lines per second of every task for every tool."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    awk = shutil.which("awk")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "lines.txt"
+        write_lines(path, count)
+
+        for task, (expression, program, body) in TASKS.items():
+            loop = (
+                "import sys\n"
+                "write = sys.stdout.write\n"
+                f"for line in sys.stdin:\n    {body}\n"
+            )
+            commands = {
+                "bsharp": [sys.executable, "-m", "bsharp", "-n", expression],
+                "python": [sys.executable, "-c", loop],
+            }
+            if awk is not None:
+                commands["awk"] = [awk, program]
+
+            results = []
+            for tool, command in commands.items():
+                seconds = measure(command, path)
+                results.append(f"{tool} {count / seconds / 1000:.0f}k lines/s")
+            print(f"{task:<11} " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    main()
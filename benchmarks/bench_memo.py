@@ -0,0 +1,59 @@
+"""Measure evaluating programs with and without memoizing pure functions.
+
+Run with `python -m benchmarks.bench_memo [calls]`.
+
+`repeated` calls a parsing helper on a few distinct log fields over and over,
+`distinct` calls it on a new field every time, so every call is a miss,
+`fib` is the naive recursive Fibonacci.
+The hits, misses and evictions of the last memoized run are reported.
+"""
+
+import sys
+
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.memo import Memo
+from benchmarks.bench_engines import best_of, parse
+
+HELPER = (
+    "(fn digits [n] (if (lt n 10) 1 (+ 1 (digits (/ n 10))))) "
+    "(fn parse [line] (* (digits (number (field line 2))) (len (field line 1)))) "
+)
+
+
+def calls_program(calls: int, distinct: int) -> str:
+    """Return a program calling the helper on `distinct` different lines."""
+    lines = (index % distinct for index in range(calls))
+    return HELPER + " ".join(f'(parse "host-{i} {i * 7919}")' for i in lines)
+
+
+def main() -> None:
+    """Print the time of every program with and without a Memo."""
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    programs = {
+        "repeated": parse(calls_program(calls, 50)),
+        "distinct": parse(calls_program(calls, calls)),
+        "fib": parse(
+            "(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2))))) (fib 20)"
+        ),
+    }
+
+    for name, program in programs.items():
+        before = best_of(lambda: Evaluator().eval(program, Environment()), 3)
+        memos = []
+
+        def memoized() -> None:
+            memos.append(Memo())
+            Evaluator(memo=memos[-1]).eval(program, Environment())
+
+        after = best_of(memoized, 3)
+        stats = memos[-1].stats()
+        print(
+            f"{name:>8}: {before * 1000:.1f} ms | memo {after * 1000:.1f} ms "
+            f"({before / after:.2f}x) | {stats['hits']} hits, "
+            f"{stats['misses']} misses, {stats['evictions']} evictions"
+        )
+
+
+if __name__ == "__main__":
+    main()
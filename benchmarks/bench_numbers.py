@@ -0,0 +1,37 @@
+"""Measure arithmetic-heavy programs, whose literals are converted when parsed.
+
+Run with `python -m benchmarks.bench_numbers`.
+
+Every program is parsed once and run by every engine,
+so only evaluating the literals and the arithmetic is measured.
+"""
+
+from benchmarks.bench_engines import best_of, engines, parse
+from benchmarks.workloads import (
+    arithmetic_heavy_program,
+    constant_heavy_program,
+    float_heavy_program,
+)
+
+
+def main() -> None:
+    """Print the time of every engine on every arithmetic workload."""
+    workloads = {
+        "int": arithmetic_heavy_program(5_000),
+        "float": float_heavy_program(5_000),
+        "calls": constant_heavy_program(5_000),
+    }
+
+    for name, source in workloads.items():
+        try:
+            runs = engines(parse(source))
+            times = {engine: best_of(run) for engine, run in runs.items()}
+        except Exception as error:
+            print(f"{name:>6}: {error}")
+            continue
+        results = [f"{engine} {seconds:.4f}s" for engine, seconds in times.items()]
+        print(f"{name:>6}: " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure the memory and garbage collections of evaluating allocation-heavy programs.
+
+Run with `python -m benchmarks.bench_objects [forms]`.
+
+The program keeps every number, boolean and string it makes in a global,
+the peak traced memory and the collections while evaluating it are reported.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from bsharp.closures import ClosureCompiler
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from benchmarks.bench_engines import parse
+from benchmarks.workloads import object_heavy_program
+
+
+def measure(run) -> tuple[float, int, float]:
+    """Return the peak memory in MB, the collections and the seconds of a run."""
+    collections = 0
+
+    def count(phase: str, info: dict) -> None:
+        nonlocal collections
+        if phase == "start":
+            collections += 1
+
+    gc.collect()
+    gc.callbacks.append(count)
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    gc.callbacks.remove(count)
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2**20, collections, seconds
+
+
+def main() -> None:
+    """Print the peak memory and collections of every engine."""
+    forms = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    program = parse(object_heavy_program(forms))
+    compiled = ClosureCompiler().compile(program)
+
+    engines = {
+        "eval": lambda: Evaluator().eval(program, Environment()),
+        "closures": lambda: compiled(Environment()),
+    }
+    for engine, run in engines.items():
+        peak, collections, seconds = measure(run)
+        print(
+            f"{engine:>8}: peak {peak:.2f} MB | {collections} collections | "
+            f"{seconds:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
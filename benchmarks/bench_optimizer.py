@@ -0,0 +1,41 @@
+"""Measure the evaluator on programs with and without constant folding.
+
+Run with `python -m benchmarks.bench_optimizer`.
+"""
+
+import time
+
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.optimizer import Optimizer
+from benchmarks.bench_engines import best_of, parse
+from benchmarks.workloads import arithmetic_heavy_program, constant_heavy_program
+
+
+def main() -> None:
+    """Print the time to fold and to evaluate every workload."""
+    workloads = {
+        "arithmetic": arithmetic_heavy_program(5_000),
+        "constants": constant_heavy_program(5_000),
+    }
+
+    for name, text in workloads.items():
+        program, folded = parse(text), parse(text)
+
+        optimizer = Optimizer()
+        start = time.perf_counter()
+        optimizer.optimize(folded)
+        folding = time.perf_counter() - start
+
+        evaluator = Evaluator()
+        plain = best_of(lambda: evaluator.eval(program, Environment()))
+        optimized = best_of(lambda: evaluator.eval(folded, Environment()))
+        print(
+            f"{name:>10}: {len(optimizer.folded)} folded in {folding:.3f}s | "
+            f"eval {plain:.3f}s | folded eval {optimized:.3f}s "
+            f"({plain / optimized:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
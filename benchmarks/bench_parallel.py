@@ -0,0 +1,42 @@
+"""Measure how running lines in worker processes scales with the number of workers.
+
+Run with `python -m benchmarks.bench_parallel [lines] [chunk size]`.
+
+Every line computes a small Fibonacci number, so the work is bound by the CPU.
+The workers go from 1, run in the process itself, to the number of CPUs.
+"""
+
+import os
+import sys
+
+from bsharp import stream
+from benchmarks.bench_engines import best_of
+
+EXPRESSION = (
+    "(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2))))) "
+    "(fib (+ 8 (number (field line 2))))"
+)
+
+
+def main() -> None:
+    """Print the lines per second for every number of workers."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    chunkSize = int(sys.argv[2]) if len(sys.argv) > 2 else stream.CHUNK_SIZE
+    lines = [f"word {index % 5}" for index in range(count)]
+    cpus = os.cpu_count() or 1
+
+    base = None
+    for workers in sorted({1, 2, 4, cpus}):
+        with open(os.devnull, "w") as output:
+            seconds = best_of(
+                lambda: stream.run(EXPRESSION, lines, output, workers, chunkSize), 3
+            )
+        base = base or seconds
+        print(
+            f"{workers:>3} workers: {count / seconds / 1000:.1f}k lines/s "
+            f"({base / seconds:.2f}x) on {cpus} CPUs"
+        )
+
+
+if __name__ == "__main__":
+    main()
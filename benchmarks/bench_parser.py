@@ -0,0 +1,65 @@
+"""Measure the parser modes on deep and wide programs.
+
+Run with `python -m benchmarks.bench_parser`.
+
+The tokens are lexed ahead of time, only parsing is measured.
+"""
+
+import time
+
+from bsharp import lexer
+from bsharp import parser
+from bsharp import token
+from benchmarks.workloads import arithmetic_program, nested_program, wide_program
+
+
+class TokenReplay:
+    """Provide `nextToken()` over tokens lexed ahead of time."""
+
+    def __init__(self, tokens: list[token.Token]) -> None:
+        """Construct the replay."""
+        self.nextToken = iter(tokens).__next__
+
+
+def lex(source: str) -> list[token.Token]:
+    """Return every token of source including EOF."""
+    l = lexer.Lexer(source, backend=lexer.BACKEND_REGEX)
+    tokens = [l.nextToken()]
+    while tokens[-1].getType() != token.EOF:
+        tokens.append(l.nextToken())
+    return tokens
+
+
+def measure(tokens: list[token.Token], mode: str, repeat: int = 3) -> str:
+    """Return the best time out of `repeat` parses, or why parsing failed."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            parser.Parser(TokenReplay(tokens), mode=mode).parse_program()
+        except RecursionError:
+            return "RecursionError"
+        best = min(best, time.perf_counter() - start)
+    return f"{best:.3f}s"
+
+
+def main() -> None:
+    """Print the time of every mode for every workload."""
+    workloads = {
+        "nested 500": nested_program(500),
+        "nested 100000": nested_program(100_000),
+        "wide 400000": wide_program(400_000),
+        "30000 forms": arithmetic_program(30_000),
+    }
+
+    for name, source in workloads.items():
+        tokens = lex(source)
+        results = [
+            f"{mode} {measure(tokens, mode):>14}"
+            for mode in (parser.MODE_RECURSIVE, parser.MODE_ITERATIVE)
+        ]
+        print(f"{name:>14} ({len(tokens)} tokens): " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Measure the cost of profiling a program.
+
+Run with `python -m benchmarks.bench_profiler [n]`.
+
+`(fib n)` and a tail recursive loop are evaluated by the plain Evaluator,
+which has no profiling code, and by the Profiler, recording every call.
+"""
+
+import sys
+
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.profiler import Profiler
+from benchmarks.bench_engines import best_of, parse
+
+
+def main() -> None:
+    """Print the time of every program, without and with profiling."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    programs = {
+        "fib": parse(
+            f"(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2))))) (fib {n})"
+        ),
+        "loop": parse(
+            "(fn count [n total] (if (lt n 1) total (count (- n 1) (+ total n)))) "
+            f"(count {n * 2000} 0)"
+        ),
+    }
+
+    for name, program in programs.items():
+        plain = best_of(lambda: Evaluator().eval(program, Environment()), 3)
+        profiler = Profiler()
+        profiled = best_of(lambda: profiler.eval(program, Environment()), 3)
+        calls = sum(entry[0] for entry in profiler.entries.values()) // 3
+        print(
+            f"{name:>5}: {plain * 1000:.1f} ms | profiled {profiled * 1000:.1f} ms "
+            f"({profiled / plain:.2f}x) | {calls} calls, "
+            f"{(profiled - plain) / calls * 1e9:.0f} ns per call"
+        )
+
+
+if __name__ == "__main__":
+    main()
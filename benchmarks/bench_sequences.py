@@ -0,0 +1,71 @@
+"""Measure the memory and time of lazy pipelines over files of growing size.
+
+Run with `python -m benchmarks.bench_sequences [lines]`.
+
+Every pipeline reads a generated file with `lines`, the peak traced memory
+should stay the same whatever the size of the file, and a pipeline ending in
+`take` should only read the lines it takes.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from benchmarks.bench_engines import parse
+
+PIPELINES = {
+    "sum": '(sum (map "number" (lines "{path}")))',
+    "filter": '(sum (map "number" (filter "contains" (lines "{path}") "7")))',
+    "function": (
+        '(fn double [n] (* 2 (number n))) (sum (map "double" (lines "{path}")))'
+    ),
+    "take": '(sum (map "number" (take 10 (lines "{path}"))))',
+}
+
+
+def write_lines(path: str, count: int) -> None:
+    """Write `count` lines of a number."""
+    with open(path, "w") as file:
+        for index in range(count):
+            file.write(f"{index}\n")
+
+
+def measure(source: str) -> tuple[float, float]:
+    """Return the seconds of evaluating the source and it's peak memory in KB."""
+    program = parse(source)
+
+    start = time.perf_counter()
+    Evaluator().eval(program, Environment())
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    Evaluator().eval(program, Environment())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024
+
+
+def main() -> None:
+    """Print the time and peak memory of every pipeline for every file size."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (count // 10, count):
+            path = os.path.join(directory, f"{size}.txt")
+            write_lines(path, size)
+            megabytes = os.path.getsize(path) / 2**20
+
+            for name, pipeline in PIPELINES.items():
+                seconds, peak = measure(pipeline.format(path=path))
+                print(
+                    f"{name:>8} {size:>9} lines ({megabytes:.1f} MB): "
+                    f"{seconds * 1000:.1f} ms | peak {peak:.0f} KB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measure the overhead of starting commands and of streaming their lines.
+
+Run with `python -m benchmarks.bench_shell [commands] [lines]`.
+
+Every way of starting a command runs `true` many times from a single interpreter,
+the time per command is reported. Streaming counts the lines of `seq`,
+read by bsharp, written to `cat` by bsharp, or connected to `cat` by a OS pipe.
+"""
+
+import shutil
+import subprocess
+import sys
+
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from benchmarks.bench_engines import best_of, parse
+
+
+def evaluate(source: str) -> None:
+    """Evaluate the source."""
+    Evaluator().eval(parse(source), Environment())
+
+
+def main() -> None:
+    """Print the time per command and the lines per second of every stream."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    true = shutil.which("true")
+
+    commands = {
+        "bsharp (run)": lambda: evaluate('(run "true") ' * count),
+        "bsharp (sh)": lambda: evaluate('(array (sh "true")) ' * count),
+        "subprocess": lambda: [subprocess.run(["true"]) for _ in range(count)],
+        "subprocess, path": lambda: [subprocess.run([true]) for _ in range(count)],
+        "subprocess, shell": lambda: [
+            subprocess.run("true", shell=True) for _ in range(count)
+        ],
+    }
+    for name, run in commands.items():
+        seconds = best_of(run, 3)
+        print(f"{name:>18}: {seconds / count * 1e6:.0f} us per command")
+
+    streams = {
+        "sh": f'(sum (map "number" (sh "seq" {lines})))',
+        "sh | cat": f'(sum (map "number" (pipe (sh "seq" {lines}) "cat")))',
+        "written to cat": (
+            f'(sum (map "number" (pipe (map "number" (sh "seq" {lines})) "cat")))'
+        ),
+    }
+    for name, source in streams.items():
+        seconds = best_of(lambda: evaluate(source), 3)
+        print(f"{name:>18}: {lines / seconds / 1000:.0f}k lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure the startup of `python -m bsharp` for scripts and expressions.
+
+Run with `python -m benchmarks.bench_startup [runs]`.
+
+Every run is a new interpreter started with `-X importtime`, the import time of the
+modules is read from it's stderr.
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.workloads import write_program
+
+
+def run(argv: list[str]) -> tuple[float, float, int]:
+    """Run bsharp, return the wall time, import time and number of modules imported."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "bsharp", *argv],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+
+    imports = 0
+    modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, _ = line[len("import time:") :].split("|")
+        if not self_time.strip().isdigit():
+            continue
+        modules += 1
+        imports += int(self_time)
+    return wall, imports / 1e6, modules
+
+
+def best(argv: list[str], runs: int) -> tuple[float, float, int]:
+    """Return the fastest of a number of runs."""
+    return min(run(argv) for _ in range(runs))
+
+
+def main() -> None:
+    """Print the startup time of every way of running bsharp."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    with tempfile.TemporaryDirectory() as directory:
+        script = Path(directory) / "script.bs"
+        write_program(str(script), 0.01)
+
+        modes = {
+            "-e": ["-e", "(+ 1 2)"],
+            "script, no cache": ["--no-cache", str(script)],
+            "script, warm cache": [str(script)],
+        }
+        run([str(script)])
+
+        for mode, argv in modes.items():
+            wall, imports, modules = best(argv, runs)
+            print(
+                f"{mode:<20} wall {wall * 1000:.1f}ms | "
+                f"imports {imports * 1000:.1f}ms | {modules} modules"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Measure the peak memory of lexing files of growing size.
+
+Run with `python -m benchmarks.bench_stream`.
+
+`Lexer` needs the whole file as a string, `StreamLexer` only holds its buffer,
+so its peak memory should stay flat as the file grows.
+"""
+
+import os
+import tempfile
+import tracemalloc
+
+from bsharp import lexer
+from bsharp import token
+from benchmarks.workloads import write_program
+
+
+def read_whole(path: str) -> lexer.Lexer:
+    """Construct a Lexer over the whole file read into memory."""
+    with open(path) as file:
+        return lexer.Lexer(file.read(), backend=lexer.BACKEND_REGEX)
+
+
+def read_stream(path: str) -> lexer.StreamLexer:
+    """Construct a StreamLexer over the open file."""
+    return lexer.StreamLexer(open(path))
+
+
+def read_mmap(path: str) -> lexer.StreamLexer:
+    """Construct a StreamLexer over the memory mapped file."""
+    return lexer.StreamLexer.fromMmap(path)
+
+
+def peak_memory(path: str, construct) -> int:
+    """Return the peak traced memory in bytes of lexing the file."""
+    tracemalloc.start()
+    l = construct(path)
+    while l.nextToken().getType() != token.EOF:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Print the peak memory of every lexer for every file size."""
+    readers = {"Lexer": read_whole, "stream": read_stream, "mmap": read_mmap}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "program.bs")
+        for megabytes in (1, 4, 16):
+            write_program(path, megabytes)
+            results = [
+                f"{name} {peak_memory(path, construct) / 1024:10.1f} KiB"
+                for name, construct in readers.items()
+            ]
+            print(f"{megabytes:3} MB: " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Measure tail recursive loops in the evaluator.
+
+Run with `python -m benchmarks.bench_tail [iterations]`.
+
+Short loops are run many times, they fit in the Python stack with or without
+tail calls. The long loop only runs in constant stack.
+"""
+
+import sys
+import time
+
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from benchmarks.bench_engines import best_of, parse
+from benchmarks.workloads import loop_program
+
+SHORT = 100
+RUNS = 200
+
+
+def main() -> None:
+    """Print iterations per second of short loops and of a long loop."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    evaluator = Evaluator()
+
+    short = parse(loop_program(SHORT))
+
+    def run() -> None:
+        """Run the short loop many times."""
+        for _ in range(RUNS):
+            evaluator.eval(short, Environment())
+
+    seconds = best_of(run)
+    print(f"{SHORT} iterations: {SHORT * RUNS / seconds / 1000:.0f}k iterations/s")
+
+    long = parse(loop_program(iterations))
+    start = time.perf_counter()
+    try:
+        evaluator.eval(long, Environment())
+    except RecursionError:
+        print(f"{iterations} iterations: RecursionError")
+        return
+    seconds = time.perf_counter() - start
+    print(f"{iterations} iterations: {iterations / seconds / 1000:.0f}k iterations/s")
+
+
+if __name__ == "__main__":
+    main()
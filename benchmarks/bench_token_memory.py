@@ -0,0 +1,78 @@
+"""Measure the memory held by the tokens of a one million token file.
+
+Run with `python -m benchmarks.bench_token_memory [tokens]`.
+"""
+
+import sys
+import tracemalloc
+
+from bsharp import lexer
+from bsharp import token
+from benchmarks.workloads import program_of_tokens
+
+
+class DictToken:
+    """Token as it was before `__slots__`, every instance carries a `__dict__`."""
+
+    def __init__(self, type: str, value: str) -> None:
+        """Construct the token."""
+        self._type = type
+        self._value = value
+
+
+def hold_tokens(source: str, count: int) -> list:
+    """Return the first `count` tokens as `token.Token`."""
+    l = lexer.Lexer(source, backend=lexer.BACKEND_REGEX)
+    return [l.nextToken() for _ in range(count)]
+
+
+def hold_dict_tokens(source: str, count: int) -> list:
+    """Return the first `count` tokens as `DictToken`."""
+    l = lexer.Lexer(source, backend=lexer.BACKEND_REGEX)
+    tokens = []
+    for _ in range(count):
+        tok = l.nextToken()
+        tokens.append(DictToken(tok.getType(), tok.getValue()))
+    return tokens
+
+
+def hold_token_array(source: str, count: int) -> token.TokenArray:
+    """Return the first `count` tokens packed in a `token.TokenArray`."""
+    tokens = lexer.Lexer(source).packTokens()
+    del tokens.kinds[count:], tokens.starts[count:], tokens.ends[count:]
+    return tokens
+
+
+def retained_memory(source: str, count: int, hold) -> int:
+    """Return the bytes still allocated once the tokens are held."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tokens = hold(source, count)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tokens
+    return after - before
+
+
+def main() -> None:
+    """Print the memory held by every token representation."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    source = program_of_tokens(count)
+
+    layouts = {
+        "Token (__dict__)": hold_dict_tokens,
+        "Token (__slots__)": hold_tokens,
+        "TokenArray": hold_token_array,
+    }
+
+    print(f"{count} tokens, source {len(source) / (1024 * 1024):.1f} MB (not counted)")
+    for name, hold in layouts.items():
+        retained = retained_memory(source, count, hold)
+        print(
+            f"{name:>18}: {retained / (1024 * 1024):8.1f} MB,"
+            f" {retained / count:6.1f} bytes/token"
+        )
+
+
+if __name__ == "__main__":
+    main()
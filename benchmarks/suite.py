@@ -0,0 +1,228 @@
+"""Run every workload through the lexer, the parser and the evaluator.
+
+Run with `python -m benchmarks.suite [--quick] [--output file] [--baseline file]`.
+
+Every workload is measured at a size and at `GROWTH` times that size.
+The lexer is measured in MB/s, the parser in nodes/s and the evaluator in calls/s.
+A stage whose cost per byte, node or evaluated node grows more than `TOLERANCE`
+times with the input does not scale linearly, and fails the run. The evaluator is
+scaled by the nodes it evaluates, a single call of many arguments is one call.
+
+The results are written as JSON with `--output`. Given `--baseline`, the results
+of a earlier run, every rate more than `--threshold` below it's baseline fails
+the run too. The exit status is 1 on any failure.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from collections.abc import Callable
+
+from bsharp import ast
+from bsharp import lexer
+from bsharp import parser
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.hooks import HookedEvaluator, Hooks
+from benchmarks.bench_engines import best_of
+from benchmarks.bench_lexer import lex_all
+from benchmarks.bench_parser import TokenReplay, lex
+from benchmarks.workloads import (
+    many_functions_program,
+    nested_forms_program,
+    nested_program,
+    recursive_calls_program,
+    string_heavy_program,
+    wide_program,
+)
+
+# Every workload is the program of a size, the size and if it can be evaluated.
+# A single form nested as deep as `deep` would overflow the stack of the evaluator.
+WORKLOADS = {
+    "nested": (nested_forms_program, 200, True),
+    "deep": (nested_program, 40_000, False),
+    "wide": (wide_program, 50_000, True),
+    "functions": (many_functions_program, 2_000, True),
+    "recursive": (recursive_calls_program, 20, True),
+    "strings": (string_heavy_program, 2_000, True),
+}
+
+# Sizes are divided by this with `--quick`.
+QUICK = 10
+
+# The large size of a workload is this many times the small one.
+GROWTH = 4
+
+# Largest growth of the cost per unit still taken as linear.
+TOLERANCE = 2.0
+
+# Every stage, the unit it is scaled by, the unit of it's rate and the rate.
+STAGES = {
+    "lexer": ("bytes", "bytes", "lexer_mb_s"),
+    "parser": ("nodes", "nodes", "parser_nodes_s"),
+    "evaluator": ("evaluated", "calls", "evaluator_calls_s"),
+}
+
+
+def count(program: ast.Program) -> dict[str, int]:
+    """Return the calls made and the nodes evaluated evaluating the program."""
+    counts = {"calls": 0, "evaluated": 0}
+
+    def counter(key: str) -> Callable:
+        def increment(*_) -> None:
+            counts[key] += 1
+
+        return increment
+
+    hooks = Hooks()
+    hooks.on_call(counter("calls"))
+    for kind in (
+        ast.NumberExpression,
+        ast.StringExpression,
+        ast.IdentifierExpression,
+        ast.ArrayExpression,
+        ast.CallExpression,
+        ast.FunctionExpression,
+    ):
+        hooks.on_node(kind, counter("evaluated"))
+    HookedEvaluator(hooks).eval(program, Environment())
+    return counts
+
+
+def units(source: str, program: ast.Program, evaluate: bool) -> dict[str, int]:
+    """Return the bytes, nodes, and if evaluated the calls and evaluated nodes."""
+    result = {
+        "bytes": len(source.encode()),
+        "nodes": len(ast.Arena.from_program(program).kinds),
+    }
+    if evaluate:
+        result.update(count(program))
+    return result
+
+
+def measure(source: str, evaluate: bool) -> dict:
+    """Return the units and the best time of every stage on the source."""
+    tokens = lex(source)
+
+    def parse() -> ast.Program:
+        replay = TokenReplay(tokens)
+        return parser.Parser(replay, mode=parser.MODE_ITERATIVE).parse_program()
+
+    program = parse()
+    result = {
+        **units(source, program, evaluate),
+        "lexer": best_of(lambda: lex_all(source, lexer.BACKEND_REGEX), 3),
+        "parser": best_of(parse, 3),
+    }
+    if evaluate:
+        evaluate = lambda: Evaluator().eval(program, Environment())
+        result["evaluator"] = best_of(evaluate, 3)
+    return result
+
+
+def rates(measured: dict) -> dict[str, float]:
+    """Return the rate of every stage measured."""
+    result = {}
+    for stage, (_, unit, rate) in STAGES.items():
+        if stage in measured:
+            result[rate] = measured[unit] / measured[stage]
+    result["lexer_mb_s"] /= 1024 * 1024
+    return result
+
+
+def scaling(small: dict, large: dict) -> dict[str, float]:
+    """Return how many times the cost per unit of every stage grew."""
+    result = {}
+    for stage, (unit, _, _) in STAGES.items():
+        if stage in small:
+            result[stage] = (large[stage] / large[unit]) / (small[stage] / small[unit])
+    return result
+
+
+def run_workload(name: str, quick: bool = False) -> dict:
+    """Measure a workload at it's small and large size."""
+    generate, size, evaluate = WORKLOADS[name]
+    if quick:
+        size //= QUICK
+
+    small = measure(generate(size), evaluate)
+    large = measure(generate(size * GROWTH), evaluate)
+    return {
+        "size": size * GROWTH,
+        **{unit: large[unit] for _, unit, _ in STAGES.values() if unit in large},
+        **rates(large),
+        "scaling": scaling(small, large),
+    }
+
+
+def nonlinear(results: dict) -> list[str]:
+    """Return a line for every stage not scaling linearly."""
+    return [
+        f"{name} {stage}: cost per unit grew {growth:.2f}x for {GROWTH}x the input"
+        for name, result in results["workloads"].items()
+        for stage, growth in result["scaling"].items()
+        if growth > TOLERANCE
+    ]
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a line for every rate more than `threshold` below the baseline."""
+    lines = []
+    for name, result in results["workloads"].items():
+        before = baseline["workloads"].get(name, {})
+        for _, _, rate in STAGES.values():
+            if rate in result and rate in before:
+                change = result[rate] / before[rate] - 1
+                if change < -threshold:
+                    lines.append(f"{name} {rate}: {change:+.0%} against the baseline")
+    return lines
+
+
+def main() -> int:
+    """Run every workload, print and save the results, return the exit status."""
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--quick", action="store_true", help="smaller inputs")
+    arguments.add_argument("--output", help="write the results to this JSON file")
+    arguments.add_argument("--baseline", help="compare with this JSON file")
+    arguments.add_argument(
+        "--threshold", type=float, default=0.2, help="largest slowdown, 0.2 by default"
+    )
+    options = arguments.parse_args()
+
+    results = {
+        "python": platform.python_version(),
+        "quick": options.quick,
+        "workloads": {},
+    }
+    print(f"{'workload':>10} {'MB/s':>8} {'nodes/s':>10} {'calls/s':>10}  scaling")
+    for name in WORKLOADS:
+        result = results["workloads"][name] = run_workload(name, options.quick)
+        calls = result.get("evaluator_calls_s")
+        growths = " ".join(f"{s} {g:.2f}x" for s, g in result["scaling"].items())
+        print(
+            f"{name:>10} {result['lexer_mb_s']:>8.2f} "
+            f"{result['parser_nodes_s']:>10.0f} "
+            f"{'-' if calls is None else f'{calls:.0f}':>10}  {growths}"
+        )
+
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+
+    failures = nonlinear(results)
+    if options.baseline:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("quick") != options.quick:
+            failures.append("the baseline was run with other sizes, see --quick")
+        else:
+            failures += regressions(results, baseline, options.threshold)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
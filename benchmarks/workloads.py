@@ -0,0 +1,143 @@
+"""Generate synthetic bsharp programs used by the benchmarks."""
+
+
+def arithmetic_program(size: int) -> str:
+    """Return a program of `size` top-level arithmetic calls mixing every token kind."""
+    forms = []
+    for i in range(size):
+        forms.append(f'(print "value-{i}: %n" (- (+ {i} 2.5) (* x-{i % 7} [1 2 3])))')
+    return "\n".join(forms)
+
+
+def program_of_bytes(megabytes: float) -> str:
+    """Return a program roughly `megabytes` MB long."""
+    form = arithmetic_program(1)
+    return arithmetic_program(int(megabytes * 1024 * 1024 / (len(form) + 1)))
+
+
+def write_program(path: str, megabytes: float) -> None:
+    """Write a program roughly `megabytes` MB long to `path`, one form at a time."""
+    form = arithmetic_program(1)
+    with open(path, "w") as file:
+        for _ in range(int(megabytes * 1024 * 1024 / (len(form) + 1))):
+            file.write(form)
+            file.write("\n")
+
+
+def program_of_tokens(count: int) -> str:
+    """Return a program of at least `count` tokens."""
+    # Every form of `arithmetic_program` is 22 tokens long.
+    return arithmetic_program(count // 22 + 1)
+
+
+def nested_program(depth: int) -> str:
+    """Return a single call nested `depth` levels deep."""
+    return "(+ 1 " * depth + "1" + ")" * depth
+
+
+def wide_program(width: int) -> str:
+    """Return a single call with `width` arguments."""
+    return "(+ " + "1 " * width + ")"
+
+
+def call_heavy_program(calls: int) -> str:
+    """Return a program making `calls` calls to small user functions."""
+    header = "(fn sq [x] (* x x))\n(fn sum-sq [a b c] (+ (sq a) (sq b) (sq c)))\n"
+    return header + "\n".join(f"(sum-sq {i} 2 3)" for i in range(calls // 4))
+
+
+def recursive_program(n: int) -> str:
+    """Return a program computing the `n`th fibonacci number recursively."""
+    return f"(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2)))))\n(fib {n})"
+
+
+def arithmetic_heavy_program(forms: int) -> str:
+    """Return a program of `forms` nested arithmetic expressions over literals."""
+    return "\n".join(
+        f"(+ (* {i} 3) (- 100 (/ {i} 7)) (* (+ 1 2) (- {i} 4)) {i})"
+        for i in range(forms)
+    )
+
+
+def float_heavy_program(forms: int) -> str:
+    """Return a program of `forms` nested arithmetic expressions over float literals."""
+    return "\n".join(
+        f"(+ (* {i}.5 3) (- 100.25 (/ {i} 7.0)) (* (+ 1 2.5) (- {i} 4)) {i}.0)"
+        for i in range(forms)
+    )
+
+
+def variadic_program(forms: int, arguments: int) -> str:
+    """Return a program of `forms` arithmetic calls of `arguments` arguments each."""
+    numbers = " ".join(str(i % 10 + 1) for i in range(arguments))
+    return "\n".join(f"({'+-*'[i % 3]} {numbers})" for i in range(forms))
+
+
+def object_heavy_program(forms: int) -> str:
+    """Return a program keeping `forms` numbers, booleans and strings in globals."""
+    return "\n".join(
+        f"(set {letters(3 * i)} (+ {i % 200} 1))\n"
+        f"(set {letters(3 * i + 1)} (lt {i % 7} 3))\n"
+        f'(set {letters(3 * i + 2)} (upper "ab"))'
+        for i in range(forms)
+    )
+
+
+def globals_program(variables: int) -> str:
+    """Return a program setting `variables` globals."""
+    return "\n".join(f"(set {letters(i)} {i})" for i in range(variables))
+
+
+def letters(number: int) -> str:
+    """Return a identifier for the number, identifiers hold no digits."""
+    name = "g"
+    while True:
+        number, digit = divmod(number, 26)
+        name += chr(ord("a") + digit)
+        if number == 0:
+            return name
+
+
+def loop_program(iterations: int) -> str:
+    """Return a program summing `iterations` numbers with a tail recursive loop."""
+    return (
+        "(fn loop [n acc] (if (eq n 0) acc (loop (- n 1) (+ acc n))))\n"
+        f"(loop {iterations} 0)"
+    )
+
+
+def constant_heavy_program(calls: int) -> str:
+    """Return a program calling a function with constant parts `calls` times."""
+    header = (
+        "(fn scale [x] (+ (* x (/ 360 12)) (- 100 (* 2 25)) (* (+ 1 2) (- 10 4))))\n"
+    )
+    return header + "\n".join(f"(scale {i})" for i in range(calls))
+
+
+def nested_forms_program(forms: int, depth: int = 200) -> str:
+    """Return a program of `forms` calls, each nested `depth` levels deep."""
+    return "\n".join(nested_program(depth) for _ in range(forms))
+
+
+def many_functions_program(functions: int) -> str:
+    """Return a program declaring `functions` functions and calling each one twice."""
+    forms = []
+    for i in range(functions):
+        name = letters(i)
+        forms.append(f"(fn {name} [x y] (+ (* x {i % 10}) y))")
+        forms.append(f"({name} {i} 1)\n({name} 2 {i})")
+    return "\n".join(forms)
+
+
+def recursive_calls_program(calls: int, n: int = 10) -> str:
+    """Return a program computing the `n`th fibonacci number `calls` times."""
+    return recursive_program(n) + f"\n(fib {n})" * (calls - 1)
+
+
+def string_heavy_program(forms: int) -> str:
+    """Return a program of `forms` calls splitting, joining and changing strings."""
+    return "\n".join(
+        f'(len (concat (upper (field "host-{i} GET /index-{i % 50}.html" 2)) '
+        f'(lower "{letters(i)}-ABC") (contains "status-{i}" "{i % 10}")))'
+        for i in range(forms)
+    )
@@ -9,13 +9,14 @@ It aims to make bash-programming easier when using pipes.
 
 Currently following features are implemented
 - Basic arithimetic
+- Variables, `(set a 1)`
+- Functions Declarations, `(fn add [x y] (+ x y))`
+- Conditionals, `(if (lt a 1) "less" "more")`
+- Commands, `(pipe (sh "ls") "sort" "-r")`, started without a shell
 
 
 Following features are planned
-- Variables
-- Functions Declarations
 - Import statements
-- Bash interoptibility
 - More advanced types (hashmap, list)
 - More advanced repl
 
@@ -38,3 +39,5 @@ Because compiler developerment is always tricky, experienced and knowlegable dev
 ## Naming
 bsharp is inspired from `F#` which is the functional counterpart to `C#`.
 """
+
+__version__ = "0.1.0"
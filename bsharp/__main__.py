@@ -1,6 +1,186 @@
-"""Main module to execute while running bsharp."""
+"""Main module to execute while running bsharp.
 
-from bsharp.repl import startREPL
+Usage:
+
+    python -m bsharp                    Start the REPL.
+    python -m bsharp [options] script   Run a script.
+    python -m bsharp -e expression      Evaluate the expression and print it's value.
+    python -m bsharp -n expression      Run the expression for every line of stdin.
+
+Options:
+
+    --no-cache          Parse the script, without reading or writing it's cache.
+    --memo              Keep the results of pure functions, by their arguments.
+    --profile           Write the calls and time of every function to stderr.
+    --profile-stacks file
+                        Profile, writing the time of every stack to the file,
+                        in the collapsed format of flamegraph tools.
+    -j workers          Run the lines of `-n` in that many processes.
+    --chunk-size lines  Number of lines sent to a process at once, 1024 by default.
+
+With `-n` every line is bound to `line` and it's number to `nr`,
+a true value prints the line, any other value but NULL and false is printed.
+With `-j` the output stays in the order of the input, every process keeps it's own
+variables.
+
+Every pipe stage starts a new interpreter, so only the modules a mode needs are
+imported, and only once it is known to be needed. A script run never imports the REPL.
+"""
+
+import sys
+
+USAGE = (
+    "usage: python -m bsharp [--no-cache] [--memo] [--profile]"
+    " [--profile-stacks file] [-j workers] [--chunk-size lines]"
+    " [script | -e expression | -n expression]"
+)
+
+
+def makeEvaluator(memo: bool, profile: bool):
+    """Return the Evaluator, a `bsharp.profiler.Profiler` when profiling."""
+    from bsharp.evaluator import Evaluator
+    from bsharp.memo import Memo
+
+    cache = Memo() if memo else None
+    if profile:
+        from bsharp.profiler import Profiler
+
+        return Profiler(memo=cache)
+    return Evaluator(memo=cache)
+
+
+def evaluate(program, errors: list[str], printValue: bool, evaluator) -> int:
+    """Evaluate a parsed Program with the evaluator and return the exit status."""
+    if errors:
+        for error in errors:
+            print(error, file=sys.stderr)
+        return 1
+
+    from bsharp import object
+    from bsharp.environment import Environment
+
+    value = evaluator.eval(program, Environment())
+
+    if value.type == object.ERROR_OBJ:
+        print(value, file=sys.stderr)
+        return 1
+    if printValue and value.type != object.NIL_OBJECT:
+        print(value)
+    return 0
+
+
+def runExpression(expression: str, evaluator, profile: bool) -> int:
+    """Evaluate the expression and print it's value."""
+    from bsharp.lexer import Lexer
+    from bsharp.parser import Parser
+
+    parser = Parser(Lexer(expression))
+    program = parser.parse_program()
+    if profile:
+        evaluator.locate(program, expression, "-e")
+    return evaluate(program, parser.errors, printValue=True, evaluator=evaluator)
+
+
+def runScript(path: str, cache: bool, evaluator, profile: bool) -> int:
+    """Run the script, loading it from it's cache when possible."""
+    from bsharp.cache import parse_file
+
+    try:
+        program, errors = parse_file(path, cache=cache)
+        if profile:
+            with open(path, encoding="utf-8") as file:
+                evaluator.locate(program, file.read(), path)
+    except OSError as error:
+        print(f"Cannot read {path}: {error.strerror}", file=sys.stderr)
+        return 1
+    except UnicodeDecodeError as error:
+        reason = f"not {error.encoding}, {error.reason} at byte {error.start}"
+        print(f"Cannot read {path}: {reason}", file=sys.stderr)
+        return 1
+    return evaluate(program, errors, printValue=False, evaluator=evaluator)
+
+
+def writeProfile(profiler, stacks: str | None) -> None:
+    """Write the report of the profiler to stderr, and it's stacks to a file."""
+    print(profiler.report(), file=sys.stderr)
+    if stacks is not None:
+        try:
+            with open(stacks, "w", encoding="utf-8") as file:
+                file.write(profiler.collapsed() + "\n")
+        except OSError as error:
+            print(f"Cannot write {stacks}: {error.strerror}", file=sys.stderr)
+
+
+def runLines(expression: str, workers: int, chunkSize: int | None) -> int:
+    """Run the expression for every line of stdin."""
+    from bsharp import stream
+
+    if chunkSize is None:
+        chunkSize = stream.CHUNK_SIZE
+    return stream.run(expression, sys.stdin, sys.stdout, workers, chunkSize)
+
+
+def positive(args: list[str]) -> int | None:
+    """Pop the value of a option, None if it is not a positive number."""
+    if args and args[0].isdigit() and int(args[0]) > 0:
+        return int(args.pop(0))
+    return None
+
+
+def main(argv: list[str]) -> int:
+    """Run bsharp with the command line arguments and return the exit status."""
+    cache = True
+    memo = False
+    profile = False
+    stacks = None
+    workers = 1
+    chunkSize = None
+    args = list(argv)
+
+    while args and args[0].startswith("-"):
+        option = args.pop(0)
+        if option == "--no-cache":
+            cache = False
+        elif option == "--memo":
+            memo = True
+        elif option == "--profile":
+            profile = True
+        elif option == "--profile-stacks" and args:
+            profile, stacks = True, args.pop(0)
+        elif option == "-e" and len(args) == 1:
+            evaluator = makeEvaluator(memo, profile)
+            status = runExpression(args[0], evaluator, profile)
+            if profile:
+                writeProfile(evaluator, stacks)
+            return status
+        elif option == "-j" and (value := positive(args)) is not None:
+            workers = value
+        elif option == "--chunk-size" and (value := positive(args)) is not None:
+            chunkSize = value
+        elif option == "-n" and len(args) == 1:
+            return runLines(args[0], workers, chunkSize)
+        elif option in ("-h", "--help"):
+            print(USAGE)
+            return 0
+        else:
+            print(USAGE, file=sys.stderr)
+            return 2
+
+    if len(args) == 1:
+        evaluator = makeEvaluator(memo, profile)
+        status = runScript(args[0], cache, evaluator, profile)
+        if profile:
+            writeProfile(evaluator, stacks)
+        return status
+    if args:
+        print(USAGE, file=sys.stderr)
+        return 2
+
+    from bsharp.repl import startREPL
 
-if __name__ == "__main__":
     startREPL()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
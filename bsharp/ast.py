@@ -1,10 +1,12 @@
 """Provides Syntax Tree bsharp."""
 
-from typing import List
+from array import array
 
+from bsharp import object
 from bsharp import token
-from io import StringIO
-from pprint import pformat
+
+# Representing a expression is only for debugging, `io` and `pprint` are
+# imported by the `__repr__` methods using them, not by every run.
 
 
 class Expression:
@@ -13,28 +15,32 @@ class Expression:
     A statement in bsharp is (function arg1 arg2 arg3).
 
     These args can be statement in themselves.
+
+    Every expression declares it's attributes in `__slots__`, no expression carries a `__dict__`.
     """
 
-    def __init__(self):
-        """Construct a expression."""
-        self.token: token.Token
-        self.value: str
-        self.function: token.Token
-        self.args: list[Expression]
-        self.body: list[Expression]
-        self.elements: list[Expression]
-        self.expressions: list[Expression]
+    __slots__ = ("token",)
+
+    token: token.Token
 
 
 class Program(Expression):
     """Class contains a list of statements."""
 
+    # A Program can be weakly referenced, to keep results only while it is used.
+    __slots__ = ("expressions", "__weakref__")
+
+    expressions: list[Expression]
+
     def __init__(self):
         """Construct a Program."""
         self.expressions = []
 
     def __repr__(self) -> str:
         """Represent a Program as string."""
+        from io import StringIO
+        from pprint import pformat
+
         builder = StringIO()
 
         builder.write(" Program ")
@@ -44,11 +50,17 @@ class Program(Expression):
 
 
 class NumberExpression(Expression):
-    """NUmber Expression contains a Number."""
+    """NUmber Expression contains a Number.
 
-    def __init__(self):
-        """Construct a Number Expression."""
-        super().__init__()
+    The literal is converted once when it is parsed,
+    every evaluation returns the same `constant`.
+    """
+
+    __slots__ = ("value", "constant")
+
+    value: str
+    # None if the literal is not a number, it is reported when evaluated.
+    constant: object.Number | None
 
     def __repr__(self) -> str:
         """Represent Number as a AST Object."""
@@ -58,9 +70,9 @@ class NumberExpression(Expression):
 class StringExpression(Expression):
     """String Expression contains a single string."""
 
-    def __init__(self):
-        """Construct a string expression."""
-        super().__init__()
+    __slots__ = ("value",)
+
+    value: str
 
     def __repr__(self) -> str:
         """Represent a string expression as str."""
@@ -70,9 +82,9 @@ class StringExpression(Expression):
 class IdentifierExpression(Expression):
     """Identifier Expression contains a identifier."""
 
-    def __init__(self):
-        """Construt a identifier expression."""
-        super().__init__()
+    __slots__ = ("value",)
+
+    value: str
 
     def __repr__(self) -> str:
         """Represent a ident expression as string."""
@@ -82,12 +94,15 @@ class IdentifierExpression(Expression):
 class ArrayExpression(Expression):
     """Array Expression contains a array representation."""
 
-    def __init__(self):
-        """Construct a array expression."""
-        super().__init__()
+    __slots__ = ("elements",)
+
+    elements: list[Expression]
 
     def __repr__(self) -> str:
         """Represent a array expression."""
+        from io import StringIO
+        from pprint import pformat
+
         builder = StringIO()
 
         builder.write(" Array ")
@@ -100,12 +115,16 @@ class ArrayExpression(Expression):
 class CallExpression(Expression):
     """Call Expression contains a representation of a function call."""
 
-    def __init__(self):
-        """Construct a Call Expression."""
-        super().__init__()
+    __slots__ = ("function", "args")
+
+    function: token.Token
+    args: list[Expression]
 
     def __repr__(self) -> str:
         """Represent a call expression as string."""
+        from io import StringIO
+        from pprint import pformat
+
         builder = StringIO()
 
         builder.write(f" Call ( Name( {self.function.getValue()} ) ")
@@ -118,12 +137,17 @@ class CallExpression(Expression):
 class FunctionExpression(Expression):
     """Function Expression contains a representation of a function declaration."""
 
-    def __init__(self):
-        """Construct a function expression."""
-        super().__init__()
+    __slots__ = ("function", "args", "body")
+
+    function: token.Token
+    args: list[Expression]
+    body: list[Expression]
 
     def __repr__(self):
         """Represent a Function Expression."""
+        from io import StringIO
+        from pprint import pformat
+
         builder = StringIO()
 
         builder.write(" Function ( Name ( ")
@@ -137,3 +161,239 @@ class FunctionExpression(Expression):
         builder.write(" ) ")
 
         return builder.getvalue()
+
+
+def number_constant(value: str) -> object.Number | None:
+    """Return the Number of a literal, None if it is not a number."""
+    try:
+        return object.makeNumber(object.parseNumber(value))
+    except Exception:
+        return None
+
+
+# Kinds of nodes stored in an Arena.
+NODE_PROGRAM = 0
+NODE_NUMBER = 1
+NODE_STRING = 2
+NODE_IDENTIFIER = 3
+NODE_ARRAY = 4
+NODE_CALL = 5
+NODE_FUNCTION = 6
+NODE_MISSING = 7
+
+# Type of the token of the names of functions which are not `IDENT`.
+_NAME_TYPES = {
+    "+": token.PLUS,
+    "-": token.MINUS,
+    "*": token.STAR,
+    "/": token.SLASH,
+}
+
+_LEAF_CLASSES = {
+    NODE_NUMBER: NumberExpression,
+    NODE_STRING: StringExpression,
+    NODE_IDENTIFIER: IdentifierExpression,
+}
+_LEAF_TYPES = {
+    NODE_NUMBER: token.NUMBER,
+    NODE_STRING: token.STRING,
+    NODE_IDENTIFIER: token.IDENT,
+}
+
+_NODE_KINDS = {
+    Program: NODE_PROGRAM,
+    NumberExpression: NODE_NUMBER,
+    StringExpression: NODE_STRING,
+    IdentifierExpression: NODE_IDENTIFIER,
+    ArrayExpression: NODE_ARRAY,
+    CallExpression: NODE_CALL,
+    FunctionExpression: NODE_FUNCTION,
+    # The arguments of a function are stored as a array node.
+    list: NODE_ARRAY,
+    type(None): NODE_MISSING,
+}
+
+
+class Arena:
+    """Arena stores a whole Program in flat arrays instead of a tree of objects.
+
+    Every node is an index into the parallel arrays.
+
+    Attributes:
+        - kinds(array): Kind of every node, one of the `NODE_*` constants.
+        - values(array): Index of the value of every node in `strings`.
+        - starts(array): Where the children of every node start in `children`.
+        - counts(array): How many children every node has.
+        - children(array): Indices of the children of every node, stored contiguously.
+        - strings(list[str]): Every distinct value, stored once. Index 0 is the empty value.
+
+    The Program is always node 0.
+    Numbers, strings and identifiers store their value,
+    `constant(node)` converts a number once for every distinct value.
+    Calls store the name of the function and have their arguments as children.
+    Functions store their name, their first child is a array of the arguments, the rest is the body.
+    Expressions which failed to parse are `NODE_MISSING`.
+    """
+
+    def __init__(self):
+        """Construct a empty arena."""
+        self.kinds = array("B")
+        self.values = array("I")
+        self.starts = array("I")
+        self.counts = array("I")
+        self.children = array("I")
+        self.strings: list[str] = [""]
+        self._stringIndex: dict[str, int] = {"": 0}
+        self._constants: dict[int, object.Number | None] = {}
+
+    @classmethod
+    def from_program(cls, program: Program) -> "Arena":
+        """Flatten a Program into a Arena.
+
+        Nodes are numbered breadth first, so the children of a node are numbered together.
+        No recursion is involved, programs of any depth can be flattened.
+        """
+        arena = cls()
+        nodes: list = [program]
+        arena.kinds.append(NODE_PROGRAM)
+        arena.values.append(0)
+
+        index = 0
+        while index < len(nodes):
+            node = nodes[index]
+            nodes[index] = None
+
+            match node:
+                case Program():
+                    children = node.expressions
+                case ArrayExpression():
+                    children = node.elements
+                case CallExpression():
+                    children = node.args
+                case FunctionExpression():
+                    children = [node.args, *node.body]
+                case list():
+                    children = node
+                case _:
+                    children = []
+
+            arena.starts.append(len(arena.children))
+            arena.counts.append(len(children))
+
+            for child in children:
+                arena.children.append(len(nodes))
+                nodes.append(child)
+                arena.kinds.append(_NODE_KINDS[type(child)])
+                arena.values.append(arena._intern(child))
+
+            index += 1
+
+        return arena
+
+    def to_program(self) -> Program:
+        """Rebuild the Program the arena was flattened from.
+
+        Children are numbered after their parent, nodes are rebuilt from the last one.
+        Tokens are rebuilt from the values and shared by the nodes of the same value,
+        names of functions are `IDENT` tokens unless they are a arithmetic symbol.
+        """
+        kinds, strings, values = self.kinds, self.strings, self.values
+        starts, counts, allChildren = self.starts, self.counts, self.children
+        nodes: list = [None] * len(kinds)
+        tokens: dict[tuple, token.Token] = {}
+        IDENT = token.IDENT
+        constant = self.constant
+        roundToken = token.Token(token.LROUND, "(")
+        squareToken = token.Token(token.LSQUARE, "[")
+
+        def tokenOf(type: str, value: str) -> token.Token:
+            """Return the token of the type and value, made once."""
+            shared = tokens.get((type, value))
+            if shared is None:
+                shared = tokens[type, value] = token.Token(type, value)
+            return shared
+
+        for node in range(len(kinds) - 1, -1, -1):
+            kind = kinds[node]
+            start = starts[node]
+            end = start + counts[node]
+            children = [nodes[child] for child in allChildren[start:end]]
+
+            if kind <= NODE_IDENTIFIER and kind != NODE_PROGRAM:
+                expression = _LEAF_CLASSES[kind]()
+                value = strings[values[node]]
+                shared = tokens.get((kind, value))
+                if shared is None:
+                    shared = tokens[kind, value] = token.Token(_LEAF_TYPES[kind], value)
+                expression.token = shared
+                expression.value = value
+                if kind == NODE_NUMBER:
+                    expression.constant = constant(node)
+            elif kind == NODE_CALL:
+                expression = CallExpression()
+                expression.token = roundToken
+                value = strings[values[node]]
+                expression.function = tokenOf(_NAME_TYPES.get(value, IDENT), value)
+                expression.args = children
+            elif kind == NODE_ARRAY:
+                expression = ArrayExpression()
+                expression.token = squareToken
+                expression.elements = children
+            elif kind == NODE_FUNCTION:
+                expression = FunctionExpression()
+                expression.token = roundToken
+                value = strings[values[node]]
+                expression.function = tokenOf(_NAME_TYPES.get(value, IDENT), value)
+                expression.args = children[0].elements
+                expression.body = children[1:]
+            elif kind == NODE_PROGRAM:
+                expression = Program()
+                expression.expressions = children
+            else:
+                expression = None
+
+            nodes[node] = expression
+
+        return nodes[0]
+
+    def _intern(self, node) -> int:
+        """Return the index of the value of the node in `strings`."""
+        match node:
+            case NumberExpression() | StringExpression() | IdentifierExpression():
+                value = node.value
+            case CallExpression() | FunctionExpression():
+                value = node.function.getValue()
+            case _:
+                return 0
+
+        index = self._stringIndex.get(value)
+        if index is None:
+            index = self._stringIndex[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self.kinds)
+
+    def value(self, node: int) -> str:
+        """Return the value of the node."""
+        return self.strings[self.values[node]]
+
+    def constant(self, node: int) -> object.Number | None:
+        """Return the Number of a number node, converted once for every value."""
+        index = self.values[node]
+        try:
+            return self._constants[index]
+        except KeyError:
+            number = self._constants[index] = number_constant(self.strings[index])
+            return number
+
+    def children_of(self, node: int) -> array:
+        """Return the indices of the children of the node."""
+        start = self.starts[node]
+        return self.children[start : start + self.counts[node]]
+
+    def __repr__(self) -> str:
+        """Represent a arena as string."""
+        return f" Arena ( {len(self)} nodes, {len(self.strings)} values ) "
@@ -0,0 +1,761 @@
+"""Builtin functions available to every bsharp program.
+
+Every builtin takes the list of it's evaluated arguments and returns a Object,
+a Error for wrong arguments. The engines resolve a call site to it's builtin once,
+see `bsharp.resolver`, variadic arithmetic reduces all the arguments at once.
+
+Arithmetic on a Array applies element by element, to a number or a Array of the
+same length. `map`, `filter` and `reduce` take the name of a operator and run it over
+the storage of the Array with `map()`, `itertools.compress()` and `reduce()`,
+no bsharp or Python code runs for every element.
+
+A Sequence is read one element at a time. `lines`, `map` and `filter` make
+Sequences, `take` and `drop` cut them, `sum`, `array` and `print` read them.
+Given a function that is not a operator on a Array, `map` and `filter` call it by
+name for every element. Run by the evaluator they call declared functions too.
+
+`sh`, `pipe` and `run` start commands, see `bsharp.shell`,
+which is only imported once a command is started.
+"""
+
+import math
+import operator
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from functools import reduce
+from itertools import compress, islice, repeat
+
+from bsharp import object
+
+NUMBER_OBJ = object.NUMBER_OBJ
+ARRAY_OBJ = object.ARRAY_OBJ
+SEQUENCE_OBJ = object.SEQUENCE_OBJ
+ERROR_OBJ = object.ERROR_OBJ
+
+
+def _numbers(name: str, args: list[object.Object]) -> list[int | float] | object.Error:
+    """Return the values of the arguments, or a error if any is not a number."""
+    values = [arg.value for arg in args if arg.type is NUMBER_OBJ]
+    if len(values) == len(args):
+        return values
+
+    for arg in args:
+        if arg.type is not NUMBER_OBJ:
+            return object.Error(message=f"{name} expects numbers, got {arg.type}")
+
+
+def _outOfRange(name: str) -> object.Error:
+    """Return the error of a integer too large to be mixed with a float."""
+    return object.Error(message=f"{name}: number out of range of a float")
+
+
+def add(args: list[object.Object]) -> object.Object:
+    """Return the sum of all the arguments."""
+    values = _numbers("+", args)
+    if type(values) is not list:
+        return _elementwise("+", operator.add, operator.add, args, values)
+
+    try:
+        return object.makeNumber(sum(values))
+    except OverflowError:
+        return _outOfRange("+")
+
+
+def subtract(args: list[object.Object]) -> object.Object:
+    """Return the first argument minus the rest, or the negation of a single argument."""
+    values = _numbers("-", args)
+    if type(values) is not list:
+        if len(args) == 1 and args[0].type is ARRAY_OBJ:
+            storage = args[0].value
+            return object.Array(array(storage.typecode, map(operator.neg, storage)))
+        return _elementwise("-", operator.sub, operator.sub, args, values)
+    if len(values) == 0:
+        return object.Error(message="- expects at least 1 argument")
+    if len(values) == 1:
+        return object.makeNumber(-values[0])
+
+    try:
+        return object.makeNumber(reduce(operator.sub, values))
+    except OverflowError:
+        return _outOfRange("-")
+
+
+def multiply(args: list[object.Object]) -> object.Object:
+    """Return the product of all the arguments."""
+    values = _numbers("*", args)
+    if type(values) is not list:
+        return _elementwise("*", operator.mul, operator.mul, args, values)
+
+    try:
+        return object.makeNumber(math.prod(values))
+    except OverflowError:
+        return _outOfRange("*")
+
+
+def divide(args: list[object.Object]) -> object.Object:
+    """Return the first argument divided by the rest.
+
+    Integers use integer division, a float anywhere gives a float.
+    """
+    values = _numbers("/", args)
+    if type(values) is not list:
+        if len(args) < 2:
+            return values
+        return _elementwise("/", operator.floordiv, operator.truediv, args, values)
+    if len(values) < 2:
+        return object.Error(message="/ expects at least 2 arguments")
+    if 0 in values[1:]:
+        return object.Error(message="Division by zero")
+
+    # Integers only stay integers, a float turns the result into a float.
+    try:
+        result = reduce(operator.floordiv, values)
+        if type(result) is float:
+            result = values[0]
+            for value in values[1:]:
+                if type(result) is int and type(value) is int:
+                    result //= value
+                else:
+                    result /= value
+    except OverflowError:
+        return _outOfRange("/")
+    return object.makeNumber(result)
+
+
+def _isFloat(value: array | int | float) -> bool:
+    """Return true for a float or a Array of floats."""
+    if type(value) is array:
+        return value.typecode == object.FLOAT_ARRAY
+    return type(value) is float
+
+
+def _combine(
+    name: str,
+    intOperator: Callable,
+    floatOperator: Callable,
+    left: array | int | float,
+    right: array | int | float,
+) -> array | int | float | object.Error:
+    """Apply the operator to a Array and a number or a Array, element by element.
+
+    Integers only use `intOperator`, a float anywhere uses `floatOperator`.
+    """
+    leftArray, rightArray = type(left) is array, type(right) is array
+    floats = _isFloat(left) or _isFloat(right)
+    function = floatOperator if floats else intOperator
+    typecode = object.FLOAT_ARRAY if floats else object.INT_ARRAY
+
+    if function in (operator.floordiv, operator.truediv):
+        if (0 in right) if rightArray else right == 0:
+            return object.Error(message="Division by zero")
+
+    if leftArray and rightArray:
+        if len(left) != len(right):
+            return object.Error(message=f"{name} expects arrays of the same length")
+        values = map(function, left, right)
+    elif leftArray:
+        values = map(function, left, repeat(right))
+    elif rightArray:
+        values = map(function, repeat(left), right)
+    else:
+        return function(left, right)
+
+    try:
+        return array(typecode, values)
+    except OverflowError:
+        return object.Error(message="Array element out of range")
+
+
+def _elementwise(
+    name: str,
+    intOperator: Callable,
+    floatOperator: Callable,
+    args: list[object.Object],
+    error: object.Error,
+) -> object.Object:
+    """Apply a arithmetic builtin element by element if a argument is a Array.
+
+    Returns the error of the arguments as numbers when no argument is a Array.
+    """
+    if not any(arg.type is ARRAY_OBJ for arg in args):
+        return error
+    for arg in args:
+        if arg.type is not NUMBER_OBJ and arg.type is not ARRAY_OBJ:
+            return object.Error(
+                message=f"{name} expects numbers or arrays, got {arg.type}"
+            )
+
+    result = args[0].value
+    for arg in args[1:]:
+        result = _combine(name, intOperator, floatOperator, result, arg.value)
+        if type(result) is object.Error:
+            return result
+    return object.Array(result)
+
+
+def _compare(name: str, test: Callable[[float, float], bool]) -> Callable:
+    """Return a builtin checking `test` holds between every adjacent arguments."""
+
+    def compare(args: list[object.Object]) -> object.Object:
+        """Compare the arguments pairwise."""
+        values = _numbers(name, args)
+        if type(values) is not list:
+            return values
+        if len(values) < 2:
+            return object.Error(message=f"{name} expects at least 2 arguments")
+
+        return object.makeBoolean(all(map(test, values, values[1:])))
+
+    return compare
+
+
+def equal(args: list[object.Object]) -> object.Object:
+    """Return true if every argument has the same type and value."""
+    if len(args) < 2:
+        return object.Error(message="eq expects at least 2 arguments")
+
+    first = args[0]
+    return object.makeBoolean(
+        all(arg.type == first.type and arg.value == first.value for arg in args)
+    )
+
+
+def _strings(
+    name: str, args: list[object.Object], count: int
+) -> list[str] | object.Error:
+    """Return the values of `count` string arguments, or a error."""
+    if len(args) != count:
+        return object.Error(
+            message=f"{name} expects {count} arguments, got {len(args)}"
+        )
+    values = []
+    for arg in args:
+        if arg.type != object.STRING_OBJ:
+            return object.Error(message=f"{name} expects strings, got {arg.type}")
+        values.append(arg.value)
+    return values
+
+
+def length(args: list[object.Object]) -> object.Object:
+    """Return the number of characters of a string, or of elements of a Array."""
+    if len(args) == 1 and args[0].type is ARRAY_OBJ:
+        return object.makeNumber(len(args[0].value))
+
+    values = _strings("len", args, 1)
+    if isinstance(values, object.Error):
+        return values
+
+    return object.makeNumber(len(values[0]))
+
+
+def upper(args: list[object.Object]) -> object.Object:
+    """Return the string in upper case."""
+    values = _strings("upper", args, 1)
+    if isinstance(values, object.Error):
+        return values
+
+    return object.makeString(values[0].upper())
+
+
+def lower(args: list[object.Object]) -> object.Object:
+    """Return the string in lower case."""
+    values = _strings("lower", args, 1)
+    if isinstance(values, object.Error):
+        return values
+
+    return object.makeString(values[0].lower())
+
+
+def contains(args: list[object.Object]) -> object.Object:
+    """Return true if the first string contains the second."""
+    values = _strings("contains", args, 2)
+    if isinstance(values, object.Error):
+        return values
+
+    return object.makeBoolean(values[1] in values[0])
+
+
+def field(args: list[object.Object]) -> object.Object:
+    """Return the nth whitespace separated field of a string, like `$n` of awk.
+
+    Fields are counted from 1, the field 0 is the whole string
+    and a missing field is empty.
+    """
+    if len(args) != 2:
+        return object.Error(message=f"field expects 2 arguments, got {len(args)}")
+    text, index = args
+    if text.type != object.STRING_OBJ or index.type != object.NUMBER_OBJ:
+        return object.Error(message="field expects a string and a number")
+    if type(index.value) is not int:
+        return object.Error(message=f"field expects a integer index, got {index}")
+
+    if index.value == 0:
+        return text
+    fields = text.value.split()
+    if 0 < index.value <= len(fields):
+        return object.makeString(fields[index.value - 1])
+    return object.makeString("")
+
+
+def concat(args: list[object.Object]) -> object.Object:
+    """Return the arguments joined into a string."""
+    return object.makeString("".join(map(str, args)))
+
+
+def number(args: list[object.Object]) -> object.Object:
+    """Return the number written in a string."""
+    values = _strings("number", args, 1)
+    if isinstance(values, object.Error):
+        return values
+
+    try:
+        return object.makeNumber(object.parseNumber(values[0]))
+    except Exception:
+        return object.Error(message=f"Cannot convert {values[0]!r} to a number")
+
+
+# Operators `map`, `filter` and `reduce` run over arrays, by their name,
+# as the operator on integers and the operator on floats.
+ARITHMETIC = frozenset(("+", "-", "*", "/"))
+OPERATORS: dict[str, tuple[Callable, Callable]] = {
+    "+": (operator.add, operator.add),
+    "-": (operator.sub, operator.sub),
+    "*": (operator.mul, operator.mul),
+    "/": (operator.floordiv, operator.truediv),
+    "lt": (operator.lt, operator.lt),
+    "gt": (operator.gt, operator.gt),
+    "eq": (operator.eq, operator.eq),
+}
+
+
+def _operator(
+    name: str, args: list[object.Object], minimum: int, maximum: int
+) -> tuple[str, array] | object.Error:
+    """Return the operator name and the Array storage of `(name operator array ...)`."""
+    if not minimum <= len(args) <= maximum:
+        return object.Error(
+            message=f"{name} expects a operator, a array and {maximum - 2} value"
+        )
+    operatorName, storage = args[0], args[1]
+    if operatorName.type != object.STRING_OBJ or operatorName.value not in OPERATORS:
+        return object.Error(message=f"{name} expects the name of a operator")
+    if storage.type is not ARRAY_OBJ:
+        return object.Error(message=f"{name} expects a array, got {storage.type}")
+    return operatorName.value, storage.value
+
+
+def makeArray(args: list[object.Object]) -> object.Object:
+    """Return a Array of the arguments, which must be numbers.
+
+    A single Array is returned as it is, a single Sequence is read into a Array.
+    """
+    if len(args) == 1 and args[0].type is ARRAY_OBJ:
+        return args[0]
+    if len(args) == 1 and args[0].type is SEQUENCE_OBJ:
+        args = list(args[0].value)
+        if args and args[-1].type is ERROR_OBJ:
+            return args[-1]
+    values = _numbers("array", args)
+    if type(values) is not list:
+        return values
+
+    return object.makeArray(values)
+
+
+def total(args: list[object.Object]) -> object.Object:
+    """Return the sum of the elements of a Array, or of a Sequence of numbers.
+
+    A Sequence is added up as it is read, without keeping it's elements.
+    """
+    if len(args) != 1 or args[0].type not in (ARRAY_OBJ, SEQUENCE_OBJ):
+        return object.Error(message="sum expects a array or a sequence")
+    if args[0].type is ARRAY_OBJ:
+        return object.makeNumber(sum(args[0].value))
+
+    result = 0
+    for element in args[0].value:
+        if element.type is not NUMBER_OBJ:
+            if element.type is ERROR_OBJ:
+                return element
+            return object.Error(message=f"sum expects numbers, got {element.type}")
+        result += element.value
+    return object.makeNumber(result)
+
+
+def arrayReduce(args: list[object.Object]) -> object.Object:
+    """Return `(reduce operator array [initial])`, the array folded by the operator."""
+    operands = _operator("reduce", args, 2, 3)
+    if type(operands) is object.Error:
+        return operands
+    name, storage = operands
+    if name not in ARITHMETIC:
+        return object.Error(message="reduce expects a arithmetic operator")
+
+    initial = ()
+    if len(args) == 3:
+        if args[2].type is not NUMBER_OBJ:
+            return object.Error(message=f"reduce expects a number, got {args[2].type}")
+        initial = (args[2].value,)
+    elif len(storage) == 0:
+        return object.Error(message="reduce of a empty array needs a initial value")
+
+    intOperator, floatOperator = OPERATORS[name]
+    floats = _isFloat(storage) or (initial != () and _isFloat(initial[0]))
+    divisors = storage if initial else storage[1:]
+    if name == "/" and 0 in divisors:
+        return object.Error(message="Division by zero")
+
+    function = floatOperator if floats else intOperator
+    return object.makeNumber(reduce(function, storage, *initial))
+
+
+def arrayMap(args: list[object.Object]) -> object.Object:
+    """Return `(map operator array value)`, the operator on every element and the value.
+
+    The value is a number or a Array of the same length, comparisons give 1 or 0.
+    """
+    operands = _operator("map", args, 3, 3)
+    if type(operands) is object.Error:
+        return operands
+    name, storage = operands
+    if args[2].type is not NUMBER_OBJ and args[2].type is not ARRAY_OBJ:
+        return object.Error(
+            message=f"map expects a number or a array, got {args[2].type}"
+        )
+
+    result = _combine("map", *OPERATORS[name], storage, args[2].value)
+    if type(result) is object.Error:
+        return result
+    if name not in ARITHMETIC and result.typecode != object.INT_ARRAY:
+        result = array(object.INT_ARRAY, map(int, result))
+    return object.Array(result)
+
+
+def arrayFilter(args: list[object.Object]) -> object.Object:
+    """Return `(filter operator array value)`, the elements the comparison holds for."""
+    operands = _operator("filter", args, 3, 3)
+    if type(operands) is object.Error:
+        return operands
+    name, storage = operands
+    if name in ARITHMETIC:
+        return object.Error(message="filter expects a comparison")
+    if args[2].type is not NUMBER_OBJ and args[2].type is not ARRAY_OBJ:
+        return object.Error(
+            message=f"filter expects a number or a array, got {args[2].type}"
+        )
+
+    test = OPERATORS[name][0]
+    other = args[2].value
+    if type(other) is array:
+        if len(other) != len(storage):
+            return object.Error(message="filter expects arrays of the same length")
+        selectors = map(test, storage, other)
+    else:
+        selectors = map(test, storage, repeat(other))
+    return object.Array(array(storage.typecode, compress(storage, selectors)))
+
+
+def numbers(args: list[object.Object]) -> object.Object:
+    """Return a Array of the whitespace separated numbers of a string."""
+    values = _strings("numbers", args, 1)
+    if isinstance(values, object.Error):
+        return values
+
+    fields = values[0].split()
+    for typecode, convert in ((object.INT_ARRAY, int), (object.FLOAT_ARRAY, float)):
+        try:
+            return object.Array(array(typecode, map(convert, fields)))
+        except (ValueError, OverflowError):
+            pass
+    return object.Error(message=f"Cannot convert {values[0]!r} to numbers")
+
+
+def _callBuiltin(name: str, args: list[object.Object]) -> object.Object:
+    """Call the builtin of the name, the `call` of `map` and `filter` by default."""
+    builtin = BUILTINS.get(name)
+    if builtin is None:
+        return object.Error(message=f"No function named {name} found")
+    return builtin(args)
+
+
+def _elements(value: object.Object) -> Iterator[object.Object] | None:
+    """Return a iterator over a Sequence or the numbers of a Array, else None."""
+    if value.type is SEQUENCE_OBJ:
+        return value.value
+    if value.type is ARRAY_OBJ:
+        return map(object.makeNumber, value.value)
+    return None
+
+
+def _lazy(
+    name: str, args: list[object.Object], call: Callable, keep: bool
+) -> object.Object:
+    """Return the Sequence of `(map function elements values...)`.
+
+    Every element is given to the function with the values, when it is read.
+    With `keep` the elements the function is truthy for are kept, like `filter`.
+    A error is the last element of the Sequence.
+    """
+    if len(args) < 2 or args[0].type != object.STRING_OBJ:
+        return object.Error(
+            message=f"{name} expects the name of a function and a sequence"
+        )
+    elements = _elements(args[1])
+    if elements is None:
+        return object.Error(message=f"{name} expects a sequence, got {args[1].type}")
+    function, values = args[0].value, args[2:]
+
+    def mapped() -> Iterator[object.Object]:
+        for element in elements:
+            result = call(function, [element, *values])
+            yield result
+            if result.type is ERROR_OBJ:
+                return
+
+    def kept() -> Iterator[object.Object]:
+        for element in elements:
+            result = call(function, [element, *values])
+            if result.type is ERROR_OBJ:
+                yield result
+                return
+            if object.isTruthy(result):
+                yield element
+
+    return object.Sequence(kept() if keep else mapped())
+
+
+def mapping(args: list[object.Object], call: Callable = _callBuiltin) -> object.Object:
+    """Return `(map function elements values...)`.
+
+    A operator on a Array and a value runs over the whole Array, see `arrayMap()`,
+    else the result is a Sequence calling the function by name for every element.
+    Builtins are called by `call`, the evaluator gives a `call` of declared functions.
+    """
+    if _vectorized(args):
+        return arrayMap(args)
+    return _lazy("map", args, call, keep=False)
+
+
+def filtering(
+    args: list[object.Object], call: Callable = _callBuiltin
+) -> object.Object:
+    """Return `(filter function elements values...)`, like `mapping()`."""
+    if _vectorized(args):
+        return arrayFilter(args)
+    return _lazy("filter", args, call, keep=True)
+
+
+def _vectorized(args: list[object.Object]) -> bool:
+    """Return true for a operator, a Array and a value, run over the whole Array."""
+    return (
+        len(args) == 3
+        and args[0].type == object.STRING_OBJ
+        and args[0].value in OPERATORS
+        and args[1].type is ARRAY_OBJ
+    )
+
+
+def _count(name: str, args: list[object.Object]) -> int | object.Error:
+    """Return the count of `(name count elements)`, or a error."""
+    if len(args) != 2:
+        return object.Error(message=f"{name} expects a count and a sequence")
+    count = args[0].value
+    if args[0].type is not NUMBER_OBJ or type(count) is not int or count < 0:
+        return object.Error(message=f"{name} expects a count, got {args[0]}")
+    if args[1].type is not SEQUENCE_OBJ and args[1].type is not ARRAY_OBJ:
+        return object.Error(message=f"{name} expects a sequence, got {args[1].type}")
+    return count
+
+
+def take(args: list[object.Object]) -> object.Object:
+    """Return `(take count elements)`, the first elements of a Sequence or Array.
+
+    No element past the count is ever read from the Sequence.
+    """
+    count = _count("take", args)
+    if type(count) is not int:
+        return count
+
+    elements = args[1].value
+    if args[1].type is ARRAY_OBJ:
+        return object.Array(elements[:count])
+    return object.Sequence(islice(elements, count))
+
+
+def drop(args: list[object.Object]) -> object.Object:
+    """Return `(drop count elements)`, the elements after the first ones."""
+    count = _count("drop", args)
+    if type(count) is not int:
+        return count
+
+    elements = args[1].value
+    if args[1].type is ARRAY_OBJ:
+        return object.Array(elements[count:])
+    return object.Sequence(islice(elements, count, None))
+
+
+def lines(args: list[object.Object]) -> object.Object:
+    """Return the Sequence of the lines of a file, of stdin without arguments.
+
+    Lines are read one at a time, without their line break,
+    the file is closed once the Sequence is read to the end.
+    """
+    if len(args) > 1 or (args and args[0].type != object.STRING_OBJ):
+        return object.Error(message="lines expects the path of a file, or nothing")
+
+    path = args[0].value if args else None
+
+    def strings(file: Iterable[str]) -> Iterator[object.Object]:
+        for line in file:
+            if line.endswith("\n"):
+                line = line[:-1]
+            yield object.makeString(line)
+
+    def read() -> Iterator[object.Object]:
+        if path is None:
+            yield from strings(sys.stdin)
+            return
+        try:
+            file = open(path)
+        except OSError as error:
+            yield object.Error(message=f"Cannot read {path}: {error.strerror}")
+            return
+        with file:
+            yield from strings(file)
+
+    return object.Sequence(read())
+
+
+def _command(name: str, args: list[object.Object]) -> list[str] | object.Error:
+    """Return the command and it's arguments as strings, numbers are written out."""
+    if not args or args[0].type != object.STRING_OBJ:
+        return object.Error(message=f"{name} expects a command")
+    for arg in args:
+        if arg.type != object.STRING_OBJ and arg.type is not NUMBER_OBJ:
+            return object.Error(
+                message=f"{name} expects strings or numbers, got {arg.type}"
+            )
+    return [str(arg) for arg in args]
+
+
+def sh(args: list[object.Object]) -> object.Object:
+    """Return `(sh command arguments...)`, the Sequence of the lines of the command.
+
+    The command is started without a shell, it's lines are read as it writes them.
+    """
+    argv = _command("sh", args)
+    if type(argv) is not list:
+        return argv
+
+    from bsharp import shell
+
+    return shell.start(argv)
+
+
+def pipe(args: list[object.Object]) -> object.Object:
+    """Return `(pipe elements command arguments...)`, the elements piped to the command.
+
+    The elements are written as lines to the stdin of the command, the lines of a
+    `sh` or `pipe` not read yet are connected to it by a OS pipe.
+    """
+    if not args:
+        return object.Error(message="pipe expects a sequence and a command")
+    elements = _elements(args[0])
+    if elements is None:
+        return object.Error(message=f"pipe expects a sequence, got {args[0].type}")
+    argv = _command("pipe", args[1:])
+    if type(argv) is not list:
+        return argv
+
+    from bsharp import shell
+
+    return shell.start(argv, elements)
+
+
+def run(args: list[object.Object]) -> object.Object:
+    """Return `(run command arguments...)`, the exit status of the finished command.
+
+    The command shares the stdin and stdout of bsharp.
+    """
+    argv = _command("run", args)
+    if type(argv) is not list:
+        return argv
+
+    from bsharp import shell
+
+    return shell.run(argv)
+
+
+def display(args: list[object.Object]) -> object.Object:
+    """Print the arguments separated by spaces, a Sequence a element per line."""
+    if len(args) == 1 and args[0].type is SEQUENCE_OBJ:
+        for element in args[0].value:
+            if element.type is ERROR_OBJ:
+                return element
+            print(element)
+        return object.CONST_NIL
+
+    print(*args)
+    return object.CONST_NIL
+
+
+BUILTINS: dict[str, Callable[[list[object.Object]], object.Object]] = {
+    "+": add,
+    "-": subtract,
+    "*": multiply,
+    "/": divide,
+    "eq": equal,
+    "lt": _compare("lt", operator.lt),
+    "gt": _compare("gt", operator.gt),
+    "len": length,
+    "upper": upper,
+    "lower": lower,
+    "contains": contains,
+    "field": field,
+    "concat": concat,
+    "number": number,
+    "array": makeArray,
+    "sum": total,
+    "reduce": arrayReduce,
+    "map": mapping,
+    "filter": filtering,
+    "numbers": numbers,
+    "take": take,
+    "drop": drop,
+    "lines": lines,
+    "sh": sh,
+    "pipe": pipe,
+    "run": run,
+    "print": display,
+}
+
+# Builtins calling functions by name, taking the `call` of declared functions
+# as a second argument, see `mapping()`.
+CALLING_BUILTINS = frozenset(("map", "filter"))
+
+# Builtins whose result only depends on their arguments, with no side effect.
+PURE_BUILTINS = frozenset(
+    (
+        "+",
+        "-",
+        "*",
+        "/",
+        "eq",
+        "lt",
+        "gt",
+        "len",
+        "upper",
+        "lower",
+        "contains",
+        "field",
+        "concat",
+        "number",
+        "array",
+        "sum",
+        "reduce",
+        "numbers",
+        "take",
+        "drop",
+    )
+)
@@ -0,0 +1,139 @@
+"""Cache stores parsed scripts on disk, so a unchanged script is not parsed again."""
+
+import gc
+import hashlib
+import marshal
+import os
+import zlib
+
+from bsharp import __version__
+from bsharp import ast
+
+# Directory created next to a script to hold it's cache, like `__pycache__`.
+CACHE_DIRECTORY = "__bscache__"
+
+# Start of every cache file, the last byte is the version of the layout.
+MAGIC = b"BSC\x01"
+
+# Cache files of other versions of bsharp are never read.
+TAG = f"bsharp-{__version__}"
+
+
+def cache_path(path: str | os.PathLike) -> str:
+    """Return the path of the cache file of a script."""
+    directory, name = os.path.split(os.fspath(path))
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, CACHE_DIRECTORY, f"{stem}.{TAG}.bsc")
+
+
+def digest(data: bytes) -> bytes:
+    """Return the 16 bytes hash of the data."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def dump(program: ast.Program, key: bytes) -> bytes:
+    """Serialize a Program as a arena, with the key it is valid for.
+
+    The serialized arena is compressed and follows it's own hash,
+    to tell a corrupt file.
+    """
+    arena = ast.Arena.from_program(program)
+    payload = marshal.dumps(
+        (
+            TAG,
+            key,
+            arena.kinds.tobytes(),
+            arena.values.tobytes(),
+            arena.starts.tobytes(),
+            arena.counts.tobytes(),
+            arena.children.tobytes(),
+            arena.strings,
+        )
+    )
+    # The fastest level already makes the file smaller than the source.
+    payload = zlib.compress(payload, 1)
+    return MAGIC + digest(payload) + payload
+
+
+def load(data: bytes, key: bytes) -> ast.Program | None:
+    """Return the Program serialized in data, None if it is stale or corrupt."""
+    checksum, payload = data[len(MAGIC) : len(MAGIC) + 16], data[len(MAGIC) + 16 :]
+    if not data.startswith(MAGIC) or checksum != digest(payload):
+        return None
+
+    try:
+        tag, stored, *fields, strings = marshal.loads(zlib.decompress(payload))
+        if tag != TAG or stored != key:
+            return None
+
+        arena = ast.Arena()
+        arena.strings = strings
+        arrays = (arena.kinds, arena.values, arena.starts, arena.counts, arena.children)
+        for target, field in zip(arrays, fields, strict=True):
+            target.frombytes(field)
+
+        # Rebuilding makes many objects and no cycles, a collection would be wasted.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            program = arena.to_program()
+        finally:
+            if enabled:
+                gc.enable()
+    except Exception:
+        return None
+
+    if not isinstance(program, ast.Program):
+        return None
+    return program
+
+
+def write(path: str, data: bytes) -> None:
+    """Write the cache file, giving up silently if it cannot be written."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary, "wb") as file:
+            file.write(data)
+        # A reader sees the old file or the new one, never a partial one.
+        os.replace(temporary, path)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+
+def parse_file(
+    path: str | os.PathLike, cache: bool = True
+) -> tuple[ast.Program, list[str]]:
+    """Return the Program of a script and the errors of parsing it.
+
+    A script whose source and bsharp version match it's cache file is loaded
+    from it, without lexing or parsing. Otherwise the script is parsed
+    and the cache file is written, if there were no errors.
+    """
+    with open(path, "rb") as file:
+        source = file.read()
+    key = digest(source)
+    cached = cache_path(path)
+
+    if cache:
+        try:
+            with open(cached, "rb") as file:
+                program = load(file.read(), key)
+        except OSError:
+            program = None
+        if program is not None:
+            return program, []
+
+    # Only a cache miss needs the lexer and the parser.
+    from bsharp.lexer import BACKEND_REGEX, Lexer
+    from bsharp.parser import Parser
+
+    parser = Parser(Lexer(source.decode("utf-8"), backend=BACKEND_REGEX))
+    program = parser.parse_program()
+
+    if cache and not parser.errors:
+        write(cached, dump(program, key))
+    return program, parser.errors
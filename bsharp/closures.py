@@ -0,0 +1,407 @@
+"""Closure compiler turns a Program into a tree of pre-bound Python closures."""
+
+from collections.abc import Callable
+
+from bsharp import ast
+from bsharp import object
+from bsharp import token
+from bsharp.builtins import BUILTINS, CALLING_BUILTINS, makeArray
+from bsharp.environment import Environment
+from bsharp.resolver import Resolver
+import sys
+
+Compiled = Callable[[Environment], object.Object]
+
+
+class ClosureCompiler:
+    """Class compiles a Program once, so every later run is only closure calls.
+
+    Every expression is compiled into a closure taking the environment.
+    The type of the expression, the name of a call and the builtin it refers to
+    are decided once while compiling, never while running.
+
+    Exported Methods:
+
+        - compile(program): Returns a function taking a Environment and returning the result.
+
+    The compiled program gives the same results as `Evaluator.eval()`.
+    Functions are declared in the environment as their `ast.FunctionExpression`,
+    so a environment can be shared with the `Evaluator`.
+    Variables of functions are resolved to their slot while compiling.
+    Like the Evaluator, a call in tail position of a function does not recurse,
+    so a recursive loop runs in constant stack. Other calls recurse in Python,
+    as deep as the Evaluator does.
+    """
+
+    def __init__(self) -> None:
+        """Construct the ClosureCompiler class."""
+        self.functions: dict[
+            ast.FunctionExpression, tuple[int, int, list[Compiled], Compiled]
+        ]
+        self.functions = {}
+        self.resolver = Resolver()
+
+    def error(self, message: str) -> None:
+        """Convey the error and exit gracefully."""
+        print(message)
+        sys.exit(1)
+
+    def compile(self, ex: ast.Expression) -> Compiled:
+        """Compile any given expression."""
+        match type(ex):
+            case ast.StringExpression:
+                return self.compileConstant(object.String, ex.value)
+            case ast.NumberExpression:
+                if ex.constant is None:
+                    return self.compileConstant(object.Number, ex.value)
+                constant = ex.constant
+                return lambda env: constant
+            case ast.IdentifierExpression:
+                return self.compileIdentifier(ex)
+            case ast.FunctionExpression:
+                return self.compileFunction(ex)
+            case ast.CallExpression:
+                return self.compileCall(ex)
+            case ast.ArrayExpression:
+                return self.compileArray(ex)
+            case ast.Program:
+                self.resolver.resolve(ex)
+                return self.compileBlock(ex.expressions)
+
+        return lambda env: object.CONST_NIL
+
+    def compileConstant(self, construct: Callable, value: str) -> Compiled:
+        """Compile a literal, constructed once."""
+        try:
+            constant = construct(value)
+        except Exception:
+            # Report the literal only if it is evaluated, like the evaluator.
+            return lambda env: construct(value)
+
+        return lambda env: constant
+
+    def compileBlock(self, expressions: list[ast.Expression]) -> Compiled:
+        """Compile expressions evaluated in order, returning the last value."""
+        compiled = [self.compile(expression) for expression in expressions]
+
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def block(env: Environment) -> object.Object:
+            """Run every expression."""
+            evaluate = object.CONST_NIL
+            for expression in compiled:
+                evaluate = expression(env)
+            return evaluate
+
+        return block
+
+    def compileIdentifier(self, ex: ast.IdentifierExpression) -> Compiled:
+        """Compile a variable lookup, by it's slot if it was resolved."""
+        name = ex.value
+        missing = object.Error(message=f"No variable named {name} found")
+
+        def identifier(env: Environment) -> object.Object:
+            """Look the global variable up."""
+            return env.globals.get(name, missing)
+
+        slot = self.resolver.slots.get(ex)
+        if slot is None:
+            return identifier
+        depth, index = slot
+
+        if depth == 0:
+
+            def local(env: Environment) -> object.Object:
+                """Look the variable of the function up."""
+                value = env.slots[index]
+                if value is None:
+                    return env.globals.get(name, missing)
+                return value
+
+            return local
+
+        def enclosing(env: Environment) -> object.Object:
+            """Look the variable of a enclosing function up."""
+            value = env.ancestor(depth).slots[index]
+            if value is None:
+                return env.globals.get(name, missing)
+            return value
+
+        return enclosing
+
+    def compileFunction(self, ex: ast.FunctionExpression) -> Compiled:
+        """Compile a function declaration, the body is compiled right away."""
+        name = ex.function.getValue()
+        self.compileBody(ex)
+
+        def function(env: Environment) -> object.Object:
+            """Declare the function."""
+            env.functions[name] = (ex, env)
+            return object.CONST_NIL
+
+        return function
+
+    def compileBody(
+        self, ex: ast.FunctionExpression
+    ) -> tuple[int, int, list[Compiled], Compiled]:
+        """Return the number of parameters and slots and the compiled body.
+
+        The last expression of the body is compiled apart, in tail position.
+        """
+        compiled = self.functions.get(ex)
+        if compiled is None:
+            size = self.resolver.sizeOf(ex)
+            if ex.body:
+                last = self.compileTail(ex.body[-1])
+            else:
+                last = lambda env: object.CONST_NIL
+            compiled = self.functions[ex] = (
+                len(ex.args),
+                size,
+                [self.compile(expression) for expression in ex.body[:-1]],
+                last,
+            )
+        return compiled
+
+    def compileTail(self, ex: ast.Expression) -> Compiled:
+        """Compile a expression in tail position.
+
+        A call to a declared function returns the function and it's arguments
+        instead of calling it, for `applyFunction()` to call in a loop.
+        The branches of a `if` are in tail position too.
+        """
+        if type(ex) is not ast.CallExpression:
+            return self.compile(ex)
+
+        name = ex.function.getValue()
+        if name == token.IF and len(ex.args) in (2, 3):
+            return self.compileIf(ex, tail=True)
+        if name in (token.SET, token.IF) or ex in self.resolver.builtins:
+            return self.compile(ex)
+
+        arguments = self.compileArguments(ex.args)
+        callBuiltin = self.compileCallBuiltin(ex, arguments)
+
+        def tailCall(env: Environment) -> object.Object | tuple:
+            """Return the declared function and it's arguments, else call a builtin."""
+            function = env.functions.get(name)
+            if function is None:
+                return callBuiltin(env)
+
+            values = arguments(env)
+            if type(values) is not list:
+                return values
+            return function, values
+
+        return tailCall
+
+    def applyFunction(
+        self, function: tuple, values: list[object.Object]
+    ) -> object.Object:
+        """Call the declared function and it's scope with evaluated arguments.
+
+        A call in tail position returns the next function to call in place of this one.
+        """
+        compileBody = self.compileBody
+        while True:
+            declaration, scope = function
+            params, size, body, last = compileBody(declaration)
+
+            if params != len(values):
+                self.error(f"Given arguments does not match, required arguments")
+            if size > params:
+                values += [None] * (size - params)
+
+            new_environment = Environment(scope, values)
+            for expression in body:
+                expression(new_environment)
+
+            result = last(new_environment)
+            if type(result) is not tuple:
+                return result
+            function, values = result
+
+    def compileArguments(self, args: list[ast.Expression]) -> Callable:
+        """Compile the arguments of a call.
+
+        The compiled arguments return a list of values, or the first error.
+        """
+        compiled = [self.compile(arg) for arg in args]
+        ERROR_OBJ = object.ERROR_OBJ
+
+        def arguments(env: Environment) -> list[object.Object] | object.Object:
+            """Evaluate every argument, stopping at the first error."""
+            values = []
+            for arg in compiled:
+                value = arg(env)
+                if value.type == ERROR_OBJ:
+                    return value
+                values.append(value)
+            return values
+
+        return arguments
+
+    def compileArray(self, ex: ast.ArrayExpression) -> Compiled:
+        """Compile a array literal, evaluating it's elements like arguments."""
+        elements = self.compileArguments(ex.elements)
+
+        def array(env: Environment) -> object.Object:
+            """Build the Array of the elements."""
+            values = elements(env)
+            if type(values) is not list:
+                return values
+            return makeArray(values)
+
+        return array
+
+    def compileCall(self, ex: ast.CallExpression) -> Compiled:
+        """Compile any call expression."""
+        name = ex.function.getValue()
+
+        match name:
+            case token.SET:
+                return self.compileSet(ex)
+            case token.IF:
+                return self.compileIf(ex)
+
+        arguments = self.compileArguments(ex.args)
+
+        builtin = self.resolver.builtins.get(ex)
+        if builtin is not None:
+
+            def callBuiltin(env: Environment) -> object.Object:
+                """Call the builtin the call was resolved to."""
+                values = arguments(env)
+                if type(values) is not list:
+                    return values
+                return builtin(values)
+
+            return callBuiltin
+
+        callBuiltin = self.compileCallBuiltin(ex, arguments)
+        applyFunction = self.applyFunction
+
+        def call(env: Environment) -> object.Object:
+            """Call the declared function, else the builtin."""
+            function = env.functions.get(name)
+            if function is None:
+                return callBuiltin(env)
+
+            values = arguments(env)
+            if type(values) is not list:
+                return values
+            return applyFunction(function, values)
+
+        return call
+
+    def compileCallBuiltin(
+        self, ex: ast.CallExpression, arguments: Callable
+    ) -> Compiled:
+        """Compile the call of the builtin named like the call, if any."""
+        name = ex.function.getValue()
+        builtin = BUILTINS.get(name)
+        if builtin is None:
+            missing = object.Error(message=f"No function named {name} found")
+            return lambda env: missing
+
+        if name in CALLING_BUILTINS:
+            caller = self.caller
+
+            def callCalling(env: Environment) -> object.Object:
+                """Call the builtin, giving it the functions of the environment."""
+                values = arguments(env)
+                if type(values) is not list:
+                    return values
+                return builtin(values, caller(env))
+
+            return callCalling
+
+        def callBuiltin(env: Environment) -> object.Object:
+            """Call the builtin."""
+            values = arguments(env)
+            if type(values) is not list:
+                return values
+            return builtin(values)
+
+        return callBuiltin
+
+    def caller(self, env: Environment) -> Callable:
+        """Return the `call` of builtins calling functions by name in the environment.
+
+        Declared functions are called before builtins, like a call expression.
+        """
+
+        def call(name: str, args: list[object.Object]) -> object.Object:
+            function = env.functions.get(name)
+            if function is not None:
+                return self.applyFunction(function, args)
+            builtin = BUILTINS.get(name)
+            if builtin is None:
+                return object.Error(message=f"No function named {name} found")
+            if name in CALLING_BUILTINS:
+                return builtin(args, call)
+            return builtin(args)
+
+        return call
+
+    def compileSet(self, ex: ast.CallExpression) -> Compiled:
+        """Compile `(set name value)`."""
+        if len(ex.args) != 2 or not isinstance(ex.args[0], ast.IdentifierExpression):
+            invalid = object.Error(message="set expects a name and a value")
+            return lambda env: invalid
+
+        name = ex.args[0].value
+        compiled = self.compile(ex.args[1])
+        slot = self.resolver.slots.get(ex.args[0])
+
+        def assign(env: Environment) -> object.Object:
+            """Bind the value to the name."""
+            value = compiled(env)
+            if value.type != object.ERROR_OBJ:
+                env.variables[name] = value
+            return value
+
+        if slot is None:
+            return assign
+        depth, index = slot
+
+        def store(env: Environment) -> object.Object:
+            """Bind the value to the slot."""
+            value = compiled(env)
+            if value.type != object.ERROR_OBJ:
+                env.ancestor(depth).slots[index] = value
+            return value
+
+        return store
+
+    def compileIf(self, ex: ast.CallExpression, tail: bool = False) -> Compiled:
+        """Compile `(if condition consequence alternative)`.
+
+        With tail the branches are in tail position, see `compileTail()`.
+        """
+        if len(ex.args) not in (2, 3):
+            invalid = object.Error(
+                message="if expects a condition, a consequence and a alternative"
+            )
+            return lambda env: invalid
+
+        compileBranch = self.compileTail if tail else self.compile
+        condition = self.compile(ex.args[0])
+        consequence = compileBranch(ex.args[1])
+        if len(ex.args) == 3:
+            alternative = compileBranch(ex.args[2])
+        else:
+            alternative = lambda env: object.CONST_NIL
+        isTruthy = object.isTruthy
+
+        def branch(env: Environment) -> object.Object:
+            """Run the consequence or the alternative."""
+            value = condition(env)
+            if value.type == object.ERROR_OBJ:
+                return value
+            if isTruthy(value):
+                return consequence(env)
+            return alternative(env)
+
+        return branch
@@ -0,0 +1,292 @@
+"""Compiler lowers a Program into bytecode for the bsharp virtual machine."""
+
+from array import array
+
+from bsharp import ast
+from bsharp import object
+from bsharp import token
+from bsharp.builtins import BUILTINS, makeArray
+from bsharp.resolver import Resolver
+
+# Every instruction is 3 integers, the opcode and it's two arguments.
+CONST = 0  # Push constants[a].
+LOAD_NAME = 1  # Push the global names[a], or a error if it is missing.
+STORE_NAME = 2  # Bind names[a] to the top of the stack, unless it is a error.
+CALL = 3  # Call the function names[a] with the top b values as arguments.
+CHECK_FUNCTION = 4  # Push a error and jump to b unless names[a] can be called.
+ON_ERROR = 5  # If the top is a error, drop the a values below it and jump to b.
+JUMP = 6  # Jump to a.
+JUMP_IF_FALSE = 7  # Pop the top of the stack, jump to a if it is not truthy.
+DEFINE = 8  # Declare the Function constants[a], push NIL.
+POP = 9  # Discard the top of the stack.
+RETURN = 10  # Return the top of the stack to the caller.
+LOAD_LOCAL = 11  # Push slot b of the function, else the global names[a].
+LOAD_ENCLOSING = 12  # Push the slot constants[b] as (depth, index), else names[a].
+STORE_LOCAL = 13  # Bind slot a to the top of the stack, unless it is a error.
+CALL_BUILTIN = 14  # Call the builtin constants[a] with the top b values as arguments.
+
+OPNAMES = (
+    "CONST",
+    "LOAD_NAME",
+    "STORE_NAME",
+    "CALL",
+    "CHECK_FUNCTION",
+    "ON_ERROR",
+    "JUMP",
+    "JUMP_IF_FALSE",
+    "DEFINE",
+    "POP",
+    "RETURN",
+    "LOAD_LOCAL",
+    "LOAD_ENCLOSING",
+    "STORE_LOCAL",
+    "CALL_BUILTIN",
+)
+
+# Size of a instruction in the instructions array.
+WIDTH = 3
+
+
+class Code:
+    """Code is the compiled form of a Program or of a function body.
+
+    Attributes:
+        - instructions(array): Every instruction as 3 integers, opcode and arguments.
+        - constants(list): Objects and Functions referred to by index.
+        - names(list[str]): Variable and function names referred to by index.
+        - name(str): What was compiled, `<program>` or the name of the function.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Construct empty code."""
+        self.name = name
+        self.instructions = array("i")
+        self.constants: list = []
+        self.names: list[str] = []
+
+    def __repr__(self) -> str:
+        """Represent the code as string."""
+        return f"<Code {self.name}, {len(self.instructions) // WIDTH} instructions>"
+
+
+class Function:
+    """Function is a compiled function declaration.
+
+    Attributes:
+        - name(str): Name the function is declared with.
+        - params(list[str]): Names of the parameters.
+        - code(Code): Compiled body of the function.
+        - size(int): Number of slots of the variables of the function.
+    """
+
+    def __init__(self, name: str, params: list[str], code: Code, size: int) -> None:
+        """Construct the function."""
+        self.name = name
+        self.params = params
+        self.code = code
+        self.size = size
+
+    def __repr__(self) -> str:
+        """Represent the function as string."""
+        return f"<Function {self.name}>"
+
+
+class Compiler:
+    """Class compiles a Program into `Code` for `bsharp.vm.VM`.
+
+    Exported Methods:
+
+        - compile(program): Returns the Code of the program.
+
+    The compiled program gives the same results as `Evaluator.eval()`.
+    Arguments are evaluated in order, a error stops the call and skips the rest.
+    Variables of functions are resolved to their slot while compiling.
+    """
+
+    def __init__(self) -> None:
+        """Construct the Compiler class."""
+        self.resolver = Resolver()
+        # Number of parameters of the function being compiled.
+        self.params = 0
+
+    def compile(self, program: ast.Program) -> Code:
+        """Compile a whole Program."""
+        self.resolver.resolve(program)
+        code = Code("<program>")
+        self.compileBlock(code, program.expressions)
+        self.emit(code, RETURN)
+        return code
+
+    def emit(self, code: Code, op: int, a: int = 0, b: int = 0) -> int:
+        """Add a instruction to the code and return it's position."""
+        position = len(code.instructions)
+        code.instructions.extend((op, a, b))
+        return position
+
+    def patch(self, code: Code, position: int, argument: int, target: int) -> None:
+        """Set a argument of the instruction at position to the target."""
+        code.instructions[position + argument] = target
+
+    def constant(self, code: Code, value) -> int:
+        """Return the index of a constant in the code."""
+        code.constants.append(value)
+        return len(code.constants) - 1
+
+    def name(self, code: Code, name: str) -> int:
+        """Return the index of a name in the code, adding it once."""
+        if name not in code.names:
+            code.names.append(name)
+        return code.names.index(name)
+
+    def compileBlock(self, code: Code, expressions: list[ast.Expression]) -> None:
+        """Compile expressions evaluated in order, leaving the last value."""
+        if not expressions:
+            self.emit(code, CONST, self.constant(code, object.CONST_NIL))
+            return
+
+        for index, expression in enumerate(expressions):
+            if index > 0:
+                self.emit(code, POP)
+            self.compileExpression(code, expression)
+
+    def compileExpression(self, code: Code, ex: ast.Expression) -> None:
+        """Compile any given expression, leaving it's value on the stack."""
+        match type(ex):
+            case ast.StringExpression:
+                self.emit(code, CONST, self.constant(code, object.String(ex.value)))
+            case ast.NumberExpression:
+                constant = ex.constant
+                if constant is None:
+                    constant = object.Number(ex.value)
+                self.emit(code, CONST, self.constant(code, constant))
+            case ast.IdentifierExpression:
+                self.compileIdentifier(code, ex)
+            case ast.FunctionExpression:
+                self.compileFunction(code, ex)
+            case ast.CallExpression:
+                self.compileCall(code, ex)
+            case ast.ArrayExpression:
+                self.compileArray(code, ex)
+            case _:
+                self.emit(code, CONST, self.constant(code, object.CONST_NIL))
+
+    def compileIdentifier(self, code: Code, ex: ast.IdentifierExpression) -> None:
+        """Compile a variable lookup, by it's slot if it was resolved."""
+        nameIndex = self.name(code, ex.value)
+        slot = self.resolver.slots.get(ex)
+
+        if slot is None:
+            self.emit(code, LOAD_NAME, nameIndex)
+        elif slot[0] == 0:
+            self.emit(code, LOAD_LOCAL, nameIndex, slot[1])
+        else:
+            self.emit(code, LOAD_ENCLOSING, nameIndex, self.constant(code, slot))
+
+    def compileFunction(self, code: Code, ex: ast.FunctionExpression) -> None:
+        """Compile a function declaration and it's body."""
+        name = ex.function.getValue()
+
+        body = Code(name)
+        params, self.params = self.params, len(ex.args)
+        self.compileBlock(body, ex.body)
+        self.emit(body, RETURN)
+        self.params = params
+
+        params = [arg.value for arg in ex.args]
+        function = Function(name, params, body, self.resolver.sizeOf(ex))
+        self.emit(code, DEFINE, self.constant(code, function))
+
+    def mayFail(self, ex: ast.Expression) -> bool:
+        """Return True if evaluating the expression can give a error.
+
+        A parameter of the function being compiled is always bound.
+        """
+        if isinstance(ex, ast.IdentifierExpression):
+            slot = self.resolver.slots.get(ex)
+            return slot is None or slot[0] != 0 or slot[1] >= self.params
+        return isinstance(ex, (ast.CallExpression, ast.ArrayExpression))
+
+    def compileError(self, code: Code, message: str) -> None:
+        """Compile a expression always giving a error."""
+        self.emit(code, CONST, self.constant(code, object.Error(message=message)))
+
+    def compileCall(self, code: Code, ex: ast.CallExpression) -> None:
+        """Compile any call expression."""
+        name = ex.function.getValue()
+
+        match name:
+            case token.SET:
+                return self.compileSet(code, ex)
+            case token.IF:
+                return self.compileIf(code, ex)
+
+        builtin = self.resolver.builtins.get(ex)
+        exits = []
+
+        if builtin is None and name not in BUILTINS:
+            exits.append(self.emit(code, CHECK_FUNCTION, self.name(code, name)))
+
+        for index, arg in enumerate(ex.args):
+            self.compileExpression(code, arg)
+            if self.mayFail(arg):
+                exits.append(self.emit(code, ON_ERROR, index))
+
+        if builtin is None:
+            self.emit(code, CALL, self.name(code, name), len(ex.args))
+        else:
+            self.emit(code, CALL_BUILTIN, self.constant(code, builtin), len(ex.args))
+
+        end = len(code.instructions)
+        for exit in exits:
+            self.patch(code, exit, 2, end)
+
+    def compileArray(self, code: Code, ex: ast.ArrayExpression) -> None:
+        """Compile a array literal as a call of the `array` builtin."""
+        exits = []
+        for index, element in enumerate(ex.elements):
+            self.compileExpression(code, element)
+            if self.mayFail(element):
+                exits.append(self.emit(code, ON_ERROR, index))
+
+        self.emit(code, CALL_BUILTIN, self.constant(code, makeArray), len(ex.elements))
+
+        end = len(code.instructions)
+        for exit in exits:
+            self.patch(code, exit, 2, end)
+
+    def compileSet(self, code: Code, ex: ast.CallExpression) -> None:
+        """Compile `(set name value)`."""
+        if len(ex.args) != 2 or not isinstance(ex.args[0], ast.IdentifierExpression):
+            return self.compileError(code, "set expects a name and a value")
+
+        self.compileExpression(code, ex.args[1])
+        slot = self.resolver.slots.get(ex.args[0])
+        if slot is None:
+            self.emit(code, STORE_NAME, self.name(code, ex.args[0].value))
+        else:
+            self.emit(code, STORE_LOCAL, slot[1])
+
+    def compileIf(self, code: Code, ex: ast.CallExpression) -> None:
+        """Compile `(if condition consequence alternative)`."""
+        if len(ex.args) not in (2, 3):
+            return self.compileError(
+                code, "if expects a condition, a consequence and a alternative"
+            )
+
+        self.compileExpression(code, ex.args[0])
+        onError = self.emit(code, ON_ERROR, 0) if self.mayFail(ex.args[0]) else None
+        toAlternative = self.emit(code, JUMP_IF_FALSE)
+
+        self.compileExpression(code, ex.args[1])
+        toEnd = self.emit(code, JUMP)
+
+        self.patch(code, toAlternative, 1, len(code.instructions))
+        if len(ex.args) == 3:
+            self.compileExpression(code, ex.args[2])
+        else:
+            self.emit(code, CONST, self.constant(code, object.CONST_NIL))
+
+        end = len(code.instructions)
+        self.patch(code, toEnd, 1, end)
+        if onError is not None:
+            self.patch(code, onError, 2, end)
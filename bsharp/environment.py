@@ -1,14 +1,65 @@
 """Environment stores mapping between function, variables and their declaration."""
 
+from __future__ import annotations
+
 from bsharp.object import Object
-from bsharp import ast
 
 
 class Environment:
-    """Environment contains defnition of functions and variables."""
+    """Environment contains defnition of functions and variables.
+
+    Every call to a function runs in a new Environment,
+    whose parent is the Environment the function was declared in.
+    The Environment without a parent holds the global variables.
+
+    Input:
+
+        - parent: The enclosing Environment, None for the global one.
+        - slots: Slots of the variables of a function, it's arguments first.
+
+    Exported Methods:
 
-    def __init__(self):
+        - ancestor(depth): Returns the Environment `depth` parents up.
+        - lookup(name): Returns the variable bound to the name, looking up the parents.
+
+    Attributes:
+        - slots: Variables resolved by `bsharp.resolver`, indexed by their slot.
+        - variables: Variables bound by their name in this Environment.
+        - globals: The variables of the global Environment.
+        - functions: Declared functions and the Environment they were declared in,
+          shared by every Environment.
+    """
+
+    __slots__ = ("parent", "slots", "variables", "globals", "functions")
+
+    def __init__(
+        self, parent: Environment | None = None, slots: list[Object | None] = None
+    ):
         """Initialize a empty environment."""
-        self.variables: dict[Object, Object] = {}
+        self.parent = parent
+        self.slots = [] if slots is None else slots
+        self.variables: dict[str, Object] = {}
+
+        if parent is None:
+            self.globals = self.variables
+            self.functions: dict[str, tuple[object, Environment]] = {}
+        else:
+            self.globals = parent.globals
+            self.functions = parent.functions
+
+    def ancestor(self, depth: int) -> Environment:
+        """Return the Environment `depth` parents up."""
+        environment = self
+        for _ in range(depth):
+            environment = environment.parent
+        return environment
 
-        self.functions: dict[Object, ast.FunctionExpression] = {}
+    def lookup(self, name: str) -> Object | None:
+        """Return the variable bound to the name, looking up the parents."""
+        environment = self
+        while environment is not None:
+            value = environment.variables.get(name)
+            if value is not None:
+                return value
+            environment = environment.parent
+        return None
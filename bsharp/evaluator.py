@@ -1,13 +1,39 @@
 """Evaluator module."""
 
+from collections.abc import Callable
+
 from bsharp import ast
 from bsharp import object
+from bsharp import token
+from bsharp.builtins import BUILTINS, CALLING_BUILTINS, makeArray
 from bsharp.environment import Environment
+from bsharp.memo import Memo
+from bsharp.resolver import Resolver
 import sys
 
 
 class Evaluator:
-    """Class is the evaluator for bsharp."""
+    """Class is the evaluator for bsharp.
+
+    Calls are resolved in this order.
+
+    - Special forms, `(set name value)` and `(if condition consequence alternative)`.
+    - Functions declared with `fn` in the environment.
+    - Builtin functions from `bsharp.builtins`.
+
+    A error returned while evaluating the arguments of a call is returned by the call.
+    Builtins calling functions by name, like `map`, can call declared functions.
+    Given a `bsharp.memo.Memo`, the results of pure or marked functions are kept.
+
+    Variables are scoped lexically, a Program is resolved by `bsharp.resolver`
+    before it is evaluated, so variables of functions are looked up by their slot.
+    A variable not set yet in a function is looked up in the globals.
+    """
+
+    def __init__(self, memo: Memo | None = None) -> None:
+        """Construct the Evaluator class, memoizing functions with the Memo."""
+        self.resolver = Resolver()
+        self.memo = memo
 
     def error(self, message: str) -> None:
         """Convey the error and exit gracefully."""
@@ -16,61 +42,460 @@ class Evaluator:
 
     def extend_environment(
         self,
-        toMatch: list[ast.Expression],
-        givenArgs: list[ast.Expression],
-        old: Environment,
+        declaration: ast.FunctionExpression,
+        givenArgs: list[object.Object],
+        scope: Environment,
     ) -> Environment:
-        """Extend the environment with the current arguments."""
-        new_environment = Environment()
-        new_environment.functions = old.functions
-        new_environment.variables = old.variables
-
-        if len(toMatch) != len(givenArgs):
+        """Extend the scope of the function, binding the arguments to it's slots."""
+        if len(declaration.args) != len(givenArgs):
             self.error(f"Given arguments does not match, required arguments")
 
-        for wanted, given in zip(toMatch, givenArgs):
-            print(toMatch, givenArgs, wanted, given)
+        size = self.resolver.sizeOf(declaration)
+        if size > len(givenArgs):
+            givenArgs += [None] * (size - len(givenArgs))
+
+        return Environment(scope, givenArgs)
 
-        return new_environment
+    def evaluateArguments(
+        self, args: list[ast.Expression], environment: Environment
+    ) -> list[object.Object] | object.Error:
+        """Evaluate every argument, stopping at the first error."""
+        values = []
+        for arg in args:
+            value = self.eval(arg, environment)
+            if value.type == object.ERROR_OBJ:
+                return value
+            values.append(value)
+        return values
 
     def evaluateFunction(
-        self, fn: ast.Expression, environment: Environment
+        self, fn: ast.CallExpression, environment: Environment
+    ) -> object.Object:
+        """Evaluate a call to a function declared in the environment.
+
+        A call to a declared function in tail position of the body is not evaluated
+        recursively, the loop calls it in place of the current one.
+        So a recursive loop runs in constant stack.
+        """
+        args = self.evaluateArguments(fn.args, environment)
+        if isinstance(args, object.Error):
+            return args
+        return self.applyFunction(fn.function.getValue(), args, environment)
+
+    def applyFunction(
+        self, name: str, args: list[object.Object], environment: Environment
+    ) -> object.Object:
+        """Call the function declared as name with evaluated arguments.
+
+        With a Memo every memoized call made by the loop gets the final result,
+        a call whose result is kept ends the loop.
+        """
+        memo = self.memo
+        keys = None
+        while True:
+            func, scope = environment.functions[name]
+
+            if memo is not None:
+                key = memo.key(func, args)
+                if key is not None:
+                    result = memo.get(key)
+                    if result is not None:
+                        break
+                    keys = [] if keys is None else keys
+                    keys.append(key)
+
+            environment = self.extend_environment(func, args, scope)
+            body = func.body
+            if not body:
+                result = object.CONST_NIL
+                break
+
+            for index in range(len(body) - 1):
+                self.eval(body[index], environment)
+
+            result = self.evaluateTail(body[-1], environment)
+            if type(result) is not ast.CallExpression:
+                break
+
+            name = result.function.getValue()
+            args = self.evaluateArguments(result.args, environment)
+            if isinstance(args, object.Error):
+                result = args
+                break
+
+        if keys is not None:
+            memo.remember(keys, result)
+        return result
+
+    def caller(self, environment: Environment) -> Callable:
+        """Return the `call` of builtins calling functions by name in the environment.
+
+        Declared functions are called before builtins, like a call expression.
+        """
+
+        def call(name: str, args: list[object.Object]) -> object.Object:
+            if name in environment.functions:
+                return self.applyFunction(name, args, environment)
+            builtin = BUILTINS.get(name)
+            if builtin is None:
+                return object.Error(message=f"No function named {name} found")
+            if name in CALLING_BUILTINS:
+                return builtin(args, call)
+            return builtin(args)
+
+        return call
+
+    def builtinOf(
+        self, fn: ast.CallExpression, environment: Environment
+    ) -> Callable | None:
+        """Return the builtin a call calls, None for a special form or a function.
+
+        `evaluateCall()` does the same lookup inline, engines subclassing
+        the Evaluator use it to run code around the calls of builtins.
+        """
+        builtin = self.resolver.builtins.get(fn)
+        if builtin is not None:
+            return builtin
+
+        name = fn.function.getValue()
+        if name in (token.SET, token.IF) or name in environment.functions:
+            return None
+        return BUILTINS.get(name)
+
+    def evaluateTail(
+        self, ex: ast.Expression, environment: Environment
+    ) -> object.Object | ast.CallExpression:
+        """Evaluate a expression in tail position, except a call to a declared function.
+
+        The branch taken by a `if` is in tail position too.
+        A call to a declared function is returned as it is, for the caller to make.
+        """
+        while type(ex) is ast.CallExpression:
+            name = ex.function.getValue()
+
+            if name == token.IF:
+                if len(ex.args) not in (2, 3):
+                    return self.evaluateIf(ex, environment)
+
+                condition = self.eval(ex.args[0], environment)
+                if condition.type == object.ERROR_OBJ:
+                    return condition
+
+                if object.isTruthy(condition):
+                    ex = ex.args[1]
+                elif len(ex.args) == 3:
+                    ex = ex.args[2]
+                else:
+                    return object.CONST_NIL
+            elif name != token.SET and name in environment.functions:
+                return ex
+            else:
+                break
+
+        return self.eval(ex, environment)
+
+    def evaluateSet(
+        self, fn: ast.CallExpression, environment: Environment
     ) -> object.Object:
-        """Evaluate function using the environment."""
-        if fn.value in environment.functions:
-            func = environment.functions[fn.value]
-            new_environment = self.extend_environment(func.args, fn.args, environment)
-            return_value = object.CONST_NIL
-            for expression in func.expressions:
-                return_value = self.eval(expression, new_environment)
-            return return_value
+        """Evaluate `(set name value)`, binding the value to the name."""
+        if len(fn.args) != 2 or not isinstance(fn.args[0], ast.IdentifierExpression):
+            return object.Error(message="set expects a name and a value")
+
+        value = self.eval(fn.args[1], environment)
+        if value.type == object.ERROR_OBJ:
+            return value
+
+        slot = self.resolver.slots.get(fn.args[0])
+        if slot is None:
+            environment.variables[fn.args[0].value] = value
         else:
-            return object.CONST_NIL
+            depth, index = slot
+            environment.ancestor(depth).slots[index] = value
+        return value
+
+    def evaluateIf(
+        self, fn: ast.CallExpression, environment: Environment
+    ) -> object.Object:
+        """Evaluate `(if condition consequence alternative)`, the alternative is optional."""
+        if len(fn.args) not in (2, 3):
+            return object.Error(
+                message="if expects a condition, a consequence and a alternative"
+            )
+
+        condition = self.eval(fn.args[0], environment)
+        if condition.type == object.ERROR_OBJ:
+            return condition
+
+        if object.isTruthy(condition):
+            return self.eval(fn.args[1], environment)
+        if len(fn.args) == 3:
+            return self.eval(fn.args[2], environment)
+        return object.CONST_NIL
 
     def evaluateCall(
         self, fn: ast.Expression, environment: Environment
     ) -> object.Object:
-        """Evaluate any call expression."""
+        """Evaluate any call expression, resolved builtins are called right away."""
+        builtin = self.resolver.builtins.get(fn)
+        if builtin is not None:
+            args = self.evaluateArguments(fn.args, environment)
+            if isinstance(args, object.Error):
+                return args
+            return builtin(args)
+
         name = fn.function.getValue()
-        if name not in environment.functions:
+        match name:
+            case token.SET:
+                return self.evaluateSet(fn, environment)
+            case token.IF:
+                return self.evaluateIf(fn, environment)
+
+        if name in environment.functions:
+            return self.evaluateFunction(fn, environment)
+
+        builtin = BUILTINS.get(name)
+        if builtin is None:
             return object.Error(message=f"No function named {name} found")
-        return object.CONST_NIL
+
+        args = self.evaluateArguments(fn.args, environment)
+        if isinstance(args, object.Error):
+            return args
+        if name in CALLING_BUILTINS:
+            return builtin(args, self.caller(environment))
+        return builtin(args)
 
     def eval(self, ex: ast.Expression, env: Environment) -> object.Object:
         """Evaluate any given expression."""
         match type(ex):
             case ast.StringExpression:
-                return object.String(ex.value)
+                return object.makeString(ex.value, literal=True)
             case ast.NumberExpression:
-                return object.Number(ex.value)
+                if ex.constant is None:
+                    # Reports the literal which is not a number.
+                    return object.Number(ex.value)
+                return ex.constant
+            case ast.IdentifierExpression:
+                return self.evaluateIdentifier(ex, env)
             case ast.FunctionExpression:
-                return self.evaluateFunction(ex, env)
+                name = ex.function.getValue()
+                if self.memo is not None:
+                    self.memo.redeclare(env.functions.get(name), ex)
+                env.functions[name] = (ex, env)
+                return object.CONST_NIL
             case ast.CallExpression:
                 return self.evaluateCall(ex, env)
+            case ast.ArrayExpression:
+                elements = self.evaluateArguments(ex.elements, env)
+                if isinstance(elements, object.Error):
+                    return elements
+                return makeArray(elements)
             case ast.Program:
+                self.resolver.resolve(ex)
+                if self.memo is not None:
+                    self.memo.analyze(ex, self.resolver)
                 evaluate = object.CONST_NIL
                 for expression in ex.expressions:
                     evaluate = self.eval(expression, env)
 
                 return evaluate
         return object.CONST_NIL
+
+    def evaluateIdentifier(
+        self, ex: ast.IdentifierExpression, env: Environment
+    ) -> object.Object:
+        """Evaluate a variable, by it's slot if it was resolved, else by name."""
+        slot = self.resolver.slots.get(ex)
+        if slot is not None:
+            depth, index = slot
+            value = env.slots[index] if depth == 0 else env.ancestor(depth).slots[index]
+            if value is not None:
+                return value
+
+        value = env.globals.get(ex.value)
+        if value is None:
+            return object.Error(message=f"No variable named {ex.value} found")
+        return value
+
+    def evalArena(
+        self, arena: ast.Arena, env: Environment, node: int = 0
+    ) -> object.Object:
+        """Evaluate a node of a arena, the whole Program by default.
+
+        Gives the same results as `eval()` on the Program the arena was flattened from.
+        Large programs take much less memory as a arena.
+        Function declarations are stored in the environment as their node.
+        Variables are looked up by name in the chain of environments.
+        Calls in tail position run in a loop, like `eval()`.
+
+        The runner does not pick it for large inputs: walking the arena is slower
+        than walking the tree, and it has no Memo, hooks or profiler. A script is
+        parsed into a tree first, so the arena would only save memory after it.
+        """
+        kind = arena.kinds[node]
+
+        if kind == ast.NODE_STRING:
+            return object.makeString(arena.value(node), literal=True)
+        if kind == ast.NODE_NUMBER:
+            constant = arena.constant(node)
+            if constant is None:
+                return object.Number(arena.value(node))
+            return constant
+        if kind == ast.NODE_IDENTIFIER:
+            name = arena.value(node)
+            value = env.lookup(name)
+            if value is None:
+                return object.Error(message=f"No variable named {name} found")
+            return value
+        if kind == ast.NODE_FUNCTION:
+            env.functions[arena.value(node)] = (node, env)
+            return object.CONST_NIL
+        if kind == ast.NODE_CALL:
+            return self.evaluateArenaCall(arena, env, node)
+        if kind == ast.NODE_ARRAY:
+            elements = []
+            for child in arena.children_of(node):
+                value = self.evalArena(arena, env, child)
+                if value.type == object.ERROR_OBJ:
+                    return value
+                elements.append(value)
+            return makeArray(elements)
+        if kind == ast.NODE_PROGRAM:
+            evaluate = object.CONST_NIL
+            for child in arena.children_of(node):
+                evaluate = self.evalArena(arena, env, child)
+
+            return evaluate
+        return object.CONST_NIL
+
+    def evaluateArenaCall(
+        self, arena: ast.Arena, env: Environment, node: int
+    ) -> object.Object:
+        """Evaluate a call node of a arena, like `evaluateCall()`."""
+        name = arena.value(node)
+        args = arena.children_of(node)
+
+        match name:
+            case token.SET:
+                if len(args) != 2 or arena.kinds[args[0]] != ast.NODE_IDENTIFIER:
+                    return object.Error(message="set expects a name and a value")
+                value = self.evalArena(arena, env, args[1])
+                if value.type != object.ERROR_OBJ:
+                    env.variables[arena.value(args[0])] = value
+                return value
+            case token.IF:
+                if len(args) not in (2, 3):
+                    return object.Error(
+                        message=(
+                            "if expects a condition, a consequence and a alternative"
+                        )
+                    )
+                condition = self.evalArena(arena, env, args[0])
+                if condition.type == object.ERROR_OBJ:
+                    return condition
+                if object.isTruthy(condition):
+                    return self.evalArena(arena, env, args[1])
+                if len(args) == 3:
+                    return self.evalArena(arena, env, args[2])
+                return object.CONST_NIL
+
+        if name not in env.functions and name not in BUILTINS:
+            return object.Error(message=f"No function named {name} found")
+
+        values = self.evaluateArenaArguments(arena, env, args)
+        if isinstance(values, object.Error):
+            return values
+
+        if name in env.functions:
+            return self.applyArenaFunction(arena, name, values, env)
+        if name in CALLING_BUILTINS:
+            return BUILTINS[name](values, self.arenaCaller(arena, env))
+        return BUILTINS[name](values)
+
+    def arenaCaller(self, arena: ast.Arena, env: Environment) -> Callable:
+        """Return the `call` of builtins calling functions by name, like `caller()`."""
+
+        def call(name: str, args: list[object.Object]) -> object.Object:
+            if name in env.functions:
+                return self.applyArenaFunction(arena, name, args, env)
+            builtin = BUILTINS.get(name)
+            if builtin is None:
+                return object.Error(message=f"No function named {name} found")
+            if name in CALLING_BUILTINS:
+                return builtin(args, call)
+            return builtin(args)
+
+        return call
+
+    def evaluateArenaArguments(
+        self, arena: ast.Arena, env: Environment, args: list[int]
+    ) -> list[object.Object] | object.Error:
+        """Evaluate every argument node, stopping at the first error."""
+        values = []
+        for arg in args:
+            value = self.evalArena(arena, env, arg)
+            if value.type == object.ERROR_OBJ:
+                return value
+            values.append(value)
+        return values
+
+    def applyArenaFunction(
+        self, arena: ast.Arena, name: str, values: list[object.Object], env: Environment
+    ) -> object.Object:
+        """Call the function declared as name, like `applyFunction()`."""
+        while True:
+            declaration, scope = env.functions[name]
+            params, *body = arena.children_of(declaration)
+            params = arena.children_of(params)
+
+            if len(params) != len(values):
+                self.error(f"Given arguments does not match, required arguments")
+
+            env = Environment(scope)
+            for param, value in zip(params, values):
+                env.variables[arena.value(param)] = value
+
+            if not body:
+                return object.CONST_NIL
+            for expression in body[:-1]:
+                self.evalArena(arena, env, expression)
+
+            result = self.evaluateArenaTail(arena, env, body[-1])
+            if type(result) is not int:
+                return result
+
+            name = arena.value(result)
+            values = self.evaluateArenaArguments(arena, env, arena.children_of(result))
+            if isinstance(values, object.Error):
+                return values
+
+    def evaluateArenaTail(
+        self, arena: ast.Arena, env: Environment, node: int
+    ) -> object.Object | int:
+        """Evaluate a node in tail position, like `evaluateTail()`.
+
+        A call to a declared function is returned as it's node.
+        """
+        while arena.kinds[node] == ast.NODE_CALL:
+            name = arena.value(node)
+            args = arena.children_of(node)
+
+            if name == token.IF:
+                if len(args) not in (2, 3):
+                    break
+
+                condition = self.evalArena(arena, env, args[0])
+                if condition.type == object.ERROR_OBJ:
+                    return condition
+
+                if object.isTruthy(condition):
+                    node = args[1]
+                elif len(args) == 3:
+                    node = args[2]
+                else:
+                    return object.CONST_NIL
+            elif name != token.SET and name in env.functions:
+                return node
+            else:
+                break
+
+        return self.evalArena(arena, env, node)
@@ -0,0 +1,214 @@
+"""Hooks let tools run code on the calls and the nodes a Program evaluates."""
+
+from collections.abc import Callable
+from types import MethodType
+
+from bsharp import ast
+from bsharp import object
+from bsharp import token
+from bsharp.builtins import BUILTINS, CALLING_BUILTINS
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.memo import Memo
+
+
+class Hooks:
+    """Class holds the callbacks of tools tracing, measuring or covering a Program.
+
+    Every callback is called in the order it was registered.
+
+    - on_call(name, args): Before a function or a builtin is called.
+    - on_return(name, value): After a call returned a value. A function whose
+      call in tail position takes it's place returns None, when that call starts.
+    - on_error(name, error): After a call returned a Error, in place of on_return.
+    - on_node(kind, callback): `callback(ex, environment)` before evaluating
+      every expression of the kind, a class of `bsharp.ast`.
+
+    Every register method returns the callback, so it can be used as a decorator.
+
+    Attributes:
+        - calls: Callbacks of on_call.
+        - returns: Callbacks of on_return.
+        - errors: Callbacks of on_error.
+        - nodes: Callbacks of on_node, by the kind of expression.
+    """
+
+    def __init__(self) -> None:
+        """Construct Hooks with no callbacks."""
+        self.calls: list[Callable] = []
+        self.returns: list[Callable] = []
+        self.errors: list[Callable] = []
+        self.nodes: dict[type, list[Callable]] = {}
+
+    def on_call(self, callback: Callable) -> Callable:
+        """Call the callback before every call."""
+        self.calls.append(callback)
+        return callback
+
+    def on_return(self, callback: Callable) -> Callable:
+        """Call the callback after every call returning a value."""
+        self.returns.append(callback)
+        return callback
+
+    def on_error(self, callback: Callable) -> Callable:
+        """Call the callback after every call returning a Error."""
+        self.errors.append(callback)
+        return callback
+
+    def on_node(self, kind: type, callback: Callable) -> Callable:
+        """Call the callback before evaluating every expression of the kind."""
+        self.nodes.setdefault(kind, []).append(callback)
+        return callback
+
+
+class HookedEvaluator(Evaluator):
+    """Class is a Evaluator calling the callbacks of Hooks.
+
+    The plain `Evaluator` has no code for hooks. The methods of the
+    HookedEvaluator are only used if the Hooks have callbacks for them, the
+    methods of the Evaluator are bound in their place otherwise. So nodes cost
+    nothing more without on_node callbacks, and calls nothing more without
+    on_call, on_return and on_error callbacks. Register the callbacks before
+    making the HookedEvaluator.
+
+    A call in tail position is reported like any call. It takes the place of
+    the function calling it, which returns None, like the evaluator runs a
+    loop of tail calls in constant space. The last call returns the value.
+    A call answered by a `bsharp.memo.Memo` is not reported.
+
+    Input:
+
+        - hooks: The Hooks to call.
+        - memo: A `bsharp.memo.Memo`, like the Evaluator.
+    """
+
+    def __init__(self, hooks: Hooks, memo: Memo | None = None) -> None:
+        """Construct a Evaluator calling the hooks."""
+        super().__init__(memo)
+        self.hooks = hooks
+        # Name of the function running in every running applyFunction().
+        self.called: list[str | None] = []
+
+        plain = []
+        if not hooks.nodes:
+            plain += ["eval", "evaluateTail"]
+        if not (hooks.calls or hooks.returns or hooks.errors):
+            plain += ["applyFunction", "extend_environment", "evaluateCall", "caller"]
+        for name in plain:
+            setattr(self, name, MethodType(getattr(Evaluator, name), self))
+
+    def returned(self, name: str, value: object.Object | None) -> None:
+        """Call the callbacks of a call returning the value, None for a tail call."""
+        if value is not None and value.type == object.ERROR_OBJ:
+            for callback in self.hooks.errors:
+                callback(name, value)
+        else:
+            for callback in self.hooks.returns:
+                callback(name, value)
+
+    def callBuiltin(
+        self,
+        name: str,
+        builtin: Callable,
+        args: list[object.Object],
+        environment: Environment,
+    ) -> object.Object:
+        """Call the builtin between the callbacks of the call."""
+        for callback in self.hooks.calls:
+            callback(name, args)
+        if name in CALLING_BUILTINS:
+            value = builtin(args, self.caller(environment))
+        else:
+            value = builtin(args)
+        self.returned(name, value)
+        return value
+
+    def applyFunction(
+        self, name: str, args: list[object.Object], environment: Environment
+    ) -> object.Object:
+        """Call the declared function, the last call made in tail position returns."""
+        self.called.append(None)
+        try:
+            value = super().applyFunction(name, args, environment)
+        finally:
+            called = self.called.pop()
+        if called is not None:
+            self.returned(called, value)
+        return value
+
+    def extend_environment(
+        self,
+        declaration: ast.FunctionExpression,
+        givenArgs: list[object.Object],
+        scope: Environment,
+    ) -> Environment:
+        """Call the callbacks of the call, before binding the arguments.
+
+        A function calling this one in tail position returns first.
+        """
+        name = declaration.function.getValue()
+        if self.called[-1] is not None:
+            self.returned(self.called[-1], None)
+        for callback in self.hooks.calls:
+            callback(name, givenArgs)
+        self.called[-1] = name
+        return super().extend_environment(declaration, givenArgs, scope)
+
+    def evaluateCall(
+        self, fn: ast.Expression, environment: Environment
+    ) -> object.Object:
+        """Evaluate any call expression, calling the hooks around builtins."""
+        builtin = self.builtinOf(fn, environment)
+        if builtin is None:
+            return super().evaluateCall(fn, environment)
+
+        args = self.evaluateArguments(fn.args, environment)
+        if isinstance(args, object.Error):
+            return args
+        name = fn.function.getValue()
+        return self.callBuiltin(name, builtin, args, environment)
+
+    def caller(self, environment: Environment) -> Callable:
+        """Return the `call` of builtins calling functions, calling the hooks."""
+        call = super().caller(environment)
+
+        def hooked(name: str, args: list[object.Object]) -> object.Object:
+            if name in environment.functions or name not in BUILTINS:
+                return call(name, args)
+            return self.callBuiltin(name, BUILTINS[name], args, environment)
+
+        return hooked
+
+    def evaluateTail(
+        self, ex: ast.Expression, environment: Environment
+    ) -> object.Object | ast.CallExpression:
+        """Evaluate a expression in tail position, calling the hooks of every node.
+
+        Like the Evaluator, a call to a declared function is returned as it is.
+        """
+        if type(ex) is ast.CallExpression:
+            name = ex.function.getValue()
+            if name == token.IF and len(ex.args) in (2, 3):
+                self.visit(ex, environment)
+                condition = self.eval(ex.args[0], environment)
+                if condition.type == object.ERROR_OBJ:
+                    return condition
+                if object.isTruthy(condition):
+                    return self.evaluateTail(ex.args[1], environment)
+                if len(ex.args) == 3:
+                    return self.evaluateTail(ex.args[2], environment)
+                return object.CONST_NIL
+            if name != token.SET and name in environment.functions:
+                self.visit(ex, environment)
+                return ex
+        return self.eval(ex, environment)
+
+    def visit(self, ex: ast.Expression, environment: Environment) -> None:
+        """Call the callbacks of the kind of the expression."""
+        for callback in self.hooks.nodes.get(type(ex), ()):
+            callback(ex, environment)
+
+    def eval(self, ex: ast.Expression, env: Environment) -> object.Object:
+        """Evaluate any given expression, after the callbacks of it's kind."""
+        self.visit(ex, env)
+        return super().eval(ex, env)
@@ -0,0 +1,221 @@
+"""Incremental parses a changing source again, only where it changed."""
+
+from bisect import bisect_left
+
+from bsharp import ast
+from bsharp.lexer import BACKEND_REGEX, Lexer, form_spans
+from bsharp.parser import Parser
+
+# Characters compared at once looking for the first and last change.
+BLOCK = 4096
+
+# Forms parsed before are forgotten once there are this many times the forms of the
+# source, the forms of the sources before can be reused until then.
+KEEP = 2
+
+
+class IncrementalParser:
+    """Class parses new versions of a source, reusing the forms which did not change.
+
+    Every top-level form is kept with it's span and it's text, the text is
+    hashed to find the parsed form. After a edit only the forms touching it
+    are lexed and parsed again, from the first one until the forms found are
+    the old ones moved by the edit. Forms are also found by their text,
+    a form moved or put back as it was before the edit reuses it's expression.
+    The spans are kept in lists and looked up by bisection. Moving the forms
+    after a edit is left pending: the positions from `shifted` on are `delta`
+    short, and are only moved from where the last edit was to where the next
+    one is, so typing at one place does not move every form after it.
+
+    A form parsed on it's own is read like `Parser` reads it in the whole source,
+    as long as it has no error. If any form has errors, the source from the first
+    broken form on is parsed by `Parser`, which can read a broken form together
+    with the next ones, the forms before it are kept.
+    So the Program and the errors are always those of `Parser`.
+
+    Without errors the same Program is returned by every call, it's expressions
+    are replaced in place, so a edit does not copy every form. Copy them to keep
+    the expressions of a version.
+
+    Exported Methods:
+
+        - parse(source): Returns the Program of the source and it's errors.
+        - span(index): Returns the start and end of a top-level form.
+        - edit(start, end, text): Replace the characters from start to end by
+          the text, returns the Program of the new source and it's errors.
+
+    Attributes:
+        - source: The source last parsed.
+        - starts: The start of every top-level form of the source, see span().
+        - ends: The end of every top-level form, see span().
+        - shifted: The first form whose start and end are `delta` short.
+        - delta: The characters added before the forms from `shifted` on.
+        - texts: The text of every top-level form.
+        - expressions: The expression of every top-level form, None with errors.
+        - parsed: The expression of every form parsed, by it's text.
+        - reparsed: Number of forms parsed by the last call.
+        - tree: The Program returned without errors, of the `expressions`.
+    """
+
+    def __init__(self) -> None:
+        """Construct a IncrementalParser with no source."""
+        self.source = ""
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.shifted = 0
+        self.delta = 0
+        self.texts: list[str] = []
+        self.expressions: list[ast.Expression | None] = []
+        self.parsed: dict[str, ast.Expression | None] = {}
+        self.reparsed = 0
+        self.tree = ast.Program()
+        self.tree.expressions = self.expressions
+        # Number of forms with errors.
+        self.broken = 0
+
+    def parse(self, source: str) -> tuple[ast.Program, list[str]]:
+        """Return the Program of the source and it's errors.
+
+        The source is compared with the last one to find what changed.
+        """
+        old = self.source
+        size = min(len(old), len(source))
+
+        prefix = 0
+        while prefix + BLOCK <= size and (
+            old[prefix : prefix + BLOCK] == source[prefix : prefix + BLOCK]
+        ):
+            prefix += BLOCK
+        while prefix < size and old[prefix] == source[prefix]:
+            prefix += 1
+
+        # The unchanged end never overlaps the unchanged start.
+        limit = size - prefix
+        suffix = 0
+        while suffix + BLOCK <= limit and (
+            old[len(old) - suffix - BLOCK : len(old) - suffix]
+            == source[len(source) - suffix - BLOCK : len(source) - suffix]
+        ):
+            suffix += BLOCK
+        while suffix < limit and old[-suffix - 1] == source[-suffix - 1]:
+            suffix += 1
+
+        return self.update(source, prefix, len(old) - suffix)
+
+    def edit(self, start: int, end: int, text: str) -> tuple[ast.Program, list[str]]:
+        """Replace the characters from start to end by the text, parse the result."""
+        source = self.source[:start] + text + self.source[end:]
+        return self.update(source, start, end)
+
+    def update(
+        self, source: str, start: int, end: int
+    ) -> tuple[ast.Program, list[str]]:
+        """Parse the source, the last one with the characters from start to end changed.
+
+        Forms ending before the change are kept, forms starting after it are moved.
+        """
+        starts, ends = self.starts, self.ends
+        delta = len(source) - len(self.source)
+        # First character of the new source after the change.
+        after = end + delta
+
+        # A form is kept if the character after it is unchanged,
+        # a token may grow into the change otherwise.
+        kept = self.find(ends, start)
+        first = self.position(ends, kept - 1) if kept else 0
+        # Every form from the kept ones on is now short by the same delta.
+        self.shift(kept)
+        pending = self.delta
+
+        newStarts, newEnds, newTexts, newExpressions = [], [], [], []
+        moved = len(starts)
+        self.reparsed = 0
+        for formStart, formEnd in form_spans(source, first):
+            if formStart >= after:
+                old = formStart - delta - pending
+                index = bisect_left(starts, old, kept)
+                if index < len(starts) and starts[index] == old:
+                    moved = index
+                    break
+            text = source[formStart:formEnd]
+            newStarts.append(formStart)
+            newEnds.append(formEnd)
+            newTexts.append(text)
+            newExpressions.append(self.form(text))
+
+        # Only the changed forms are replaced, the lists move the rest in place.
+        self.broken += newExpressions.count(None)
+        self.broken -= self.expressions[kept:moved].count(None)
+        starts[kept:moved] = newStarts
+        ends[kept:moved] = newEnds
+        self.texts[kept:moved] = newTexts
+        self.expressions[kept:moved] = newExpressions
+        # The new forms have their positions, the ones after are moved later.
+        self.shifted = kept + len(newStarts)
+        self.delta = pending + delta
+        self.source = source
+
+        if len(self.parsed) > KEEP * len(self.texts):
+            self.parsed = dict(zip(self.texts, self.expressions))
+        return self.program()
+
+    def span(self, index: int) -> tuple[int, int]:
+        """Return the start and end of the top-level form at the index."""
+        return self.position(self.starts, index), self.position(self.ends, index)
+
+    def position(self, positions: list[int], index: int) -> int:
+        """Return the position at the index of starts or ends, once moved."""
+        if index >= self.shifted:
+            return positions[index] + self.delta
+        return positions[index]
+
+    def find(self, positions: list[int], value: int) -> int:
+        """Return the first index of starts or ends at or after the value."""
+        low, high = 0, len(positions)
+        while low < high:
+            middle = (low + high) // 2
+            if self.position(positions, middle) < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def shift(self, index: int) -> None:
+        """Move the forms between `shifted` and the index, so it starts there."""
+        starts, ends, delta = self.starts, self.ends, self.delta
+        if delta and index > self.shifted:
+            for position in range(self.shifted, index):
+                starts[position] += delta
+                ends[position] += delta
+        elif delta and index < self.shifted:
+            for position in range(index, self.shifted):
+                starts[position] -= delta
+                ends[position] -= delta
+        self.shifted = index
+
+    def form(self, text: str) -> ast.Expression | None:
+        """Return the expression of the text of a form, None if it has errors.
+
+        The text is only parsed if it was not parsed before.
+        """
+        if text in self.parsed:
+            return self.parsed[text]
+
+        parser = Parser(Lexer(text, backend=BACKEND_REGEX))
+        expressions = parser.parse_program().expressions
+        expression = None if parser.errors else expressions[0]
+        self.parsed[text] = expression
+        self.reparsed += 1
+        return expression
+
+    def program(self) -> tuple[ast.Program, list[str]]:
+        """Return the Program, parsing the source from the first broken form if any."""
+        if not self.broken:
+            return self.tree, []
+
+        index = self.expressions.index(None)
+        start = self.position(self.starts, index)
+        parser = Parser(Lexer(self.source[start:], backend=BACKEND_REGEX))
+        program = parser.parse_program()
+        program.expressions[:0] = self.expressions[:index]
+        return program, parser.errors
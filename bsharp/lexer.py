@@ -1,7 +1,110 @@
 """Lexer provides lexical analysis for bsharp."""
 
+import codecs
+import io
+import mmap
+import os
+import re
+import sys
+from functools import partial
+from collections.abc import Iterable, Iterator
+
 from bsharp import token
 
+BACKEND_SCAN = "scan"
+BACKEND_REGEX = "regex"
+
+# Single master pattern used by the regex backend.
+# Every match is the text of exactly one token.
+# Whitespace is skipped by the search itself.
+_MASTER_PATTERN = re.compile(
+    r"""
+        \d[\d.]*                    # NUMBER
+      | [^\W\d_]+(?:-[^\W\d_]*)*    # IDENT, letters and dashes
+      | "[^"]*"?                    # STRING, possibly unterminated
+      | [^ \t\n]                    # Any other single symbol
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_SYMBOLS: dict[str, str] = {
+    "+": token.PLUS,
+    "-": token.MINUS,
+    "*": token.STAR,
+    "/": token.SLASH,
+    "(": token.LROUND,
+    ")": token.RROUND,
+    "{": token.LCURLY,
+    "}": token.RCURLY,
+    "[": token.LSQUARE,
+    "]": token.RSQUARE,
+    ":": token.COLON,
+    "'": token.QUOTE,
+}
+
+_SYMBOL_KINDS: dict[str, int] = {
+    symbol: token.KIND_OF[type] for symbol, type in _SYMBOLS.items()
+}
+
+
+def _makeTokens(texts: Iterable[str]) -> Iterator[token.Token]:
+    """Turn the matches of `_MASTER_PATTERN` into tokens.
+
+    The type of the token is decided by the first character of the match.
+    """
+    symbols = _SYMBOLS
+    Token = token.Token
+
+    for text in texts:
+        kind = symbols.get(text)
+        if kind is None:
+            first = text[0]
+            if first.isdecimal():
+                kind = token.NUMBER
+            elif first == '"':
+                kind = token.STRING
+                if len(text) > 1 and text[-1] == '"':
+                    text = text[1:-1]
+                else:
+                    text = text[1:]
+            elif first.isalnum():
+                kind = token.IDENT
+            else:
+                kind = token.ILLEGAL
+        yield Token(kind, text)
+
+
+def _makeSpans(source: str) -> Iterator[tuple[int, int, int]]:
+    """Match `_MASTER_PATTERN` over the source and generate the kind and span of every token.
+
+    The span of a string only covers the characters between the quotes.
+    """
+    symbols = _SYMBOL_KINDS
+    number, string, ident, illegal = (
+        token.KIND_OF[token.NUMBER],
+        token.KIND_OF[token.STRING],
+        token.KIND_OF[token.IDENT],
+        token.KIND_OF[token.ILLEGAL],
+    )
+
+    for match in _MASTER_PATTERN.finditer(source):
+        start, end = match.span()
+        first = source[start]
+        kind = symbols.get(first)
+        if kind is None:
+            if first.isdecimal():
+                kind = number
+            elif first == '"':
+                kind = string
+                start += 1
+                if end > start and source[end - 1] == '"':
+                    end -= 1
+            elif first.isalnum():
+                kind = ident
+            else:
+                kind = illegal
+        yield kind, start, end
+
 
 class Lexer:
     """Lexer class accepts and input and provides methods to generate tokens..
@@ -10,12 +113,22 @@ class Lexer:
         Lexer only needs the string to consume.
 
         - input: String:  A string to tokenize
+        - backend: String: Which scanner produces the tokens, `BACKEND_SCAN` (default) or `BACKEND_REGEX`.
+
+    Backends:
+        Both backends return the exact same stream of `token.Token` objects.
+
+        - `BACKEND_SCAN` walks the input a character at a time using `advancePos()` and `reversePos()`.
+        - `BACKEND_REGEX` matches a single compiled master pattern over the input in one linear pass.
+          It is considerably faster on large inputs.
+          Digits and letters are matched using the unicode classes of `re`, which agree with `str.isnumeric()` and `str.isalpha()` on ASCII input.
 
     Exported Methods:
-        Only a single method is exported. This is the `nextToken()`.
+        The main method exported is `nextToken()`.
         All others are not needed by the external caller.
 
         -  nextToken():  Returns a token according to current position. Gives EOF tokens on overflow.
+        -  packTokens(): Returns every token of the input packed in a `token.TokenArray`.
     At These are the internal variables initialized by the lexer
 
     Internal Attributes:
@@ -38,7 +151,7 @@ class Lexer:
 
     """
 
-    def __init__(self, input: str) -> None:
+    def __init__(self, input: str, backend: str = BACKEND_SCAN) -> None:
         """Constuctor for Lexer class."""
         self.input: str = input
         self._readPos: int = 0
@@ -46,6 +159,36 @@ class Lexer:
         self._eof: bool = False
         self._validWhitespaces: set[str] = set([" ", "\t", "\n"])
 
+        if backend not in (BACKEND_SCAN, BACKEND_REGEX):
+            raise ValueError(f"Unknown lexer backend {backend}")
+
+        if backend == BACKEND_REGEX:
+            # Bind once, so the hot path never checks which backend is in use.
+            # `next()` returns the EOF token forever once the scan is exhausted.
+            self.nextToken = partial(
+                next, self.scanTokens(), token.Token(type=token.EOF, value="")
+            )
+
+    def scanTokens(self) -> Iterator[token.Token]:
+        """Generate every token of the input using the master pattern.
+
+        This is the regex backend. Every match of `_MASTER_PATTERN` is exactly one token.
+        """
+        return _makeTokens(_MASTER_PATTERN.findall(self.input))
+
+    def packTokens(self) -> token.TokenArray:
+        """Pack every token of the input into a `token.TokenArray`, using the master pattern.
+
+        No object is allocated per token, only the kind and span of each token are stored.
+        """
+        tokens = token.TokenArray(self.input)
+        append = tokens.append
+
+        for kind, start, end in _makeSpans(self.input):
+            append(kind, start, end)
+
+        return tokens
+
     def advancePos(self) -> None:
         """Advances position for the lexer.
 
@@ -219,3 +362,193 @@ class Lexer:
 
         string = self.input[start : self._curPos]
         return string
+
+
+_OPENING = frozenset("([{")
+_CLOSING = frozenset(")]}")
+
+
+def form_spans(source: str, start: int = 0) -> Iterator[tuple[int, int]]:
+    """Generate the span of every top-level form of the source, from `start` on.
+
+    A form is a bracketed expression with everything inside it,
+    or a single token outside of any bracket, like the parser reads them.
+    A form still open at the end of the source runs to the end.
+    `start` must be outside of every bracket.
+    """
+    depth = 0
+    first = start
+    for match in _MASTER_PATTERN.finditer(source, start):
+        text = match.group()
+        if depth == 0:
+            first = match.start()
+        if text in _OPENING:
+            depth += 1
+        elif text in _CLOSING and depth:
+            depth -= 1
+        if depth == 0:
+            yield first, match.end()
+
+    if depth:
+        yield first, len(source)
+
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+def _isOpen(text: str) -> bool:
+    """Return True if more input could extend the token matched as `text`.
+
+    Numbers, identifiers and unterminated strings can continue in the next buffer.
+    """
+    first = text[0]
+    if first == '"':
+        return len(text) == 1 or text[-1] != '"'
+    return first.isalnum()
+
+
+# What can follow the start of a open number or identifier, see `_continues()`.
+_NUMBER_REST = re.compile(r"[\d.]*")
+_IDENT_REST = re.compile(r"(?:[^\W\d_]|-)*")
+
+
+def _continues(text: str, chunk: str) -> bool:
+    """Return True if the whole chunk continues the open token matched as `text`.
+
+    Only the chunk is scanned, a long token is not matched again for every buffer.
+    """
+    first = text[0]
+    if first == '"':
+        return '"' not in chunk
+    if first.isdecimal():
+        return _NUMBER_REST.fullmatch(chunk) is not None
+    return _IDENT_REST.fullmatch(chunk) is not None
+
+
+class _MmapReader:
+    """Text stream decoding a memory mapped file a buffer at a time.
+
+    The mapping is closed once the end of the file is read.
+    """
+
+    def __init__(self, mapped: mmap.mmap, encoding: str) -> None:
+        """Construct the reader over the mapped file."""
+        self._mapped = mapped
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+
+    def read(self, size: int) -> str:
+        """Return the next `size` bytes of the file decoded, or `""` at the end."""
+        while not self._mapped.closed:
+            data = self._mapped.read(size)
+            text = self._decoder.decode(data, final=not data)
+            if not data:
+                self.close()
+            if text or not data:
+                return text
+        return ""
+
+    def close(self) -> None:
+        """Close the mapping of the file."""
+        self._mapped.close()
+
+
+class StreamLexer:
+    """StreamLexer reads the input from a text stream through a fixed-size buffer.
+
+    Input:
+        - stream: TextIO: Anything with a `read(size)` method returning strings. A file, `sys.stdin` or `io.StringIO`.
+        - bufferSize: int: Number of characters read from the stream at once.
+
+    Exported Methods:
+        StreamLexer is a drop-in replacement for `Lexer`, the tokens are the same as the `BACKEND_REGEX` backend.
+
+        - nextToken(): Returns the next token. Gives EOF tokens once the stream is exhausted.
+        - fromStdin(): Construct a StreamLexer reading `sys.stdin`.
+        - fromMmap(): Construct a StreamLexer reading a memory mapped file.
+        - close(): Close the file mapped by `fromMmap()`, it is closed at EOF too.
+          A StreamLexer is a context manager closing it.
+
+    Only the buffer is held in memory, no matter how big the input is.
+    A token which could continue past the end of the buffer (numbers, identifiers and strings)
+    is carried over. The next buffers are only searched for it's end, and it is matched
+    again once, together with the buffer ending it.
+    """
+
+    def __init__(
+        self, stream: io.TextIOBase, bufferSize: int = DEFAULT_BUFFER_SIZE
+    ) -> None:
+        """Construct the StreamLexer class."""
+        if bufferSize < 1:
+            raise ValueError(f"Buffer size must be positive, got {bufferSize}")
+
+        self.stream = stream
+        self.bufferSize = bufferSize
+        self.nextToken = partial(
+            next, _makeTokens(self.scanTexts()), token.Token(type=token.EOF, value="")
+        )
+
+    @classmethod
+    def fromStdin(cls, bufferSize: int = DEFAULT_BUFFER_SIZE) -> "StreamLexer":
+        """Construct a StreamLexer reading the standard input."""
+        return cls(sys.stdin, bufferSize)
+
+    @classmethod
+    def fromMmap(
+        cls, path: str, encoding: str = "utf-8", bufferSize: int = DEFAULT_BUFFER_SIZE
+    ) -> "StreamLexer":
+        """Construct a StreamLexer reading a memory mapped file.
+
+        The pages of the file are read by the buffer, never copied as a whole.
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return cls(io.StringIO(""), bufferSize)
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(_MmapReader(mapped, encoding), bufferSize)
+
+    def close(self) -> None:
+        """Close the file mapped by `fromMmap()`, other streams are left open."""
+        if isinstance(self.stream, _MmapReader):
+            self.stream.close()
+
+    def __enter__(self) -> "StreamLexer":
+        """Return the StreamLexer."""
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """Close the file mapped by `fromMmap()`."""
+        self.close()
+
+    def scanTexts(self) -> Iterator[str]:
+        """Generate the matches of `_MASTER_PATTERN` over the whole stream.
+
+        Every buffer is matched at once. If the last match reaches the end of the buffer
+        and could continue, it is carried over to the next buffer instead.
+        Buffers continuing the carried token are kept aside until one ends it,
+        so a token spanning many buffers costs linear time.
+        """
+        findall = _MASTER_PATTERN.findall
+        carry: list[str] = []
+
+        while True:
+            chunk = self.stream.read(self.bufferSize)
+            if not chunk:
+                break
+
+            if carry and _continues(carry[0], chunk):
+                carry.append(chunk)
+                continue
+
+            carry.append(chunk)
+            buffer = "".join(carry)
+            texts = findall(buffer)
+            carry = []
+
+            if texts and _isOpen(texts[-1]) and buffer.endswith(texts[-1]):
+                carry.append(texts.pop())
+
+            yield from texts
+
+        if carry:
+            yield from findall("".join(carry))
@@ -0,0 +1,224 @@
+"""Memo caches the results of pure functions by the values of their arguments."""
+
+import weakref
+from collections import OrderedDict
+
+from bsharp import ast
+from bsharp import object
+from bsharp import token
+from bsharp.builtins import PURE_BUILTINS
+from bsharp.resolver import Resolver
+
+# Arguments whose values can be part of a key, Arrays and Sequences cannot.
+KEYED = frozenset((object.Number, object.String, object.Boolean, object.Nil))
+
+# Number of results kept by default.
+SIZE = 1024
+
+
+class Memo:
+    """Class caches the results of functions in a bounded least recently used cache.
+
+    A function is memoized when it is marked, or with `automatic` when it is pure:
+    it's body only reads it's own parameters, sets only it's own variables, calls
+    pure builtins and pure functions, and declares no function. A variable set in
+    the body is not read, it may be unset on a branch and read the global one.
+    A result is kept by the function and the type and value of every argument,
+    calls with a Array or a Sequence argument are not memoized.
+    Once more than `size` results are kept the least recently used one is evicted.
+
+    Input:
+
+        - size: The number of results kept at most.
+        - automatic: Memoize the functions found pure by `analyze()`.
+
+    Exported Methods:
+
+        - mark(declaration): Memoize the function, pure or not.
+        - analyze(program, resolver): Find the pure functions of a resolved Program.
+        - key(declaration, args): Returns the key of a call, None if not memoized.
+        - get(key): Returns the kept result of a call, None if there is none.
+        - remember(keys, result): Keep the result for every key and return it.
+        - redeclare(previous, declaration): Forget every result if a name changes.
+        - stats(): Returns the hits, misses, evictions and size of the cache.
+
+    Attributes:
+        - memoized: Declarations whose calls are memoized.
+        - hits: Calls answered from the cache.
+        - misses: Memoized calls which had to be evaluated.
+        - evictions: Results evicted to keep the size.
+    """
+
+    def __init__(self, size: int = SIZE, automatic: bool = True) -> None:
+        """Construct a empty cache."""
+        self.size = size
+        self.automatic = automatic
+        self.results: OrderedDict[tuple, object.Object] = OrderedDict()
+        self.marked: set[ast.FunctionExpression] = set()
+        self.memoized: set[ast.FunctionExpression] = set()
+        self.declarations: dict[str, list[ast.FunctionExpression]] = {}
+        self.pure: set[ast.FunctionExpression] = set()
+        # Programs analyzed, only while they are used.
+        self.programs: weakref.WeakSet[ast.Program] = weakref.WeakSet()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def mark(self, declaration: ast.FunctionExpression) -> None:
+        """Memoize the function, whether it is pure or not."""
+        self.marked.add(declaration)
+        self.memoized.add(declaration)
+
+    def analyze(self, program: ast.Program, resolver: Resolver) -> None:
+        """Find the pure functions of a Program resolved by the resolver.
+
+        Functions of earlier Programs are analyzed again,
+        a redeclared function may make their callers impure.
+        """
+        if not self.automatic or program in self.programs:
+            return
+
+        self.programs.add(program)
+        self.collect(program.expressions)
+        declarations = [
+            declaration
+            for declared in self.declarations.values()
+            for declaration in declared
+        ]
+
+        # Every function is pure until it is found calling a impure one.
+        self.pure = set(declarations)
+        changed = True
+        while changed:
+            changed = False
+            for declaration in declarations:
+                if declaration in self.pure and not self.isPure(
+                    declaration.body, resolver, len(declaration.args)
+                ):
+                    self.pure.discard(declaration)
+                    changed = True
+        self.memoized = self.marked | self.pure
+
+    def collect(self, expressions: list[ast.Expression]) -> None:
+        """Collect every function declared in the expressions, by name."""
+        for ex in expressions:
+            match type(ex):
+                case ast.FunctionExpression:
+                    declared = self.declarations.setdefault(ex.function.getValue(), [])
+                    if ex not in declared:
+                        declared.append(ex)
+                    self.collect(ex.body)
+                case ast.CallExpression:
+                    self.collect(ex.args)
+                case ast.ArrayExpression:
+                    self.collect(ex.elements)
+
+    def isPure(
+        self, expressions: list[ast.Expression], resolver: Resolver, params: int
+    ) -> bool:
+        """Return True if evaluating the expressions of a function body is pure.
+
+        Only the first `params` slots of the function are parameters, always bound.
+        """
+        for ex in expressions:
+            match type(ex):
+                case ast.NumberExpression | ast.StringExpression:
+                    continue
+                case ast.IdentifierExpression:
+                    # Globals, variables of enclosing functions and variables
+                    # unset on a branch, read as globals, may change.
+                    slot = resolver.slots.get(ex)
+                    if slot is None or slot[0] != 0 or slot[1] >= params:
+                        return False
+                case ast.ArrayExpression:
+                    if not self.isPure(ex.elements, resolver, params):
+                        return False
+                case ast.CallExpression:
+                    if not self.isPureCall(ex, resolver, params):
+                        return False
+                case _:
+                    return False
+        return True
+
+    def isPureCall(
+        self, ex: ast.CallExpression, resolver: Resolver, params: int
+    ) -> bool:
+        """Return True if the call and it's arguments are pure."""
+        name = ex.function.getValue()
+        if name == token.SET:
+            # Setting a variable of the function is pure, reading it is not.
+            if len(ex.args) != 2 or resolver.slots.get(ex.args[0], (1,))[0] != 0:
+                return False
+            return self.isPure(ex.args[1:], resolver, params)
+        if name in self.declarations:
+            if any(callee not in self.pure for callee in self.declarations[name]):
+                return False
+        elif name != token.IF and (
+            name not in PURE_BUILTINS or name in resolver.declared
+        ):
+            return False
+        return self.isPure(ex.args, resolver, params)
+
+    def key(
+        self, declaration: ast.FunctionExpression, args: list[object.Object]
+    ) -> tuple | None:
+        """Return the key of a call, None if the call is not memoized."""
+        if declaration not in self.memoized:
+            return None
+
+        key = [declaration]
+        for arg in args:
+            if type(arg) not in KEYED:
+                return None
+            # The type of the value tells 1 from 1.0 and from true.
+            key.append((type(arg), type(arg.value), arg.value))
+        return tuple(key)
+
+    def get(self, key: tuple) -> object.Object | None:
+        """Return the kept result of a call, None if there is none."""
+        result = self.results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.results.move_to_end(key)
+        return result
+
+    def remember(self, keys: list[tuple], result: object.Object) -> object.Object:
+        """Keep the result for every key, evicting the least recently used results.
+
+        Returns the result, a Sequence is never kept as it is used up by reading it.
+        """
+        if result.type is object.SEQUENCE_OBJ:
+            return result
+
+        results = self.results
+        for key in keys:
+            results[key] = result
+            results.move_to_end(key)
+        while len(results) > self.size:
+            results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def redeclare(
+        self,
+        previous: tuple[ast.FunctionExpression, object] | None,
+        declaration: ast.FunctionExpression,
+    ) -> None:
+        """Forget every result when a name is declared as a different function.
+
+        The results of the functions calling it may change.
+        """
+        if previous is not None and previous[0] is not declaration:
+            self.results.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return the hits, misses, evictions and size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.results),
+        }
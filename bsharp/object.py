@@ -1,35 +1,58 @@
 """Internal Object system for bsharp."""
 
-from typing import Any
-
+from array import array
+from collections.abc import Iterator
 
 NUMBER_OBJ = "NUMBER"
 NIL_OBJECT = "NILL"
 STRING_OBJ = "STRING"
 ERROR_OBJ = "ERROR"
+BOOLEAN_OBJ = "BOOLEAN"
+ARRAY_OBJ = "ARRAY"
+SEQUENCE_OBJ = "SEQUENCE"
+
+# Typecodes of the storage of a Array, of integers and of floats.
+INT_ARRAY = "q"
+FLOAT_ARRAY = "d"
 
 
 class Object:
-    """Internal Object for all kinds of object."""
+    """Internal Object for all kinds of object.
 
-    def __init__(self):
-        """Construct the Object class."""
-        self.value: Any
-        self.type: str
+    Objects only hold their `value`, the `type` tag is a attribute of their class.
+    Objects are never changed once made, so equal objects can be shared:
+    see `makeNumber()`, `makeString()` and `makeBoolean()`.
+    """
+
+    __slots__ = ("value",)
+
+    value: object
+    type: str
+
+
+def parseNumber(text: str) -> int | float:
+    """Return the int or float written in the text."""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise Exception(f"Cannot evaluate {text} as number.")
 
 
 class Number(Object):
-    """Number Object for evaluation."""
-
-    def __init__(self, val: str):
-        """Construct the number."""
-        value = None
-        try:
-            value = int(val)
-        except ValueError:
-            raise Exception(f"Cannot evaluate {val} as integer.")
-        self.value = value
-        self.type = NUMBER_OBJ
+    """Number Object for evaluation, holding a int or a float."""
+
+    __slots__ = ()
+    type = NUMBER_OBJ
+
+    def __init__(self, val: str | int | float):
+        """Construct the number, parsing it if it is given as text."""
+        if isinstance(val, str):
+            val = parseNumber(val)
+        self.value = val
 
     def __repr__(self) -> str:
         """Reprsent a Number object as string."""
@@ -39,22 +62,41 @@ class Number(Object):
 class String(Object):
     """String object for evaluation."""
 
+    __slots__ = ()
+    type = STRING_OBJ
+
     def __init__(self, value: str):
         """Construct the string."""
         self.value = value
-        self.type = STRING_OBJ
 
     def __repr__(self) -> str:
         """Represent the string object."""
         return f"{self.value}"
 
 
+class Boolean(Object):
+    """Boolean object for evaluation."""
+
+    __slots__ = ()
+    type = BOOLEAN_OBJ
+
+    def __init__(self, value: bool):
+        """Construct the boolean."""
+        self.value = value
+
+    def __repr__(self) -> str:
+        """Represent the boolean object."""
+        return "true" if self.value else "false"
+
+
 class Nil(Object):
     """None Object for evaluation."""
 
+    __slots__ = ()
+    type = NIL_OBJECT
+
     def __init__(self):
         """Construct the None object."""
-        self.type = NIL_OBJECT
         self.value = "NULL"
 
     def __repr__(self) -> str:
@@ -65,9 +107,11 @@ class Nil(Object):
 class Error(Object):
     """Error object for evaluation."""
 
+    __slots__ = ()
+    type = ERROR_OBJ
+
     def __init__(self, message: str):
         """Construct the error object."""
-        self.type = ERROR_OBJ
         self.value = message
 
     def __repr__(self) -> str:
@@ -75,4 +119,103 @@ class Error(Object):
         return f"ERROR: {self.value}"
 
 
+class Array(Object):
+    """Array object holding numbers in a `array.array`.
+
+    Integers are stored as `INT_ARRAY`, a single float makes every element a float.
+    Builtins on arrays run over the whole storage at once.
+    """
+
+    __slots__ = ()
+    type = ARRAY_OBJ
+
+    def __init__(self, value: array):
+        """Construct the array around it's storage."""
+        self.value = value
+
+    def __repr__(self) -> str:
+        """Represent the array like it's literal."""
+        return "[" + " ".join(map(str, self.value)) + "]"
+
+
+class Sequence(Object):
+    """Sequence object holding a iterator, whose elements are made when read.
+
+    Unlike other objects a Sequence is used up by reading it,
+    every element is read once and only as many as needed are made.
+    """
+
+    __slots__ = ()
+    type = SEQUENCE_OBJ
+
+    def __init__(self, value: Iterator[Object]):
+        """Construct the sequence around it's iterator."""
+        self.value = value
+
+    def __repr__(self) -> str:
+        """Represent the sequence, without reading it."""
+        return "<sequence>"
+
+
 CONST_NIL = Nil()
+CONST_TRUE = Boolean(True)
+CONST_FALSE = Boolean(False)
+
+# Integers made ahead of time and shared, like the small integers of CPython.
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+SMALL_INTS = tuple(Number(value) for value in range(SMALL_INT_MIN, SMALL_INT_MAX + 1))
+
+# Strings of at most this many characters are interned.
+SHORT_STRING = 16
+# Interning stops once this many strings are interned, so it's memory is bounded.
+MAX_INTERNED = 10_000
+_interned: dict[str, String] = {}
+
+
+def makeNumber(value: int | float) -> Number:
+    """Return a Number of the value, small integers are shared."""
+    if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+        return SMALL_INTS[value - SMALL_INT_MIN]
+    return Number(value)
+
+
+def makeString(value: str, literal: bool = False) -> String:
+    """Return a String of the value, short strings and literals are shared."""
+    if not literal and len(value) > SHORT_STRING:
+        return String(value)
+
+    string = _interned.get(value)
+    if string is None:
+        string = String(value)
+        if len(_interned) < MAX_INTERNED:
+            _interned[value] = string
+    return string
+
+
+def makeBoolean(value: bool) -> Boolean:
+    """Return the shared true or false Boolean."""
+    return CONST_TRUE if value else CONST_FALSE
+
+
+def makeArray(values: list[int | float]) -> Array | Error:
+    """Return a Array of the numbers, a Error if one does not fit it's storage."""
+    try:
+        return Array(array(INT_ARRAY, values))
+    except TypeError:
+        pass
+    except OverflowError:
+        return Error(message="Array element out of range")
+    try:
+        return Array(array(FLOAT_ARRAY, values))
+    except OverflowError:
+        return Error(message="Array element out of range")
+
+
+def isTruthy(obj: Object) -> bool:
+    """Return False for NIL and false, True for every other object."""
+    if obj.type == NIL_OBJECT:
+        return False
+    if obj.type == BOOLEAN_OBJ:
+        return obj.value
+    return True
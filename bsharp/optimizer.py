@@ -0,0 +1,185 @@
+"""Optimizer folds constant expressions of a Program before it is evaluated."""
+
+from bsharp import ast
+from bsharp import object
+from bsharp import token
+from bsharp.builtins import BUILTINS, PURE_BUILTINS
+
+
+def source(ex: ast.Expression) -> str:
+    """Return the source of a expression."""
+    match type(ex):
+        case ast.NumberExpression | ast.IdentifierExpression:
+            return ex.value
+        case ast.StringExpression:
+            return f'"{ex.value}"'
+        case ast.ArrayExpression:
+            return "[" + " ".join(source(element) for element in ex.elements) + "]"
+        case ast.CallExpression:
+            args = "".join(" " + source(arg) for arg in ex.args)
+            return f"({ex.function.getValue()}{args})"
+        case ast.FunctionExpression:
+            args = " ".join(source(arg) for arg in ex.args)
+            body = "".join(" " + source(expression) for expression in ex.body)
+            return f"({token.DEFUN} {ex.function.getValue()} [{args}]{body})"
+        case ast.Program:
+            return "\n".join(source(expression) for expression in ex.expressions)
+    return ""
+
+
+class Optimizer:
+    """Class folds constant expressions of a Program.
+
+    Exported Methods:
+
+        - optimize(program): Returns the Program, folded in place.
+        - report(): Returns what was folded, a line for every expression.
+
+    Attributes:
+        - folded: Source of every folded expression and of what replaced it.
+
+    A call to a pure builtin on literal numbers and strings is replaced by it's result.
+    A `if` on a literal condition is replaced by the branch it takes.
+    Arrays are not evaluated yet, only the elements of a array are folded.
+
+    A expression is left as it is if evaluating it gives a error,
+    or a value with no literal like a boolean.
+    Builtins redeclared by a `fn` of the Program are not folded,
+    the Program gives the same results before and after folding.
+    """
+
+    def __init__(self) -> None:
+        """Construct the Optimizer class."""
+        self.folded: list[tuple[str, str]] = []
+        self.declared: set[str] = set()
+
+    def optimize(self, program: ast.Program) -> ast.Program:
+        """Fold the constant expressions of the Program in place and return it."""
+        self.declared = set()
+        self.collectDeclared(program.expressions)
+        program.expressions = self.foldAll(program.expressions)
+        return program
+
+    def report(self) -> str:
+        """Return what was folded, a line for every expression."""
+        return "\n".join(f"{before} => {after}" for before, after in self.folded)
+
+    def collectDeclared(self, expressions: list[ast.Expression]) -> None:
+        """Collect the name of every function declared in the expressions."""
+        for ex in expressions:
+            match type(ex):
+                case ast.FunctionExpression:
+                    self.declared.add(ex.function.getValue())
+                    self.collectDeclared(ex.body)
+                case ast.CallExpression:
+                    self.collectDeclared(ex.args)
+                case ast.ArrayExpression:
+                    self.collectDeclared(ex.elements)
+
+    def foldAll(self, expressions: list[ast.Expression]) -> list[ast.Expression]:
+        """Fold every expression of a list."""
+        return [self.fold(ex) for ex in expressions]
+
+    def fold(self, ex: ast.Expression) -> ast.Expression:
+        """Return the folded expression, or the expression itself."""
+        match type(ex):
+            case ast.CallExpression:
+                return self.foldCall(ex)
+            case ast.FunctionExpression:
+                ex.body = self.foldAll(ex.body)
+            case ast.ArrayExpression:
+                ex.elements = self.foldAll(ex.elements)
+        return ex
+
+    def foldCall(self, ex: ast.CallExpression) -> ast.Expression:
+        """Fold the arguments of a call, then the call itself if it is constant."""
+        name = ex.function.getValue()
+        foldable = name not in self.declared and (
+            name == token.IF or name in PURE_BUILTINS
+        )
+        before = source(ex) if foldable else None
+
+        if name == token.SET:
+            # The name to set is not a expression to fold.
+            ex.args = ex.args[:1] + self.foldAll(ex.args[1:])
+        else:
+            ex.args = self.foldAll(ex.args)
+
+        if not foldable:
+            return ex
+
+        if name == token.IF:
+            folded = self.foldIf(ex)
+        else:
+            folded = self.foldBuiltin(ex)
+
+        if folded is None:
+            return ex
+
+        self.folded.append((before, source(folded)))
+        return folded
+
+    def foldIf(self, ex: ast.CallExpression) -> ast.Expression | None:
+        """Return the branch taken by a `if` on a constant condition."""
+        if len(ex.args) not in (2, 3):
+            return None
+
+        condition = self.evaluate(ex.args[0])
+        if condition is None:
+            return None
+
+        if object.isTruthy(condition):
+            return ex.args[1]
+        if len(ex.args) == 3:
+            return ex.args[2]
+        return None
+
+    def foldBuiltin(self, ex: ast.CallExpression) -> ast.Expression | None:
+        """Return the literal result of a pure builtin on constant arguments."""
+        result = self.evaluate(ex)
+
+        if result is None:
+            return None
+        if result.type == object.NUMBER_OBJ:
+            text = str(result.value)
+            if not text.lstrip("-").replace(".", "", 1).isdigit():
+                # Floats such as `1e+16` or `inf` have no literal.
+                return None
+            literal = ast.NumberExpression()
+            literal.token = token.Token(type=token.NUMBER, value=str(result.value))
+        elif result.type == object.STRING_OBJ:
+            literal = ast.StringExpression()
+            literal.token = token.Token(type=token.STRING, value=result.value)
+        else:
+            return None
+
+        literal.value = literal.token.getValue()
+        if result.type == object.NUMBER_OBJ:
+            literal.constant = result
+        return literal
+
+    def evaluate(self, ex: ast.Expression) -> object.Object | None:
+        """Return the value of a constant expression, None for anything else.
+
+        Literals and pure builtins on constant arguments are constant,
+        unless evaluating them gives a error.
+        """
+        match type(ex):
+            case ast.NumberExpression:
+                # A literal which is not a number is reported when it is evaluated.
+                return ex.constant
+            case ast.StringExpression:
+                return object.String(ex.value)
+            case ast.CallExpression:
+                name = ex.function.getValue()
+                if name not in PURE_BUILTINS or name in self.declared:
+                    return None
+
+                args = [self.evaluate(arg) for arg in ex.args]
+                if None in args:
+                    return None
+
+                result = BUILTINS[name](args)
+                if result.type != object.ERROR_OBJ:
+                    return result
+        return None
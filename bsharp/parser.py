@@ -3,6 +3,33 @@
 from bsharp.lexer import Lexer
 from bsharp import ast
 from bsharp import token
+from bsharp.object import Number
+
+
+MODE_RECURSIVE = "recursive"
+MODE_ITERATIVE = "iterative"
+
+# Kinds of frames on the stack of the iterative parser.
+_CALL = 0
+_ARRAY = 1
+_DEFUN_ARGS = 2
+_DEFUN_BODY = 3
+
+# Attribute of the expression receiving the children of a frame.
+_FIELDS = ("args", "elements", None, "body")
+
+_LEAVES = {
+    token.NUMBER: ast.NumberExpression,
+    token.STRING: ast.StringExpression,
+    token.IDENT: ast.IdentifierExpression,
+}
+
+_CALLABLE = {token.IDENT, token.PLUS, token.STAR, token.MINUS, token.SLASH}
+
+# Marks an expression which opened a frame instead of finishing.
+_OPENED = object()
+
+_NO_FRAME = (None, None, None, None)
 
 
 class Parser:
@@ -10,6 +37,14 @@ class Parser:
 
     Input:
         - lexer: Lexer: A lexical analyzer, that provides tokens.
+        - mode: str: How expressions are parsed, `MODE_RECURSIVE` (default) or `MODE_ITERATIVE`.
+
+    Modes:
+        Both modes build the same tree and report the same errors.
+
+        - `MODE_RECURSIVE` parses every nested expression with a recursive call.
+        - `MODE_ITERATIVE` keeps the expressions being parsed on an explicit stack.
+          Nesting is only limited by memory and no Python frame is pushed per expression.
 
     Exported Methods:
 
@@ -17,15 +52,35 @@ class Parser:
 
     """
 
-    def __init__(self, lexer: Lexer) -> None:
+    def __init__(self, lexer: Lexer, mode: str = MODE_RECURSIVE) -> None:
         """Construct the Parser class."""
         self.lexer = lexer
         self.errors = []
+        # Number of every distinct numeric literal, converted once.
+        self.constants: dict[str, Number | None] = {}
+
+        if mode == MODE_ITERATIVE:
+            self.parse_expression = self.parse_expression_iterative
+        elif mode != MODE_RECURSIVE:
+            raise ValueError(f"Unknown parser mode {mode}")
 
     def add_parser_error(self, error: str) -> None:
         """Add a error to the errors array."""
         self.errors.append(error)
 
+    def number_constant(self, value: str) -> Number | None:
+        """Return the Number of a numeric literal, shared by equal literals.
+
+        A literal which is not a number, like `1.2.3`, is a error.
+        """
+        try:
+            constant = self.constants[value]
+        except KeyError:
+            constant = self.constants[value] = ast.number_constant(value)
+        if constant is None:
+            self.add_parser_error(f"Cannot parse {value} as a number.")
+        return constant
+
     def parse_call(self, name: token.Token) -> ast.Expression | None:
         """Parse a call expression declaring a function."""
         expression = ast.CallExpression()
@@ -66,7 +121,7 @@ class Parser:
 
         args = self.parse_expression(new_token)
 
-        if args == None:
+        if not isinstance(args, ast.ArrayExpression):
             self.add_parser_error(f"Error in parsing arguments")
             return None
 
@@ -150,6 +205,7 @@ class Parser:
                 expression = ast.NumberExpression()
                 expression.token = curToken
                 expression.value = curToken.getValue()
+                expression.constant = self.number_constant(expression.value)
             case token.STRING:
                 expression = ast.StringExpression()
                 expression.token = curToken
@@ -169,6 +225,144 @@ class Parser:
 
         return expression
 
+    def parse_expression_iterative(
+        self, curToken: token.Token
+    ) -> ast.Expression | None:
+        """Parse any given arbitary expression without recursion.
+
+        Every unfinished call, array and function declaration is a frame.
+        The innermost frame is kept in local variables, the frames enclosing it are suspended on a stack.
+        A frame is `(kind, expression, children, token of the child being parsed)`.
+
+        The loop alternates between two steps.
+        - Starting an expression at `curToken`, either finishing it at once or opening a frame.
+        - Delivering a finished expression (or None on error) to the innermost frame,
+          then reading the next tokens of that frame. Leaf children are parsed right there.
+        """
+        nextToken = self.lexer.nextToken
+        number = self.number_constant
+        leaves = _LEAVES
+        stack = []
+        kind = expression = children = childToken = None
+
+        while True:
+            # Start an expression at curToken.
+            curType = curToken.getType()
+            leaf = leaves.get(curType)
+
+            if leaf is not None:
+                finished = leaf()
+                finished.token = curToken
+                finished.value = curToken.getValue()
+                if curType == token.NUMBER:
+                    finished.constant = number(finished.value)
+            elif curType == token.LSQUARE:
+                if kind is not None:
+                    stack.append((kind, expression, children, childToken))
+                kind, expression, children = _ARRAY, ast.ArrayExpression(), []
+                expression.token = curToken
+                finished = _OPENED
+            elif curType == token.LROUND:
+                name = nextToken()
+                nameType = name.getType()
+                if nameType == token.IDENT and name.getValue() == token.DEFUN:
+                    if kind is not None:
+                        stack.append((kind, expression, children, childToken))
+                    kind, expression = _DEFUN_ARGS, ast.FunctionExpression()
+                    children = None
+                    expression.token = curToken
+                    expression.function = nextToken()
+                    # The arguments start right away at the next token.
+                    curToken = childToken = nextToken()
+                    continue
+                elif nameType in _CALLABLE:
+                    if kind is not None:
+                        stack.append((kind, expression, children, childToken))
+                    kind, expression, children = _CALL, ast.CallExpression(), []
+                    expression.token = token.Token(type=token.LROUND, value="(")
+                    expression.function = name
+                    finished = _OPENED
+                else:
+                    self.add_parser_error(f"Function name cannot be {nameType}")
+                    finished = None
+            else:
+                self.add_parser_error(f"No parse expression for token {curType}")
+                finished = None
+
+            # Deliver finished expressions until a frame needs a non leaf child.
+            while True:
+                if finished is not _OPENED:
+                    if kind is None:
+                        return finished
+
+                    if kind == _DEFUN_ARGS:
+                        if not isinstance(finished, ast.ArrayExpression):
+                            self.add_parser_error(f"Error in parsing arguments")
+                            finished = None
+                            kind, expression, children, childToken = (
+                                stack.pop() if stack else _NO_FRAME
+                            )
+                            continue
+                        for arg in finished.elements:
+                            if not isinstance(arg, ast.IdentifierExpression):
+                                self.add_parser_error(
+                                    f"Expected identifier, got expression"
+                                )
+                        expression.args = finished.elements
+                        kind, children = _DEFUN_BODY, []
+                    elif finished is None:
+                        if kind == _ARRAY:
+                            self.add_parser_error(
+                                f"Element at token {childToken} was not parsed."
+                            )
+                            kind, expression, children, childToken = (
+                                stack.pop() if stack else _NO_FRAME
+                            )
+                            continue
+                        elif kind == _CALL:
+                            self.add_parser_error(
+                                f"Element at token {childToken} was not parsed."
+                            )
+                        else:
+                            self.add_parser_error(
+                                f"Element at token{childToken} was not parsed"
+                            )
+                        children.append(None)
+                    else:
+                        children.append(finished)
+
+                closer = token.RSQUARE if kind == _ARRAY else token.RROUND
+
+                while True:
+                    curToken = nextToken()
+                    curType = curToken.getType()
+                    leaf = leaves.get(curType)
+                    if leaf is None:
+                        break
+                    child = leaf()
+                    child.token = curToken
+                    child.value = curToken.getValue()
+                    if curType == token.NUMBER:
+                        child.constant = number(child.value)
+                    children.append(child)
+
+                if curType == closer:
+                    setattr(expression, _FIELDS[kind], children)
+                    finished = expression
+                elif curType == token.EOF:
+                    if kind == _DEFUN_BODY:
+                        self.add_parser_error(f"Reached EOF while parsing")
+                    else:
+                        self.add_parser_error(f"Reached EOF while parsing.")
+                    finished = None
+                else:
+                    childToken = curToken
+                    break
+
+                kind, expression, children, childToken = (
+                    stack.pop() if stack else _NO_FRAME
+                )
+
     def parse_program(self) -> ast.Program:
         """Return a parsed ast.Program."""
         program = ast.Program()
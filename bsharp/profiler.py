@@ -0,0 +1,213 @@
+"""Profiler measures where the tree evaluator spends it's time running a Program."""
+
+import time
+from collections.abc import Callable
+
+from bsharp import ast
+from bsharp import object
+from bsharp import token
+from bsharp.builtins import BUILTINS, CALLING_BUILTINS
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.memo import Memo
+
+# Location of builtins, which are not declared in the source.
+BUILTIN = "builtin"
+
+
+class Profiler(Evaluator):
+    """Class is a Evaluator recording the calls of every function and builtin.
+
+    A function is known by it's name and the line declaring it, a builtin by
+    it's name. Every entry counts the calls, the self time spent in the function
+    itself and the cumulative time, including the functions it called.
+    A recursive call is only counted once in the cumulative time.
+    A tail call ends the call making it, like it does in the evaluator.
+    The self time is also kept by stack, for flamegraph tools.
+
+    The plain `Evaluator` has no code for profiling, it costs nothing
+    unless this class evaluates the Program.
+
+    Input:
+
+        - memo: A `bsharp.memo.Memo`, like the Evaluator.
+
+    Exported Methods:
+
+        - locate(program, source, path): Find the lines declaring the functions.
+        - report(): Returns the entries sorted by self time, as a table.
+        - collapsed(): Returns the self time of every stack, in microseconds.
+
+    Attributes:
+        - entries: The calls, self and cumulative nanoseconds, by name and location.
+        - stacks: The self nanoseconds of every stack of names and locations.
+        - locations: The location of every located FunctionExpression.
+    """
+
+    def __init__(self, memo: Memo | None = None) -> None:
+        """Construct a Profiler with no entries."""
+        super().__init__(memo)
+        self.entries: dict[tuple[str, str], list[int]] = {}
+        self.stacks: dict[tuple[tuple[str, str], ...], int] = {}
+        self.locations: dict[ast.FunctionExpression, str] = {}
+        # Every frame is [key, stack, start, time spent in callees].
+        self.frames: list[list] = []
+        self.active: dict[tuple[str, str], int] = {}
+        # Number of frames when every applyFunction() started.
+        self.bases: list[int] = []
+
+    def locate(self, program: ast.Program, source: str, path: str) -> None:
+        """Find the line of the source declaring every function of the program.
+
+        Declarations are matched with the `(fn name` of the source in order,
+        a declaration not matching keeps the path as it's location.
+        """
+        from bsharp.lexer import BACKEND_REGEX, Lexer
+
+        tokens = Lexer(source, backend=BACKEND_REGEX).packTokens()
+        names = []
+        for index in range(2, len(tokens)):
+            if (
+                tokens.getType(index - 2) == token.LROUND
+                and tokens.getType(index - 1) == token.IDENT
+                and tokens.getValue(index - 1) == token.DEFUN
+            ):
+                names.append(index)
+
+        declarations = []
+        self.collect(program.expressions, declarations)
+        for declaration, name in zip(declarations, names):
+            if declaration.function.getValue() != tokens.getValue(name):
+                break
+            line = source.count("\n", 0, tokens.getSpan(name)[0]) + 1
+            self.locations[declaration] = f"{path}:{line}"
+        for declaration in declarations:
+            self.locations.setdefault(declaration, path)
+
+    def collect(self, expressions: list[ast.Expression], declarations: list) -> None:
+        """Collect every function declared in the expressions, in source order."""
+        for ex in expressions:
+            match type(ex):
+                case ast.FunctionExpression:
+                    declarations.append(ex)
+                    self.collect(ex.body, declarations)
+                case ast.CallExpression:
+                    self.collect(ex.args, declarations)
+                case ast.ArrayExpression:
+                    self.collect(ex.elements, declarations)
+
+    def enter(self, key: tuple[str, str]) -> None:
+        """Start a call of the function or builtin."""
+        frames = self.frames
+        stack = frames[-1][1] + (key,) if frames else (key,)
+        self.active[key] = self.active.get(key, 0) + 1
+        frames.append([key, stack, time.perf_counter_ns(), 0])
+
+    def leave(self) -> None:
+        """End the last call started, adding it's times to it's entry."""
+        key, stack, start, callees = self.frames.pop()
+        elapsed = time.perf_counter_ns() - start
+        if self.frames:
+            self.frames[-1][3] += elapsed
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [0, 0, 0]
+        entry[0] += 1
+        entry[1] += elapsed - callees
+        self.active[key] -= 1
+        if not self.active[key]:
+            entry[2] += elapsed
+        self.stacks[stack] = self.stacks.get(stack, 0) + elapsed - callees
+
+    def applyFunction(
+        self, name: str, args: list[object.Object], environment: Environment
+    ) -> object.Object:
+        """Call the declared function, ending every call left by it's tail calls."""
+        depth = len(self.frames)
+        self.bases.append(depth)
+        try:
+            return super().applyFunction(name, args, environment)
+        finally:
+            self.bases.pop()
+            while len(self.frames) > depth:
+                self.leave()
+
+    def extend_environment(
+        self,
+        declaration: ast.FunctionExpression,
+        givenArgs: list[object.Object],
+        scope: Environment,
+    ) -> Environment:
+        """Start a call of the function, ending the call making it as a tail call."""
+        if len(self.frames) > self.bases[-1]:
+            self.leave()
+        location = self.locations.get(declaration, "")
+        self.enter((declaration.function.getValue(), location))
+        return super().extend_environment(declaration, givenArgs, scope)
+
+    def evaluateCall(
+        self, fn: ast.Expression, environment: Environment
+    ) -> object.Object:
+        """Evaluate any call expression, recording the calls of builtins."""
+        builtin = self.builtinOf(fn, environment)
+        if builtin is None:
+            return super().evaluateCall(fn, environment)
+
+        name = fn.function.getValue()
+        args = self.evaluateArguments(fn.args, environment)
+        if isinstance(args, object.Error):
+            return args
+
+        self.enter((name, BUILTIN))
+        try:
+            if name in CALLING_BUILTINS:
+                return builtin(args, self.caller(environment))
+            return builtin(args)
+        finally:
+            self.leave()
+
+    def caller(self, environment: Environment) -> Callable:
+        """Return the `call` of builtins calling functions, recording builtins too."""
+        call = super().caller(environment)
+
+        def profiled(name: str, args: list[object.Object]) -> object.Object:
+            if name in environment.functions or name not in BUILTINS:
+                return call(name, args)
+            self.enter((name, BUILTIN))
+            try:
+                return call(name, args)
+            finally:
+                self.leave()
+
+        return profiled
+
+    def report(self) -> str:
+        """Return a table of every entry, the largest self time first."""
+        rows = sorted(self.entries.items(), key=lambda item: -item[1][1])
+        lines = [f"{'calls':>10} {'self ms':>10} {'cumulative ms':>14}  function"]
+        for (name, location), (calls, own, cumulative) in rows:
+            lines.append(
+                f"{calls:>10} {own / 1e6:>10.3f} {cumulative / 1e6:>14.3f}  "
+                f"{label((name, location))}"
+            )
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """Return the self time of every stack, a line per stack.
+
+        Every line is the names of the stack joined by `;`, then the microseconds,
+        the format read by flamegraph tools.
+        """
+        lines = []
+        for stack, elapsed in self.stacks.items():
+            microseconds = elapsed // 1000
+            if microseconds:
+                lines.append(f"{';'.join(map(label, stack))} {microseconds}")
+        return "\n".join(lines)
+
+
+def label(key: tuple[str, str]) -> str:
+    """Return the name of a function with it's location."""
+    name, location = key
+    return f"{name} ({location})" if location else name
@@ -0,0 +1,169 @@
+"""Resolver assigns every variable of a function a slot before it is run."""
+
+import weakref
+from collections.abc import Callable
+
+from bsharp import ast
+from bsharp import token
+from bsharp.builtins import BUILTINS, CALLING_BUILTINS
+
+Slot = tuple[int, int]
+
+
+class Resolver:
+    """Class resolves every variable reference to a (depth, index) slot.
+
+    The depth counts the functions between the reference and the declaring function,
+    the index is the position of the variable in the slots of that function.
+    The parameters of a function take the first slots,
+    a `set` inside a function binds a new slot from that point of the body onwards.
+    Variables outside of every function are global and get no slot,
+    they are looked up by name.
+
+    A call to a builtin is resolved to the builtin function,
+    unless a Program resolved by the Resolver declares a function of that name.
+    Builtins calling functions by name are left to the engines, which give them
+    a way to call declared functions.
+
+    Exported Methods:
+
+        - resolve(ex): Resolve every variable of the expression.
+        - sizeOf(declaration): Returns the number of slots of a function.
+
+    Attributes:
+        - slots: Slot of every resolved IdentifierExpression, by the expression.
+        - sizes: Number of slots of every resolved FunctionExpression.
+        - builtins: Builtin function called by every resolved call to a builtin.
+        - declared: Names of the functions declared by the resolved Programs.
+
+    Results are kept by expression, so a tree is only resolved once.
+    The builtins of calls outside of every function are forgotten once their
+    Program is collected, functions may still be called by later Programs.
+    """
+
+    def __init__(self) -> None:
+        """Construct the Resolver class."""
+        self.slots: dict[ast.IdentifierExpression, Slot] = {}
+        self.sizes: dict[ast.FunctionExpression, int] = {}
+        self.scopes: list[dict[str, int]] = []
+        self.programs: weakref.WeakSet[ast.Program] = weakref.WeakSet()
+        # Calls resolved to a builtin outside of every function, of the Program.
+        self.calls: list[ast.CallExpression] = []
+        self.builtins: dict[ast.CallExpression, Callable] = {}
+        self.declared: set[str] = set()
+        # Builtins are only resolved in a Program, a function alone may be redeclared.
+        self.inProgram = False
+
+    def sizeOf(self, declaration: ast.FunctionExpression) -> int:
+        """Return the number of slots of a function, resolving it if needed.
+
+        A function not resolved as part of its Program is resolved on it's own.
+        """
+        size = self.sizes.get(declaration)
+        if size is None:
+            scopes, self.scopes = self.scopes, []
+            inProgram, self.inProgram = self.inProgram, False
+            self.resolve(declaration)
+            self.scopes, self.inProgram = scopes, inProgram
+            size = self.sizes[declaration]
+        return size
+
+    def resolve(self, ex: ast.Expression) -> None:
+        """Resolve every variable of any given expression."""
+        match type(ex):
+            case ast.IdentifierExpression:
+                self.resolveIdentifier(ex)
+            case ast.FunctionExpression:
+                self.resolveFunction(ex)
+            case ast.CallExpression:
+                self.resolveCall(ex)
+            case ast.ArrayExpression:
+                for element in ex.elements:
+                    self.resolve(element)
+            case ast.Program:
+                if ex in self.programs:
+                    return
+                self.programs.add(ex)
+                self.collectDeclared(ex.expressions)
+                self.inProgram = True
+                self.calls = []
+                for expression in ex.expressions:
+                    self.resolve(expression)
+                self.inProgram = False
+                weakref.finalize(ex, self.forget, self.calls)
+
+    def forget(self, calls: list[ast.CallExpression]) -> None:
+        """Forget the builtins of the calls of a collected Program."""
+        for call in calls:
+            self.builtins.pop(call, None)
+
+    def collectDeclared(self, expressions: list[ast.Expression]) -> None:
+        """Collect the name of every function declared in the expressions."""
+        for ex in expressions:
+            match type(ex):
+                case ast.FunctionExpression:
+                    self.declared.add(ex.function.getValue())
+                    self.collectDeclared(ex.body)
+                case ast.CallExpression:
+                    self.collectDeclared(ex.args)
+                case ast.ArrayExpression:
+                    self.collectDeclared(ex.elements)
+
+    def resolveIdentifier(self, ex: ast.IdentifierExpression) -> None:
+        """Resolve a variable reference to the innermost function binding it."""
+        for depth, scope in enumerate(reversed(self.scopes)):
+            index = scope.get(ex.value)
+            if index is not None:
+                self.slots[ex] = (depth, index)
+                return
+
+    def resolveFunction(self, ex: ast.FunctionExpression) -> None:
+        """Resolve the body of a function in a new scope of it's parameters."""
+        if ex in self.sizes:
+            return
+
+        # A repeated parameter is bound to the last argument, like the evaluator.
+        scope = {arg.value: index for index, arg in enumerate(ex.args)}
+        self.scopes.append(scope)
+        for expression in ex.body:
+            self.resolve(expression)
+        self.scopes.pop()
+
+        self.sizes[ex] = max(len(ex.args), max(scope.values(), default=-1) + 1)
+
+    def resolveCall(self, ex: ast.CallExpression) -> None:
+        """Resolve the arguments of a call, `set` binds it's name afterwards."""
+        args = ex.args
+        if (
+            ex.function.getValue() == token.SET
+            and len(args) == 2
+            and isinstance(args[0], ast.IdentifierExpression)
+        ):
+            self.resolve(args[1])
+            self.bind(args[0])
+            return
+
+        name = ex.function.getValue()
+        if (
+            self.inProgram
+            and name in BUILTINS
+            and name not in self.declared
+            and name not in CALLING_BUILTINS
+        ):
+            self.builtins[ex] = BUILTINS[name]
+            if not self.scopes:
+                self.calls.append(ex)
+
+        for arg in args:
+            self.resolve(arg)
+
+    def bind(self, ex: ast.IdentifierExpression) -> None:
+        """Bind the name to a slot of the innermost function, globals are not bound."""
+        if not self.scopes:
+            return
+
+        scope = self.scopes[-1]
+        index = scope.get(ex.value)
+        if index is None:
+            index = scope[ex.value] = max(scope.values(), default=-1) + 1
+        self.slots[ex] = (0, index)
@@ -0,0 +1,229 @@
+"""Shell starts commands for the `sh`, `pipe` and `run` builtins, without a shell.
+
+Commands are started straight from their executable, so no shell starts with them.
+The path of every executable is looked up once, later commands of the same name
+reuse it. The lines of a command are read as a Sequence while it runs,
+a Sequence given to `pipe` is written to the stdin of the command
+one element at a time, in the same thread the lines are read in.
+"""
+
+import os
+import selectors
+import shutil
+import subprocess
+import sys
+from collections.abc import Iterator
+from functools import lru_cache
+
+from bsharp import object
+
+# Bytes read from the stdout of a command at once.
+READ_SIZE = 65536
+
+
+@lru_cache(maxsize=256)
+def resolve(command: str) -> str | None:
+    """Return the path of the executable of a command, None if there is none."""
+    if os.sep in command:
+        return command
+    return shutil.which(command)
+
+
+def spawn(argv: list[str], **options) -> subprocess.Popen | object.Error:
+    """Start the command, or return a error if it cannot be started."""
+    executable = resolve(argv[0])
+    if executable is None:
+        return object.Error(message=f"No command named {argv[0]} found")
+
+    # Output printed by bsharp must come before the output of the command.
+    sys.stdout.flush()
+    try:
+        # The resolved path spares `subprocess` searching PATH for every command.
+        return subprocess.Popen([executable, *argv[1:]], **options)
+    except OSError as error:
+        return object.Error(message=f"Cannot run {argv[0]}: {error.strerror}")
+
+
+class Process:
+    """Class iterates over the lines a command writes to it's stdout.
+
+    Lines are read as the command writes them, see `read()`.
+    The lines of a Process not read yet are given to the next command
+    through a OS pipe instead, bsharp never reads them.
+    A command still running once it's Process is dropped is stopped.
+
+    Input:
+
+        - process: The started command.
+        - input: The elements written to stdin, None if it has no stdin pipe.
+        - upstream: The Process connected to it's stdin, None if there is none.
+
+    Exported Methods:
+
+        - connect(): Give the stdout of the command to the next command.
+        - close(): Stop the command if it is still running, and wait for it.
+
+    Attributes:
+        - process: The running command.
+        - upstream: The Process whose stdout is connected to the stdin of this one.
+        - started: True once a line was read or the stdout was connected.
+    """
+
+    def __init__(
+        self,
+        process: subprocess.Popen,
+        input: Iterator[object.Object] | None = None,
+        upstream: "Process | None" = None,
+    ) -> None:
+        """Construct the Process of a started command."""
+        self.process = process
+        self.upstream = upstream
+        self.started = False
+        self.lines = read(process, input)
+
+    def __iter__(self) -> Iterator[object.Object]:
+        """Return the Process itself, it is iterated once."""
+        return self
+
+    def __next__(self) -> object.Object:
+        """Return the next line of the command."""
+        self.started = True
+        return next(self.lines)
+
+    def connect(self) -> int:
+        """Give the stdout of the command to the next command, return it's descriptor.
+
+        The lines of the Process are no longer read by bsharp.
+        """
+        self.started = True
+        self.lines.close()
+        return self.process.stdout.fileno()
+
+    def close(self) -> None:
+        """Stop the command if it is still running, and wait for it."""
+        self.lines.close()
+        stop(self.process)
+        if self.upstream is not None:
+            self.upstream.close()
+
+    def __del__(self) -> None:
+        """Stop the command once no line can be read anymore."""
+        self.close()
+
+
+def read(
+    process: subprocess.Popen, input: Iterator[object.Object] | None
+) -> Iterator[object.Object]:
+    """Yield every line of the command, writing the input to it as it is taken.
+
+    The input is written as lines to stdin while the command can take them,
+    in the same thread the lines are read in. A error ends the input and the lines.
+    """
+    stdin, stdout = process.stdin, process.stdout
+    buffer = b""
+    pending = b""
+
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout, selectors.EVENT_READ)
+            if input is not None:
+                os.set_blocking(stdin.fileno(), False)
+                selector.register(stdin, selectors.EVENT_WRITE)
+
+            while selector.get_map():
+                for key, _ in selector.select():
+                    if key.fileobj is stdout:
+                        chunk = os.read(stdout.fileno(), READ_SIZE)
+                        if not chunk:
+                            selector.unregister(stdout)
+                            continue
+                        *lines, buffer = (buffer + chunk).split(b"\n")
+                        for line in lines:
+                            yield object.makeString(line.decode(errors="replace"))
+                        continue
+
+                    pending, error = write(stdin.fileno(), input, pending)
+                    if pending is None:
+                        selector.unregister(stdin)
+                        stdin.close()
+                        if error is not None:
+                            yield error
+                            return
+
+        if buffer:
+            yield object.makeString(buffer.decode(errors="replace"))
+        process.wait()
+    finally:
+        stop(process)
+
+
+def write(
+    descriptor: int, input: Iterator[object.Object], pending: bytes
+) -> tuple[bytes | None, object.Error | None]:
+    """Write the pending bytes, then elements of the input, until the pipe is full.
+
+    Returns the bytes left to write, or None once the input has ended,
+    and the error ending the input.
+    """
+    while True:
+        if not pending:
+            element = next(input, None)
+            if element is None:
+                return None, None
+            if element.type is object.ERROR_OBJ:
+                return None, element
+            pending = f"{element}\n".encode()
+
+        try:
+            written = os.write(descriptor, pending)
+        except BlockingIOError:
+            return pending, None
+        except BrokenPipeError:
+            # The command exited before taking all of it's input.
+            return None, None
+        pending = pending[written:]
+
+
+def stop(process: subprocess.Popen) -> None:
+    """Close the pipes of the command, stop it if it is still running and wait."""
+    for file in (process.stdin, process.stdout):
+        if file is not None:
+            file.close()
+    if process.poll() is None:
+        process.kill()
+    process.wait()
+
+
+def start(
+    argv: list[str], input: Iterator[object.Object] | None = None
+) -> object.Object:
+    """Return the Sequence of the lines of the command, given the input on stdin.
+
+    The lines of a command not read yet are connected to the stdin by a OS pipe,
+    any other input is written to it by `read()`.
+    Without input the command shares the stdin of bsharp.
+    """
+    upstream = None
+    if input is None:
+        stdin = None
+    elif type(input) is Process and not input.started:
+        upstream, input = input, None
+        stdin = upstream.connect()
+    else:
+        stdin = subprocess.PIPE
+
+    process = spawn(argv, stdin=stdin, stdout=subprocess.PIPE, bufsize=0)
+    if upstream is not None:
+        # The command has it's own copy, bsharp no longer reads it.
+        upstream.process.stdout.close()
+    if type(process) is object.Error:
+        return process
+    return object.Sequence(Process(process, input, upstream))
+
+
+def run(argv: list[str]) -> object.Object:
+    """Run the command, sharing the stdin and stdout of bsharp, return it's status."""
+    process = spawn(argv)
+    if type(process) is object.Error:
+        return process
+    return object.makeNumber(process.wait())
@@ -0,0 +1,218 @@
+"""Stream runs a expression for every line of a input, like awk."""
+
+import io
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from bsharp import object
+from bsharp.closures import ClosureCompiler
+from bsharp.environment import Environment
+from bsharp.lexer import Lexer
+from bsharp.parser import Parser
+
+# Global variables bound before every line is run.
+LINE = "line"
+LINE_NUMBER = "nr"
+
+# Number of output lines joined into a single write.
+BATCH_SIZE = 1024
+
+# Number of lines sent to a worker process at once.
+CHUNK_SIZE = 1024
+
+
+class Stream:
+    """Class runs a expression for every line of a input.
+
+    The expression is lexed, parsed and compiled once, every line only runs the
+    compiled closures. The line is bound to the global variable `line`
+    and it's number, counted from 1, to `nr`.
+    Every line runs in the same global Environment,
+    so functions and variables set by a line are kept for the next ones.
+
+    The value of the expression decides the output of a line:
+    nothing for NULL or false, the line itself for true, like a awk pattern,
+    else the value. What the line prints comes first, it is part of the output
+    so it stays in order with the output of the other lines.
+
+    Input:
+
+        - expression: The source run for every line.
+
+    Exported Methods:
+
+        - outputs(lines, start): Yield the output of every line, stopping at a error.
+
+    Attributes:
+        - expression: The source run for every line.
+        - errors: Errors parsing the expression, then the error that stopped the stream.
+    """
+
+    def __init__(self, expression: str) -> None:
+        """Compile the expression."""
+        self.expression = expression
+        parser = Parser(Lexer(expression))
+        program = parser.parse_program()
+        self.errors: list[str] = list(parser.errors)
+        self.compiled = None if self.errors else ClosureCompiler().compile(program)
+        self.environment = Environment()
+
+    def outputs(self, lines: Iterable[str], start: int = 1) -> Iterator[str]:
+        """Yield the output of every line, the first line being number `start`.
+
+        A error is added to the errors and stops the stream.
+        The standard output is captured while a line runs.
+        """
+        if self.compiled is None:
+            return
+
+        compiled = self.compiled
+        environment = self.environment
+        variables = environment.globals
+        String = object.String
+        makeNumber = object.makeNumber
+        NIL_OBJECT = object.NIL_OBJECT
+        BOOLEAN_OBJ = object.BOOLEAN_OBJ
+        ERROR_OBJ = object.ERROR_OBJ
+        printed = io.StringIO()
+
+        for number, line in enumerate(lines, start):
+            variables[LINE] = String(line)
+            variables[LINE_NUMBER] = makeNumber(number)
+            stdout, sys.stdout = sys.stdout, printed
+            try:
+                value = compiled(environment)
+            finally:
+                sys.stdout = stdout
+
+            if printed.tell():
+                yield printed.getvalue().removesuffix("\n")
+                printed.seek(0)
+                printed.truncate()
+
+            kind = value.type
+            if kind == BOOLEAN_OBJ:
+                if value.value:
+                    yield line
+            elif kind == ERROR_OBJ:
+                self.errors.append(f"line {number}: {value}")
+                return
+            elif kind != NIL_OBJECT:
+                yield str(value)
+
+
+# The Stream of a worker process, compiled once when the worker starts.
+_worker: Stream | None = None
+
+
+def _start_worker(expression: str) -> None:
+    """Compile the expression in a new worker process."""
+    global _worker
+    _worker = Stream(expression)
+
+
+def _run_chunk(chunk: tuple[int, list[str]]) -> tuple[list[str], list[str]]:
+    """Return the outputs of a chunk of lines and the error stopping it.
+
+    What the lines print is captured with their outputs, not written by the worker.
+    """
+    start, lines = chunk
+    try:
+        outputs = list(_worker.outputs(lines, start))
+    except SystemExit:
+        # A call with the wrong number of arguments exits, it would lose the chunk.
+        return [], [f"line {start}: A worker exited running the chunk"]
+
+    errors, _worker.errors = _worker.errors, []
+    return outputs, errors
+
+
+def chunked(lines: Iterable[str], chunkSize: int) -> Iterator[tuple[int, list[str]]]:
+    """Yield lists of `chunkSize` lines, with the number of their first line."""
+    lines = iter(lines)
+    start = 1
+    while chunk := list(islice(lines, chunkSize)):
+        yield start, chunk
+        start += len(chunk)
+
+
+def parallel_outputs(
+    stream: Stream, lines: Iterable[str], workers: int, chunkSize: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """Yield the output of every line in order, running chunks in worker processes.
+
+    Every worker compiles the expression once and keeps it's own Environment,
+    so a variable set by a line is only seen by the later lines of the same worker.
+    What a line prints comes back with it's output, in order.
+    At most two chunks per worker are read ahead of the output.
+    """
+    if stream.compiled is None:
+        return
+
+    from multiprocessing import Pool
+
+    with Pool(workers, _start_worker, (stream.expression,)) as pool:
+        chunks = chunked(lines, chunkSize)
+        pending = deque()
+        while True:
+            for chunk in islice(chunks, 2 * workers - len(pending)):
+                pending.append(pool.apply_async(_run_chunk, (chunk,)))
+            if not pending:
+                return
+
+            outputs, errors = pending.popleft().get()
+            yield from outputs
+            if errors:
+                stream.errors.extend(errors)
+                return
+
+
+def read_lines(input: Iterable[str]) -> Iterator[str]:
+    """Yield every line of the input, without it's line break."""
+    for line in input:
+        if line.endswith("\n"):
+            line = line[:-1]
+        yield line
+
+
+def write_batched(
+    outputs: Iterable[str], output: io.TextIOBase, batchSize: int = BATCH_SIZE
+) -> None:
+    """Write every output as a line, joining `batchSize` lines into every write."""
+    batch: list[str] = []
+    for line in outputs:
+        batch.append(line)
+        if len(batch) == batchSize:
+            batch.append("")
+            output.write("\n".join(batch))
+            batch = []
+    if batch:
+        batch.append("")
+        output.write("\n".join(batch))
+    output.flush()
+
+
+def run(
+    expression: str,
+    input: Iterable[str],
+    output: io.TextIOBase,
+    workers: int = 1,
+    chunkSize: int = CHUNK_SIZE,
+) -> int:
+    """Run the expression for every line of the input and return the exit status.
+
+    More than one worker runs chunks of `chunkSize` lines in worker processes.
+    """
+    stream = Stream(expression)
+    lines = read_lines(input)
+    if workers > 1:
+        outputs = parallel_outputs(stream, lines, workers, chunkSize)
+    else:
+        outputs = stream.outputs(lines)
+    write_batched(outputs, output)
+
+    for message in stream.errors:
+        print(message, file=sys.stderr)
+    return 1 if stream.errors else 0
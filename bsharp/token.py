@@ -1,5 +1,7 @@
 """Token provides tokens for bsharp."""
 
+from array import array
+
 PLUS = "PLUS"
 MINUS = "MINUS"
 STAR = "STAR"
@@ -23,6 +25,8 @@ EOF = "EOF"
 ILLEGAL = "ILLEGAL"
 
 DEFUN = "fn"
+SET = "set"
+IF = "if"
 QUOTE = "QUOTE"
 
 
@@ -42,6 +46,8 @@ class Token:
         - getValue() -> str: Method to retrieve it's value.
     """
 
+    __slots__ = ("_type", "_value")
+
     def __init__(self, type: str, value: str) -> None:
         """Construct the token class.
 
@@ -67,3 +73,96 @@ class Token:
     def __repr__(self) -> str:
         """Pretty print the token's value/state."""
         return f"Token(type={self._type}, value='{self._value}')"
+
+
+# Every token type in a fixed order, the index of a type is it's integer kind.
+KINDS: tuple[str, ...] = (
+    PLUS,
+    MINUS,
+    STAR,
+    SLASH,
+    COLON,
+    LROUND,
+    RROUND,
+    LCURLY,
+    RCURLY,
+    LSQUARE,
+    RSQUARE,
+    NUMBER,
+    IDENT,
+    STRING,
+    EOF,
+    ILLEGAL,
+    QUOTE,
+)
+
+KIND_OF: dict[str, int] = {name: kind for kind, name in enumerate(KINDS)}
+
+
+class TokenArray:
+    """TokenArray packs every token of a source into parallel `array.array` columns.
+
+    Attributes:
+        A token is only a row across the three columns, no object is allocated per token.
+        The value is never copied out of the source until it is asked for.
+
+        - kinds(array): Integer kind of every token, one byte each.
+        - starts(array): Start offset of the value of every token, 64 bits each.
+        - ends(array): End offset of the value of every token, 64 bits each.
+        - source(str): The whole input that was tokenized.
+
+    Methods:
+        - append(kind, start, end): Add a token as the last row.
+        - getType(index) -> str: Type of the token at index.
+        - getValue(index) -> str: Value of the token at index.
+        - getKind(index) -> int: Integer kind of the token at index.
+        - getSpan(index) -> tuple[int, int]: Start and end offsets of the token at index.
+        - nextToken() -> Token: Read the tokens in order, like a `Lexer`. Gives EOF tokens on overflow.
+    """
+
+    def __init__(self, source: str) -> None:
+        """Construct a empty token array over the source."""
+        self.source = source
+        self.kinds = array("B")
+        self.starts = array("Q")
+        self.ends = array("Q")
+        self._readPos = 0
+
+    def append(self, kind: int, start: int, end: int) -> None:
+        """Add a token as the last row."""
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        """Return the number of tokens."""
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        """Return the token at index as a Token."""
+        return Token(KINDS[self.kinds[index]], self.getValue(index))
+
+    def getType(self, index: int) -> str:
+        """Return the type of the token at index."""
+        return KINDS[self.kinds[index]]
+
+    def getValue(self, index: int) -> str:
+        """Return the value of the token at index."""
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def getKind(self, index: int) -> int:
+        """Return the integer kind of the token at index."""
+        return self.kinds[index]
+
+    def getSpan(self, index: int) -> tuple[int, int]:
+        """Return the offsets of the value of the token at index in the source."""
+        return self.starts[index], self.ends[index]
+
+    def nextToken(self) -> Token:
+        """Return the next token, in the order they were appended."""
+        if self._readPos >= len(self.kinds):
+            return Token(type=EOF, value="")
+
+        tok = self[self._readPos]
+        self._readPos += 1
+        return tok
@@ -0,0 +1,249 @@
+"""Virtual machine running the bytecode of `bsharp.compiler`."""
+
+from collections.abc import Callable
+
+from bsharp import compiler
+from bsharp import object
+from bsharp.builtins import BUILTINS, CALLING_BUILTINS
+from bsharp.compiler import (
+    CALL,
+    CALL_BUILTIN,
+    CHECK_FUNCTION,
+    CONST,
+    DEFINE,
+    JUMP,
+    JUMP_IF_FALSE,
+    LOAD_ENCLOSING,
+    LOAD_LOCAL,
+    LOAD_NAME,
+    ON_ERROR,
+    POP,
+    RETURN,
+    STORE_LOCAL,
+    STORE_NAME,
+    WIDTH,
+)
+from bsharp.environment import Environment
+import sys
+
+
+class VM:
+    """Class runs compiled Code on a single value stack.
+
+    Exported Methods:
+
+        - run(code, environment): Returns the value of the code.
+
+    Calls to declared functions push a frame instead of recursing,
+    so the depth of recursion of a bsharp program is not limited by Python.
+    Functions are declared in the environment as `compiler.Function`,
+    with the environment they are declared in.
+    Builtins calling functions by name, like `map`, run declared functions
+    on a VM of their own, see `caller()`.
+    """
+
+    def error(self, message: str) -> None:
+        """Convey the error and exit gracefully."""
+        print(message)
+        sys.exit(1)
+
+    def run(self, code: compiler.Code, env: Environment) -> object.Object:
+        """Run the code in the environment and return the result."""
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        frames = []
+
+        instructions = code.instructions
+        constants = code.constants
+        names = code.names
+        ip = 0
+
+        ERROR_OBJ = object.ERROR_OBJ
+        isTruthy = object.isTruthy
+
+        while True:
+            op = instructions[ip]
+            ip += WIDTH
+
+            if op == LOAD_LOCAL:
+                value = env.slots[instructions[ip - 1]]
+                if value is None:
+                    name = names[instructions[ip - 2]]
+                    value = env.globals.get(name)
+                    if value is None:
+                        value = object.Error(message=f"No variable named {name} found")
+                push(value)
+            elif op == CONST:
+                push(constants[instructions[ip - 2]])
+            elif op == LOAD_NAME:
+                name = names[instructions[ip - 2]]
+                value = env.globals.get(name)
+                if value is None:
+                    value = object.Error(message=f"No variable named {name} found")
+                push(value)
+            elif op == ON_ERROR:
+                if stack[-1].type == ERROR_OBJ:
+                    count = instructions[ip - 2]
+                    if count:
+                        del stack[-1 - count : -1]
+                    ip = instructions[ip - 1]
+            elif op == CALL_BUILTIN:
+                count = instructions[ip - 1]
+                if count:
+                    args = stack[-count:]
+                    del stack[-count:]
+                else:
+                    args = []
+                push(constants[instructions[ip - 2]](args))
+            elif op == CALL:
+                name = names[instructions[ip - 2]]
+                count = instructions[ip - 1]
+                if count:
+                    args = stack[-count:]
+                    del stack[-count:]
+                else:
+                    args = []
+
+                declared = env.functions.get(name)
+                if declared is None:
+                    if name in CALLING_BUILTINS:
+                        push(BUILTINS[name](args, self.caller(env)))
+                    else:
+                        push(BUILTINS[name](args))
+                    continue
+
+                function, scope = declared
+                if len(function.params) != len(args):
+                    self.error("Given arguments does not match, required arguments")
+
+                frames.append((instructions, constants, names, ip, env))
+
+                if function.size > count:
+                    args += [None] * (function.size - count)
+                env = Environment(scope, args)
+                code = function.code
+                instructions = code.instructions
+                constants = code.constants
+                names = code.names
+                ip = 0
+            elif op == POP:
+                pop()
+            elif op == RETURN:
+                value = pop()
+                if not frames:
+                    return value
+                instructions, constants, names, ip, env = frames.pop()
+                push(value)
+            elif op == JUMP_IF_FALSE:
+                if not isTruthy(pop()):
+                    ip = instructions[ip - 2]
+            elif op == JUMP:
+                ip = instructions[ip - 2]
+            elif op == CHECK_FUNCTION:
+                name = names[instructions[ip - 2]]
+                if name not in env.functions and name not in BUILTINS:
+                    push(object.Error(message=f"No function named {name} found"))
+                    ip = instructions[ip - 1]
+            elif op == STORE_LOCAL:
+                value = stack[-1]
+                if value.type != ERROR_OBJ:
+                    env.slots[instructions[ip - 2]] = value
+            elif op == LOAD_ENCLOSING:
+                depth, index = constants[instructions[ip - 1]]
+                value = env.ancestor(depth).slots[index]
+                if value is None:
+                    name = names[instructions[ip - 2]]
+                    value = env.globals.get(name)
+                    if value is None:
+                        value = object.Error(message=f"No variable named {name} found")
+                push(value)
+            elif op == STORE_NAME:
+                value = stack[-1]
+                if value.type != ERROR_OBJ:
+                    env.variables[names[instructions[ip - 2]]] = value
+            elif op == DEFINE:
+                function = constants[instructions[ip - 2]]
+                env.functions[function.name] = (function, env)
+                push(object.CONST_NIL)
+            else:
+                raise ValueError(f"Unknown opcode {op}")
+
+    def caller(self, env: Environment) -> Callable:
+        """Return the `call` of builtins calling functions by name in the environment.
+
+        Declared functions are called before builtins, like a call expression.
+        """
+
+        def call(name: str, args: list[object.Object]) -> object.Object:
+            declared = env.functions.get(name)
+            if declared is not None:
+                return self.applyFunction(declared, args)
+            builtin = BUILTINS.get(name)
+            if builtin is None:
+                return object.Error(message=f"No function named {name} found")
+            if name in CALLING_BUILTINS:
+                return builtin(args, call)
+            return builtin(args)
+
+        return call
+
+    def applyFunction(
+        self, declared: tuple, args: list[object.Object]
+    ) -> object.Object:
+        """Run a declared function and it's scope with the arguments."""
+        function, scope = declared
+        if len(function.params) != len(args):
+            self.error("Given arguments does not match, required arguments")
+        if function.size > len(args):
+            args = args + [None] * (function.size - len(args))
+        return self.run(function.code, Environment(scope, args))
+
+
+# Name of every builtin, to list the builtins called.
+BUILTIN_NAMES = {function: name for name, function in BUILTINS.items()}
+
+
+def disassemble(code: compiler.Code) -> str:
+    """Return a readable listing of the code and of every function it declares."""
+    lines = [f"{code.name}:"]
+    functions = []
+    instructions = code.instructions
+
+    for position in range(0, len(instructions), WIDTH):
+        op, a, b = instructions[position : position + WIDTH]
+        line = f"{position // WIDTH:>6} {compiler.OPNAMES[op]:<15}"
+
+        match op:
+            case compiler.CONST | compiler.DEFINE:
+                line += f"{a:<6} ({code.constants[a]!r})"
+                if op == compiler.DEFINE:
+                    functions.append(code.constants[a].code)
+            case compiler.LOAD_NAME | compiler.STORE_NAME:
+                line += f"{a:<6} ({code.names[a]})"
+            case compiler.LOAD_LOCAL:
+                line += f"{b:<6} ({code.names[a]})"
+            case compiler.LOAD_ENCLOSING:
+                depth, index = code.constants[b]
+                line += f"{index:<6} ({code.names[a]}, {depth} up)"
+            case compiler.STORE_LOCAL:
+                line += f"{a:<6}"
+            case compiler.CALL:
+                line += f"{a:<6} ({code.names[a]}, {b} arguments)"
+            case compiler.CALL_BUILTIN:
+                name = BUILTIN_NAMES[code.constants[a]]
+                line += f"{a:<6} ({name}, {b} arguments)"
+            case compiler.CHECK_FUNCTION:
+                line += f"{a:<6} ({code.names[a]}, else to {b // WIDTH})"
+            case compiler.ON_ERROR:
+                line += f"{a:<6} (to {b // WIDTH})"
+            case compiler.JUMP | compiler.JUMP_IF_FALSE:
+                line += f"{a // WIDTH:<6}"
+
+        lines.append(line.rstrip())
+
+    for function in functions:
+        lines.append("")
+        lines.append(disassemble(function))
+
+    return "\n".join(lines)
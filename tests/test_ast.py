@@ -0,0 +1,91 @@
+"""Test the syntax tree and it's arena."""
+
+from unittest import TestCase
+from bsharp.lexer import Lexer
+from bsharp.parser import Parser
+from bsharp import ast
+
+
+class TestAst(TestCase):
+    """Test the syntax tree."""
+
+    def parse(self, input: str) -> ast.Program:
+        """Parse the input into a Program."""
+        parser = Parser(Lexer(input))
+        program = parser.parse_program()
+        self.assertEqual(parser.errors, [])
+        return program
+
+    def test_slotted_expressions(self):
+        """Test no expression carries a __dict__."""
+        program = self.parse('(fn foo [x] (+ x 1 "two" [3]))')
+
+        nodes = [program, program.expressions[0]]
+        nodes += program.expressions[0].args
+        nodes += program.expressions[0].body
+        nodes += program.expressions[0].body[0].args
+
+        for node in nodes:
+            self.assertFalse(hasattr(node, "__dict__"), type(node))
+
+    def test_arena_layout(self):
+        """Test flattening a Program into a arena."""
+        program = self.parse('(fn foo [x y] (+ x 1)) [1 "a" foo]')
+
+        arena = ast.Arena.from_program(program)
+
+        self.assertEqual(arena.kinds[0], ast.NODE_PROGRAM)
+        self.assertEqual(list(arena.children_of(0)), [1, 2])
+
+        self.assertEqual(arena.kinds[1], ast.NODE_FUNCTION)
+        self.assertEqual(arena.value(1), "foo")
+
+        params, body = arena.children_of(1)
+        self.assertEqual(arena.kinds[params], ast.NODE_ARRAY)
+        self.assertEqual(
+            [arena.value(i) for i in arena.children_of(params)], ["x", "y"]
+        )
+        self.assertEqual(arena.kinds[body], ast.NODE_CALL)
+        self.assertEqual(arena.value(body), "+")
+
+        self.assertEqual(arena.kinds[2], ast.NODE_ARRAY)
+        self.assertEqual(
+            [arena.kinds[i] for i in arena.children_of(2)],
+            [ast.NODE_NUMBER, ast.NODE_STRING, ast.NODE_IDENTIFIER],
+        )
+
+        # Every distinct value is only stored once.
+        self.assertEqual(arena.strings.count("foo"), 1)
+        self.assertEqual(arena.strings.count("x"), 1)
+
+    def test_arena_missing_expression(self):
+        """Test expressions which failed to parse are kept as missing nodes."""
+        parser = Parser(Lexer("(+ 1 {)"))
+        arena = ast.Arena.from_program(parser.parse_program())
+
+        self.assertNotEqual(parser.errors, [])
+        self.assertEqual(
+            [arena.kinds[i] for i in arena.children_of(1)],
+            [ast.NODE_NUMBER, ast.NODE_MISSING],
+        )
+
+    def test_arena_deep_program(self):
+        """Test flattening a program deeper than the recursion limit."""
+        depth = 10_000
+        parser = Parser(Lexer("(+ 1 " * depth + ")" * depth), mode="iterative")
+
+        arena = ast.Arena.from_program(parser.parse_program())
+
+        self.assertEqual(len(arena), 2 * depth + 1)
+
+    def test_arena_to_program(self):
+        """Test rebuilding the Program a arena was flattened from."""
+        input = '(fn foo [x y] (+ x 1) [y "a"]) (foo 1 (- 2)) (set z (if z 1 2))'
+        program = self.parse(input)
+
+        rebuilt = ast.Arena.from_program(program).to_program()
+
+        self.assertEqual(repr(rebuilt), repr(program))
+        self.assertEqual(rebuilt.expressions[1].function.getType(), "IDENT")
+        self.assertEqual(rebuilt.expressions[1].args[1].function.getType(), "MINUS")
+        self.assertEqual(rebuilt.expressions[1].args[0].constant.value, 1)
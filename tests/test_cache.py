@@ -0,0 +1,88 @@
+"""Test the cache of parsed scripts."""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from bsharp import cache
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.optimizer import source
+
+SCRIPT = '(fn add [x y] (+ x y))\n(set a [1 "two" three])\n(add 1 (- 5))\n'
+
+
+class TestCache(TestCase):
+    """Test the cache of parsed scripts."""
+
+    def setUp(self):
+        """Write the script in a new directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.script = Path(self.directory.name) / "script.bs"
+        self.script.write_text(SCRIPT)
+
+    def parseWithoutParser(self):
+        """Parse the script, failing if the Lexer or the Parser is used."""
+        with mock.patch("bsharp.parser.Parser", side_effect=AssertionError):
+            with mock.patch("bsharp.lexer.Lexer", side_effect=AssertionError):
+                return cache.parse_file(self.script)
+
+    def test_warm_start(self):
+        """Test a cached script is loaded without the Lexer and the Parser."""
+        cold, errors = cache.parse_file(self.script)
+        self.assertEqual(errors, [])
+        self.assertTrue(os.path.exists(cache.cache_path(self.script)))
+
+        warm, errors = self.parseWithoutParser()
+        self.assertEqual(errors, [])
+        self.assertEqual(source(warm), source(cold))
+        self.assertEqual(Evaluator().eval(warm, Environment()).value, -4)
+
+    def test_changed_source(self):
+        """Test a changed script is parsed again and cached again."""
+        cache.parse_file(self.script)
+        self.script.write_text("(+ 1 2)")
+
+        program, _ = cache.parse_file(self.script)
+        self.assertEqual(source(program), "(+ 1 2)")
+
+        program, _ = self.parseWithoutParser()
+        self.assertEqual(source(program), "(+ 1 2)")
+
+    def test_corrupt_cache(self):
+        """Test a corrupt cache file is ignored and replaced."""
+        cache.parse_file(self.script)
+        path = Path(cache.cache_path(self.script))
+        data = path.read_bytes()
+
+        corrupted = [b"", b"garbage", data[: len(data) // 2], data[:-9] + b"\x00" * 9]
+        for corrupt in corrupted:
+            path.write_bytes(corrupt)
+            program, _ = cache.parse_file(self.script)
+            self.assertEqual(Evaluator().eval(program, Environment()).value, -4)
+
+        self.assertEqual(path.read_bytes(), data)
+
+    def test_other_version(self):
+        """Test a cache file of another version of bsharp is not read."""
+        cache.parse_file(self.script)
+        path = Path(cache.cache_path(self.script))
+        data = path.read_bytes()
+
+        with mock.patch.object(cache, "TAG", "bsharp-other"):
+            self.assertIsNone(cache.load(data, cache.digest(SCRIPT.encode())))
+
+    def test_errors_not_cached(self):
+        """Test a script which does not parse is not cached."""
+        self.script.write_text("(+ 1 2")
+
+        _, errors = cache.parse_file(self.script)
+        self.assertNotEqual(errors, [])
+        self.assertFalse(os.path.exists(cache.cache_path(self.script)))
+
+    def test_disabled(self):
+        """Test the cache is neither read nor written when disabled."""
+        cache.parse_file(self.script, cache=False)
+        self.assertFalse(os.path.exists(cache.cache_path(self.script)))
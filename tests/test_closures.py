@@ -0,0 +1,125 @@
+"""Test the closure compiler."""
+
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from bsharp.closures import ClosureCompiler
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.lexer import Lexer
+from bsharp.parser import Parser
+from bsharp import object
+
+
+PROGRAMS = [
+    "5",
+    "5 5 1 5",
+    '"hello"',
+    "(+ 1 2 3)",
+    "(- (* 2 3) (/ 10 3) 1)",
+    "(- 5)",
+    "(+ 1.5 2) (* 0.5 (/ 7 2.0))",
+    "(lt 1 1.5 2)",
+    "(+ 1 2 3 4) (- 10 1 2) (* 2 3 4) (/ 100 2 5) (/ 7 2 2.0)",
+    "(-)",
+    "(/ 1)",
+    "(lt 1)",
+    "(+ 1 (eq 1 1))",
+    '(upper "a") (fn upper [s] 1) (upper "a")',
+    "(/ 1 0)",
+    '(+ 1 "a")',
+    "(set a 10) (set b (+ a 1)) (* a b)",
+    "undefined",
+    "(undefined 1 2)",
+    "(fn add [x y] (+ x y)) (add 1 2)",
+    "(fn add [x y] (+ x y)) (add 1 (missing))",
+    "(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2))))) (fib 12)",
+    "(fn scoped [x] (set y x) y) (scoped 1) y",
+    "(if (gt 1 2) 1)",
+    '(if (eq "a" "a") "same" "different")',
+    '(print "hello" 1) (print (+ 1 2))',
+    "[1 2 3]",
+    "(set n 2) [1 (+ n 1) 2.5]",
+    '[1 "a"] [1 (missing)]',
+    "(* [1 2 3] 2) (- [1 2] [3 4]) (/ [7 8] 2.0) (sum [1 2 3]) (len [1 2])",
+    '(reduce "*" [1 2 3 4]) (map "lt" [1 5 2] 3) (filter "gt" [1 5 2] 1)',
+    '(array (take 2 (map "+" [1 2 3] 1))) (sum (drop 1 (filter "lt" [1 2 3] 3)))',
+    "(set x 1) (fn f [] x) (fn g [x] (f)) (g 2)",
+    "(fn outer [a] (fn inner [b] (+ a b)) (inner 10)) (outer 1)",
+    "(fn outer [a] (fn inner [b] (+ a b)) 0) (outer 5) (inner 1)",
+    "(set x 1) (fn f [] (set x 2) x) (f) x",
+    "(set y 3) (fn f [c] (if c (set y 1)) y) (f (eq 1 2))",
+    "(fn f [x x] x) (f 1 2)",
+    "(fn f [x] (set x (+ x 1)) x) (f 1)",
+    "(fn f [n] (if (gt n 0) (f (- n 1)))) (f 3)",
+    "(fn f [n] (print n) (if (eq n 0) n (f (- n 1)))) (f 2)",
+    "(fn g [x] (* x 2)) (fn f [x] (g (+ x 1))) (f 1)",
+    "(fn f [] (if 1)) (f)",
+    "(fn f [] (if missing 1 2)) (f)",
+    "(fn f [] (g 1)) (f)",
+    "(fn f [] (upper (missing))) (f)",
+    "(fn f []) (f)",
+    '(fn dbl [x] (* x 2)) (array (map "dbl" [1 2 3])) (sum (map "dbl" [4]))',
+    '(fn big [x] (gt x 1)) (array (filter "big" [1 2 3]))',
+    '(fn add [x y] (+ x y)) (fn f [n] (sum (map "add" [1 2] n))) (f 10)',
+    '(fn upper [x] (* x 3)) (array (map "upper" [1 2]))',
+    '(fn f [x] (sum (map "g" [x]))) (fn g [y] (* y y)) (array (map "f" [1 2 3]))',
+    '(print (take 2 (map "missing" [1 2])))',
+]
+
+
+class TestClosures(TestCase):
+    """Test the closure compiler."""
+
+    def assertSameResult(self, input: str) -> None:
+        """Assert the compiled program and the evaluator give the same result."""
+        program = Parser(Lexer(input)).parse_program()
+
+        expectedOutput = io.StringIO()
+        with redirect_stdout(expectedOutput):
+            expected = Evaluator().eval(program, Environment())
+
+        actualOutput = io.StringIO()
+        with redirect_stdout(actualOutput):
+            actual = ClosureCompiler().compile(program)(Environment())
+
+        self.assertEqual(expected.type, actual.type, input)
+        self.assertEqual(expected.value, actual.value, input)
+        self.assertEqual(expectedOutput.getvalue(), actualOutput.getvalue(), input)
+
+    def test_same_results(self):
+        """Test every program gives the same result as the evaluator."""
+        for input in PROGRAMS:
+            self.assertSameResult(input)
+
+    def test_tail_calls(self):
+        """Test a tail recursive loop runs deeper than the Python stack."""
+        input = (
+            "(fn loop [n acc] (if (eq n 0) acc (loop (- n 1) (+ acc n)))) "
+            "(loop 20000 0)"
+        )
+        program = Parser(Lexer(input)).parse_program()
+
+        result = ClosureCompiler().compile(program)(Environment())
+        self.assertEqual(result.value, 200010000)
+
+    def test_run_many_times(self):
+        """Test a program is compiled once and can be run many times."""
+        program = Parser(Lexer("(fn sq [x] (* x x)) (sq n)")).parse_program()
+        compiled = ClosureCompiler().compile(program)
+
+        for n in range(5):
+            env = Environment()
+            env.variables["n"] = object.Number(n)
+            self.assertEqual(compiled(env).value, n * n)
+
+    def test_shared_environment(self):
+        """Test functions declared by the evaluator can be called by compiled code."""
+        env = Environment()
+
+        declaration = Parser(Lexer("(fn double [x] (* x 2))")).parse_program()
+        Evaluator().eval(declaration, env)
+
+        call = Parser(Lexer("(double 21)")).parse_program()
+        self.assertEqual(ClosureCompiler().compile(call)(env).value, 42)
@@ -1,10 +1,18 @@
 """Test the evalutor."""
 
+import io
+import itertools
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+
 from bsharp.environment import Environment
 from bsharp.lexer import Lexer
 from bsharp.parser import Parser
 from bsharp.evaluator import Evaluator
 from bsharp import object
+from bsharp import ast
 from unittest import TestCase
 
 
@@ -53,18 +61,281 @@ class TestEvaluator(TestCase):
         self.assertEqual(eval.eval(program, env).value, "hello")
         self.assertEqual(eval.eval(program, env).type, object.STRING_OBJ)
 
+    def test_arena_evaluation(self):
+        """Test evaluating a arena gives the same results as the tree."""
+        inputs = [
+            "5",
+            "5 5 1 5",
+            '"hello"',
+            "(fn foo [x] 10) (foo 1)",
+            "(bar 1)",
+            "",
+            "(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2))))) (fib 10)",
+            "(set a 2) (* a (+ a 1))",
+            "(set 1 2)",
+            "(if 1)",
+            "missing",
+            "(set x 1) (fn f [] x) (fn g [x] (f)) (g 2)",
+            "(fn outer [a] (fn inner [b] (+ a b)) 0) (outer 5) (inner 1)",
+            "(set x 1) (fn f [] (set x 2) x) (f) x",
+            "(set n 2) (* [1 n 3] n)",
+            '[1 "a"]',
+            '(fn dbl [x] (* x 2)) (array (map "dbl" [1 2 3]))',
+            '(fn big [x] (gt x 1)) (sum (filter "big" [1 2 3]))',
+        ]
+
+        for input in inputs:
+            program = Parser(Lexer(input)).parse_program()
+            arena = ast.Arena.from_program(program)
+
+            expected = Evaluator().eval(program, Environment())
+            actual = Evaluator().evalArena(arena, Environment())
+
+            self.assertEqual(type(expected), type(actual))
+            self.assertEqual(expected.value, actual.value)
+
+    def test_call_expressions(self):
+        """Test calls to builtins, declared functions and special forms."""
+        cases = {
+            "(+ 1 2 3)": 6,
+            "(- 10 4 3)": 3,
+            "(* 2 3 4)": 24,
+            "(/ 20 2 3)": 3,
+            "(fn add [x y] (+ x y)) (add 1 2)": 3,
+            "(set a 5) (+ a a)": 10,
+            "(if (lt 1 2) 1 2)": 1,
+            "(if (gt 1 2) 1 2)": 2,
+            "(fn fact [n] (if (lt n 2) 1 (* n (fact (- n 1))))) (fact 10)": 3628800,
+        }
+
+        for input, expected in cases.items():
+            program = Parser(Lexer(input)).parse_program()
+            self.assertEqual(Evaluator().eval(program, Environment()).value, expected)
+
+    def test_lexical_scoping(self):
+        """Test functions see the variables where they are declared, not called."""
+        cases = {
+            "(set x 1) (fn f [] x) (fn g [x] (f)) (g 2)": 1,
+            "(fn outer [a] (fn inner [b] (+ a b)) (inner 10)) (outer 1)": 11,
+            "(fn outer [a] (fn inner [b] (+ a b)) 0) (outer 5) (inner 1)": 6,
+            "(set x 1) (fn f [] (set x 2) x) (f)": 2,
+            "(set x 1) (fn f [] (set x 2) x) (f) x": 1,
+            "(set y 3) (fn f [c] (if c (set y 1)) y) (f (eq 1 2))": 3,
+            "(fn f [x x] x) (f 1 2)": 2,
+        }
+
+        for input, expected in cases.items():
+            program = Parser(Lexer(input)).parse_program()
+            result = Evaluator().eval(program, Environment())
+            self.assertEqual(result.value, expected, input)
+
+    def test_tail_calls(self):
+        """Test a tail recursive loop runs deeper than the Python stack."""
+        input = (
+            "(fn loop [n acc] (if (eq n 0) acc (loop (- n 1) (+ acc n)))) "
+            "(loop 20000 0)"
+        )
+        program = Parser(Lexer(input)).parse_program()
+
+        self.assertEqual(Evaluator().eval(program, Environment()).value, 200010000)
+
+        arena = ast.Arena.from_program(program)
+        result = Evaluator().evalArena(arena, Environment())
+        self.assertEqual(result.value, 200010000)
+
+    def test_tail_position(self):
+        """Test calls in and out of tail position give the same results."""
+        cases = {
+            "(fn f [n] (if (eq n 0) 0 (f (- n 1)))) (f 5)": 0,
+            "(fn f [n] (if (gt n 0) (f (- n 1)))) (f 3)": object.CONST_NIL.value,
+            "(fn f [n] (print n) (if (eq n 0) n (f (- n 1)))) (f 2)": 0,
+            "(fn g [x] (* x 2)) (fn f [x] (g (+ x 1))) (f 1)": 4,
+            "(fn f [x] (+ 1 x)) (fn g [x] (set y x) (f y)) (g 1)": 2,
+            "(fn f [] (if 1)) (f)": (
+                "if expects a condition, a consequence and a alternative"
+            ),
+            "(fn f [] (if missing 1 2)) (f)": "No variable named missing found",
+        }
+
+        for input, expected in cases.items():
+            program = Parser(Lexer(input)).parse_program()
+            with redirect_stdout(io.StringIO()):
+                result = Evaluator().eval(program, Environment())
+                arena = ast.Arena.from_program(program)
+                fromArena = Evaluator().evalArena(arena, Environment())
+            self.assertEqual(result.value, expected, input)
+            self.assertEqual(fromArena.value, expected, input)
+
+    def test_call_errors(self):
+        """Test calls returning errors."""
+        inputs = ["(missing 1)", '(+ 1 "a")', "(/ 1 0)", "(+ 1 (missing))", "x"]
+
+        for input in inputs:
+            program = Parser(Lexer(input)).parse_program()
+            result = Evaluator().eval(program, Environment())
+            self.assertEqual(result.type, object.ERROR_OBJ, input)
+
+    def test_number_literals(self):
+        """Test literals are converted once, as int or float."""
+        tests = [
+            ("1.5", 1.5),
+            ("(+ 1 1.5)", 2.5),
+            ("(/ 7 2)", 3),
+            ("(/ 7 2.0)", 3.5),
+            ("(eq 2 2.0)", True),
+        ]
+
+        for input, expected in tests:
+            program = Parser(Lexer(input)).parse_program()
+            result = Evaluator().eval(program, Environment())
+            self.assertEqual(result.value, expected, input)
+            self.assertIs(type(result.value), type(expected), input)
+
+        program = Parser(Lexer("(+ 1 1) 1")).parse_program()
+        literals = [program.expressions[0].args[0], program.expressions[1]]
+        self.assertIs(literals[0].constant, literals[1].constant)
+        self.assertIs(Evaluator().eval(program, Environment()), literals[1].constant)
+
+    def test_string_builtins(self):
+        """Test the builtins on strings."""
+        tests = [
+            ('(len "hello")', 5),
+            ('(upper "Hello")', "HELLO"),
+            ('(lower "Hello")', "hello"),
+            ('(contains "hello" "ell")', True),
+            ('(contains "hello" "bye")', False),
+            ('(field "a  b c" 2)', "b"),
+            ('(field "a b" 0)', "a b"),
+            ('(field "a b" 3)', ""),
+            ('(concat "a" 1 "b")', "a1b"),
+            ('(+ 1 (number "41"))', 42),
+        ]
+
+        for input, expected in tests:
+            program = Parser(Lexer(input)).parse_program()
+            result = Evaluator().eval(program, Environment())
+            self.assertEqual(result.value, expected, input)
+
+        for input in [
+            '(len "a" "b")',
+            "(upper 1)",
+            '(field "a" "b")',
+            '(field "a b" 1.5)',
+            '(number "x")',
+        ] + [f"({op} {'9' * 400} 1.5)" for op in "+-*/"]:
+            program = Parser(Lexer(input)).parse_program()
+            result = Evaluator().eval(program, Environment())
+            self.assertEqual(result.type, object.ERROR_OBJ, input)
+
+    def test_array_builtins(self):
+        """Test arrays of numbers and the builtins running over them."""
+        tests = [
+            ("[1 2 3]", "[1 2 3]"),
+            ("[1 2.5]", "[1.0 2.5]"),
+            ("(array 1 2)", "[1 2]"),
+            ("(+ [1 2] 10 [100 200])", "[111 212]"),
+            ("(- [1 2])", "[-1 -2]"),
+            ("(- 10 [1 2])", "[9 8]"),
+            ("(* [1 2] 1.5)", "[1.5 3.0]"),
+            ("(/ [7 9] 2)", "[3 4]"),
+            ("(sum [1 2 3])", "6"),
+            ("(len [])", "0"),
+            ('(reduce "-" [10 1 2])', "7"),
+            ('(reduce "+" [] 5)', "5"),
+            ('(reduce "/" [7 2] 1.0)', "0.07142857142857142"),
+            ('(map "*" [1 2 3] [2 2 2])', "[2 4 6]"),
+            ('(map "gt" [1.5 2.5] 2)', "[0 1]"),
+            ('(filter "lt" [5 1 4 2] 3)', "[1 2]"),
+            ('(numbers "1 2  3")', "[1 2 3]"),
+            ('(numbers "1 2.5")', "[1.0 2.5]"),
+        ]
+
+        for input, expected in tests:
+            program = Parser(Lexer(input)).parse_program()
+            result = Evaluator().eval(program, Environment())
+            self.assertEqual(repr(result), expected, input)
+
+        errors = [
+            '[1 "a"]',
+            "(+ [1 2] [1 2 3])",
+            "(/ [1 2] [1 0])",
+            '(+ [1] "a")',
+            "[99999999999999999999]",
+            '(reduce "+" [])',
+            '(reduce "lt" [1 2])',
+            '(sum (map "x" [1 2] 1))',
+            '(array (filter "x" [1 2] 1))',
+            '(numbers "1 a")',
+            "(sum 1)",
+        ]
+        for input in errors:
+            program = Parser(Lexer(input)).parse_program()
+            result = Evaluator().eval(program, Environment())
+            self.assertEqual(result.type, object.ERROR_OBJ, input)
+
+    def test_sequences(self):
+        """Test lazy sequences, calling builtins and declared functions by name."""
+        tests = [
+            ('(fn double [x] (* x 2)) (array (map "double" [1 2 3]))', "[2 4 6]"),
+            ('(array (take 2 (filter "gt" [1 5 2 7] 1)))', "[5 2]"),
+            ('(sum (drop 1 (map "+" [1 2 3] 10)))', "25"),
+            ("(take 2 [1 2 3]) (drop 2 [1 2 3])", "[3]"),
+            ('(fn f [x] (+ x "a")) (sum (map "f" [1 2]))', "ERROR: + expects numbers"),
+            ("(sum (take 1 [1 2]))", "1"),
+            ("(take 1 2)", "ERROR: take expects a sequence, got NUMBER"),
+        ]
+
+        for input, expected in tests:
+            program = Parser(Lexer(input)).parse_program()
+            result = Evaluator().eval(program, Environment())
+            self.assertTrue(repr(result).startswith(expected), input)
+
+    def test_sequences_stop_early(self):
+        """Test a sequence makes no element past the ones `take` reads."""
+        input = '(fn seen [x] (print x) x) (array (take 2 (map "seen" [1 2 3 4])))'
+        program = Parser(Lexer(input)).parse_program()
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            result = Evaluator().eval(program, Environment())
+
+        self.assertEqual(repr(result), "[1 2]")
+        self.assertEqual(output.getvalue(), "1\n2\n")
+
+    def test_lines(self):
+        """Test lines are read lazily, from a file or a endless stdin."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "numbers.txt")
+            with open(path, "w") as file:
+                file.write("1\n2\n3\n")
+
+            program = Parser(Lexer(f'(sum (map "number" (lines "{path}")))'))
+            result = Evaluator().eval(program.parse_program(), Environment())
+            self.assertEqual(result.value, 6)
+
+        program = Parser(Lexer("(print (take 2 (lines)))")).parse_program()
+        output = io.StringIO()
+        with mock.patch("sys.stdin", itertools.repeat("yes\n")):
+            with redirect_stdout(output):
+                Evaluator().eval(program, Environment())
+        self.assertEqual(output.getvalue(), "yes\nyes\n")
+
+        program = Parser(Lexer('(sum (lines "missing/file"))')).parse_program()
+        result = Evaluator().eval(program, Environment())
+        self.assertEqual(result.type, object.ERROR_OBJ)
+
     # @pytest.mark.simple
     # @pytest.mark.evaluator
-    # def test_add_expression(self):
-    #     """Test numerical expressions."""
-    #     input = "(+ 1 2)"
-    #
-    #     lexer = Lexer(input)
-    #     parser = Parser(lexer)
-    #     program = parser.parse_program()
-    #
-    #     eval = Evaluator()
-    #     env = Environment()
-    #
-    #     self.assertEqual(eval.eval(program, env).value, 3)
-    #     self.assertEqual(eval.eval(program, env).type, object.NUMBER_OBJ)
+    def test_add_expression(self):
+        """Test numerical expressions."""
+        input = "(+ 1 2)"
+
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+
+        eval = Evaluator()
+        env = Environment()
+
+        self.assertEqual(eval.eval(program, env).value, 3)
+        self.assertEqual(eval.eval(program, env).type, object.NUMBER_OBJ)
@@ -0,0 +1,125 @@
+"""Test calling hooks while evaluating a Program."""
+
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from bsharp import ast
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.hooks import HookedEvaluator, Hooks
+from bsharp.lexer import Lexer
+from bsharp.parser import Parser
+
+
+class TestHooks(TestCase):
+    """Test calling hooks while evaluating a Program."""
+
+    def setUp(self):
+        """Register hooks recording every event."""
+        self.events = []
+        self.hooks = Hooks()
+        self.hooks.on_call(lambda name, args: self.events.append(("call", name)))
+        self.hooks.on_return(
+            lambda name, value: self.events.append(("return", name, repr(value)))
+        )
+        self.hooks.on_error(lambda name, error: self.events.append(("error", name)))
+
+    def evaluate(self, input: str) -> str:
+        """Evaluate the input with the hooks, return it's value."""
+        program = Parser(Lexer(input)).parse_program()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            value = HookedEvaluator(self.hooks).eval(program, Environment())
+        return repr(value)
+
+    def test_calls(self):
+        """Test functions and builtins are reported with their values."""
+        value = self.evaluate("(fn sq [x] (* x x)) (+ (sq 3) 1)")
+
+        self.assertEqual(value, "10")
+        self.assertEqual(
+            self.events,
+            [
+                ("call", "sq"),
+                ("call", "*"),
+                ("return", "*", "9"),
+                ("return", "sq", "9"),
+                ("call", "+"),
+                ("return", "+", "10"),
+            ],
+        )
+
+    def test_tail_calls(self):
+        """Test a call in tail position takes the place of it's caller."""
+        value = self.evaluate(
+            "(fn count [n] (if (lt n 1) 0 (count (- n 1)))) (count 2)"
+        )
+
+        self.assertEqual(value, "0")
+        counts = [event for event in self.events if event[1] == "count"]
+        self.assertEqual(
+            counts,
+            [
+                ("call", "count"),
+                ("return", "count", "None"),
+                ("call", "count"),
+                ("return", "count", "None"),
+                ("call", "count"),
+                ("return", "count", "0"),
+            ],
+        )
+
+    def test_plain_methods(self):
+        """Test only the methods of the registered kinds of callbacks are hooked."""
+        evaluator = HookedEvaluator(Hooks())
+        self.assertEqual(evaluator.eval.__func__, Evaluator.eval)
+        self.assertEqual(evaluator.applyFunction.__func__, Evaluator.applyFunction)
+
+        evaluator = HookedEvaluator(self.hooks)
+        self.assertEqual(evaluator.eval.__func__, Evaluator.eval)
+        self.assertEqual(
+            evaluator.applyFunction.__func__, HookedEvaluator.applyFunction
+        )
+
+    def test_errors(self):
+        """Test a call returning a error is reported as a error."""
+        self.evaluate('(fn f [x] (+ x "a")) (fn g [] (+ (f 1) 1)) (g)')
+        self.assertEqual(
+            self.events[-3:], [("error", "+"), ("error", "f"), ("error", "g")]
+        )
+
+        # f takes the place of g, the error is f's alone.
+        self.events.clear()
+        self.evaluate('(fn f [x] (+ x "a")) (fn g [] (f 1)) (g)')
+        self.assertEqual(
+            self.events,
+            [
+                ("call", "g"),
+                ("return", "g", "None"),
+                ("call", "f"),
+                ("call", "+"),
+                ("error", "+"),
+                ("error", "f"),
+            ],
+        )
+
+    def test_nodes(self):
+        """Test every node of a kind is reported, in tail position too."""
+        conditions = []
+        self.hooks.on_node(
+            ast.CallExpression,
+            lambda ex, env: conditions.append(ex.function.getValue()),
+        )
+        self.evaluate(
+            "(fn sign [x] (if (lt x 0) (- 1) (if (eq x 0) 0 1))) (sign 5) (sign (- 5))"
+        )
+
+        self.assertEqual(conditions.count("if"), 3)
+        self.assertEqual(conditions.count("sign"), 2)
+
+    def test_map(self):
+        """Test functions called by builtins are reported."""
+        self.evaluate('(fn double [x] (* x 2)) (sum (map "double" [1 2]))')
+        calls = [event[1] for event in self.events if event[0] == "call"]
+        self.assertEqual(calls, ["map", "sum", "double", "*", "double", "*"])
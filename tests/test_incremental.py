@@ -0,0 +1,92 @@
+"""Test parsing a changing source incrementally."""
+
+from unittest import TestCase
+
+from bsharp.incremental import IncrementalParser
+from bsharp.lexer import BACKEND_REGEX, Lexer, form_spans
+from bsharp.parser import Parser
+
+SOURCE = """(fn sq [x] (* x x))
+(set y 2)
+(print (sq y) "a (b")
+[1 2 3]
+"""
+
+
+def parse(source: str) -> tuple[str, list[str]]:
+    """Return the Program of the whole source as a string, and the errors."""
+    parser = Parser(Lexer(source, backend=BACKEND_REGEX))
+    return repr(parser.parse_program()), parser.errors
+
+
+class TestIncremental(TestCase):
+    """Test parsing a changing source incrementally."""
+
+    def setUp(self):
+        """Parse the source."""
+        self.parser = IncrementalParser()
+        self.program, errors = self.parser.parse(SOURCE)
+        # The Program is updated in place by every edit.
+        self.expressions = list(self.program.expressions)
+        self.assertEqual(errors, [])
+        self.assertEqual(self.parser.reparsed, 4)
+
+    def check(self, program, errors) -> None:
+        """Check the Program and errors are those of parsing the whole source."""
+        self.assertEqual((repr(program), errors), parse(self.parser.source))
+
+    def test_form_spans(self):
+        """Test top-level forms are split like the parser reads them."""
+        source = '(a [1 (b)]) 1 "x (" ) (open'
+        spans = [source[start:end] for start, end in form_spans(source)]
+        self.assertEqual(spans, ["(a [1 (b)])", "1", '"x ("', ")", "(open"])
+
+    def test_edit(self):
+        """Test only the edited form is parsed again, the others are reused."""
+        start = SOURCE.index("2)")
+        program, errors = self.parser.edit(start, start + 1, "30")
+
+        self.check(program, errors)
+        self.assertEqual(self.parser.reparsed, 1)
+        self.assertIs(program, self.program)
+        for index in (0, 2, 3):
+            self.assertIs(program.expressions[index], self.expressions[index])
+        self.assertEqual(self.parser.span(3)[0], SOURCE.rindex("[") + 1)
+
+    def test_parse(self):
+        """Test a new version of the source is compared with the last one."""
+        program, errors = self.parser.parse(SOURCE.replace("(sq y)", "(sq (sq y))"))
+
+        self.check(program, errors)
+        self.assertEqual(self.parser.reparsed, 1)
+
+        program, errors = self.parser.parse(SOURCE)
+        self.check(program, errors)
+        self.assertEqual(self.parser.reparsed, 0)
+        self.assertIs(program.expressions[2], self.expressions[2])
+
+    def test_structure(self):
+        """Test edits joining, splitting and opening forms."""
+        edits = [
+            (SOURCE.index("\n(set"), SOURCE.index("\n(set") + 1, ""),
+            (0, 0, "(print "),
+            (0, len("(print "), ""),
+            (SOURCE.index("(set") + 1, SOURCE.index("(set") + 1, ")("),
+            (0, 0, "1"),
+        ]
+        for start, end, text in edits:
+            self.check(*self.parser.edit(start, end, text))
+
+    def test_errors(self):
+        """Test the errors of a broken form are those of the whole source."""
+        start = SOURCE.index("(set")
+        program, errors = self.parser.edit(start, start + 1, "")
+
+        self.assertNotEqual(errors, [])
+        self.check(program, errors)
+        # The forms before the broken one are kept, not parsed again.
+        self.assertIs(program.expressions[0], self.expressions[0])
+
+        program, errors = self.parser.edit(start, start, "(")
+        self.assertEqual(errors, [])
+        self.check(program, errors)
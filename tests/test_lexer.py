@@ -1,7 +1,11 @@
 """Module tests Lexer for bsharp."""
 
 from typing import List
+import io
+import os
+import tempfile
 import unittest
+from unittest import mock
 from bsharp import lexer
 from bsharp import token
 
@@ -14,13 +18,14 @@ class TestLexer(unittest.TestCase):
         self.assertEqual(True, True)
 
     def assertTokens(self, input: str, expectedTokens: List[token.Token]) -> None:
-        """Assert if list of tokens is equal to calculated tokens."""
-        l = lexer.Lexer(input)
-        for expected in expectedTokens:
-            actual = l.nextToken()
+        """Assert if list of tokens is equal to calculated tokens, for every backend."""
+        for backend in (lexer.BACKEND_SCAN, lexer.BACKEND_REGEX):
+            l = lexer.Lexer(input, backend=backend)
+            for expected in expectedTokens:
+                actual = l.nextToken()
 
-            self.assertEqual(expected.getType(), actual.getType())
-            self.assertEqual(expected.getValue(), actual.getValue())
+                self.assertEqual(expected.getType(), actual.getType())
+                self.assertEqual(expected.getValue(), actual.getValue())
 
     def test_arthemetic(self):
         """Test arthemetic symbols."""
@@ -139,3 +144,126 @@ class TestLexer(unittest.TestCase):
         ]
 
         self.assertTokens(input, expectedTokens)
+
+    def test_backends_agree(self) -> None:
+        """Test the regex backend produces the same tokens as the scanning backend."""
+        input = """
+        (fn add-two [x y] (+ x y 2.5))
+        (print "unterminated
+        _ 1..2 ab-1 "" %
+        """
+
+        scan = lexer.Lexer(input, backend=lexer.BACKEND_SCAN)
+        regex = lexer.Lexer(input, backend=lexer.BACKEND_REGEX)
+
+        while True:
+            expected = scan.nextToken()
+            actual = regex.nextToken()
+
+            self.assertEqual(expected.getType(), actual.getType())
+            self.assertEqual(expected.getValue(), actual.getValue())
+
+            if expected.getType() == token.EOF:
+                break
+
+        self.assertEqual(regex.nextToken().getType(), token.EOF)
+
+    def test_unknown_backend(self) -> None:
+        """Test an unknown backend is rejected."""
+        with self.assertRaises(ValueError):
+            lexer.Lexer("1", backend="unknown")
+
+    def assertSameTokens(self, expected: lexer.Lexer, actual) -> None:
+        """Assert if two lexers produce the same tokens until EOF."""
+        while True:
+            expectedToken = expected.nextToken()
+            actualToken = actual.nextToken()
+
+            self.assertEqual(expectedToken.getType(), actualToken.getType())
+            self.assertEqual(expectedToken.getValue(), actualToken.getValue())
+
+            if expectedToken.getType() == token.EOF:
+                break
+
+        self.assertEqual(actual.nextToken().getType(), token.EOF)
+
+    def test_stream_buffer_boundaries(self) -> None:
+        """Test tokens crossing the boundary of the buffer."""
+        input = """
+        (fn add-two [x y] (+ x y 22.5))
+        (print "a string
+        spanning lines" add-two) "unterminated
+        """
+
+        for bufferSize in (1, 2, 3, 5, 8, 1024):
+            self.assertSameTokens(
+                lexer.Lexer(input),
+                lexer.StreamLexer(io.StringIO(input), bufferSize=bufferSize),
+            )
+
+    def test_stream_long_tokens(self) -> None:
+        """Test tokens spanning many buffers, and the buffers ending them."""
+        input = '"{0}" {1}.5 {2}-{2} {0}"'.format("x y" * 100, "1" * 300, "ab" * 150)
+
+        for bufferSize in (1, 7, 64):
+            self.assertSameTokens(
+                lexer.Lexer(input),
+                lexer.StreamLexer(io.StringIO(input), bufferSize=bufferSize),
+            )
+
+    def test_stream_stdin(self) -> None:
+        """Test the stream lexer reading the standard input."""
+        input = '(print "hello")'
+
+        with mock.patch("sys.stdin", io.StringIO(input)):
+            self.assertSameTokens(
+                lexer.Lexer(input), lexer.StreamLexer.fromStdin(bufferSize=4)
+            )
+
+    def test_stream_mmap(self) -> None:
+        """Test the stream lexer reading a memory mapped file."""
+        input = '(print "héllo wörld" 12.5 ünïcode)'
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "script.bs")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(input)
+
+            for bufferSize in (1, 3, 64):
+                mapped = lexer.StreamLexer.fromMmap(path, bufferSize=bufferSize)
+                self.assertSameTokens(lexer.Lexer(input), mapped)
+                # The mapping is closed at EOF.
+                self.assertTrue(mapped.stream._mapped.closed)
+
+            with lexer.StreamLexer.fromMmap(path) as mapped:
+                self.assertEqual(mapped.nextToken().getType(), token.LROUND)
+            self.assertTrue(mapped.stream._mapped.closed)
+
+            empty = os.path.join(directory, "empty.bs")
+            open(empty, "w").close()
+            self.assertEqual(
+                lexer.StreamLexer.fromMmap(empty).nextToken().getType(), token.EOF
+            )
+
+    def test_pack_tokens(self) -> None:
+        """Test packing every token in parallel arrays."""
+        input = '(print "hi" 10)'
+
+        tokens = lexer.Lexer(input).packTokens()
+
+        self.assertEqual(len(tokens), 5)
+        self.assertEqual(
+            [tokens.getType(i) for i in range(len(tokens))],
+            [token.LROUND, token.IDENT, token.STRING, token.NUMBER, token.RROUND],
+        )
+        self.assertEqual(tokens.getValue(2), "hi")
+        self.assertEqual(list(tokens.starts), [0, 1, 8, 12, 14])
+        self.assertEqual(tokens.getKind(0), token.KIND_OF[token.LROUND])
+        self.assertEqual(tokens.getSpan(2), (8, 10))
+        self.assertEqual(tokens.kinds.itemsize, 1)
+
+        self.assertSameTokens(lexer.Lexer(input), tokens)
+
+        # Offsets past 4 GiB, a mapped or streamed file can be that large.
+        tokens.append(token.KIND_OF[token.IDENT], 2**32, 2**32 + 1)
+        self.assertEqual(tokens.getSpan(5), (2**32, 2**32 + 1))
@@ -0,0 +1,117 @@
+"""Test running bsharp from the command line."""
+
+import contextlib
+import io
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from bsharp.__main__ import main
+
+
+class TestMain(TestCase):
+    """Test running scripts and expressions from the command line."""
+
+    def setUp(self):
+        """Make a new directory for scripts."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def script(self, source: str) -> str:
+        """Write the source to a script and return it's path."""
+        path = Path(self.directory.name) / "script.bs"
+        path.write_text(source)
+        return str(path)
+
+    def run_main(self, *argv: str) -> tuple[int, str, str]:
+        """Run main with the arguments, return the status, stdout and stderr."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = main(list(argv))
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_expression(self):
+        """Test the value of an expression is printed."""
+        self.assertEqual(self.run_main("-e", "(+ 1 2)"), (0, "3\n", ""))
+        self.assertEqual(self.run_main("-e", '(print "hi")'), (0, "hi\n", ""))
+
+    def test_script(self):
+        """Test a script is run, with and without the cache."""
+        path = self.script("(fn add [x y] (+ x y))\n(print (add 1 2))\n")
+
+        for argv in ([path], [path], ["--no-cache", path], ["--memo", path]):
+            self.assertEqual(self.run_main(*argv), (0, "3\n", ""))
+
+    def test_profile(self):
+        """Test profiling writes a report to stderr and the stacks to a file."""
+        path = self.script("(fn add [x y] (+ x y))\n(print (add 1 2))\n")
+        stacks = str(Path(self.directory.name) / "stacks.txt")
+
+        status, stdout, stderr = self.run_main("--profile-stacks", stacks, path)
+        self.assertEqual((status, stdout), (0, "3\n"))
+        self.assertIn(f"add ({path}:1)", stderr)
+        for line in Path(stacks).read_text().splitlines():
+            self.assertRegex(line, r"^.+ \(.+\) \d+$")
+
+        status, stdout, stderr = self.run_main("--profile", "-e", "(+ 1 2)")
+        self.assertEqual((status, stdout), (0, "3\n"))
+        self.assertIn("+ (builtin)", stderr)
+
+    def test_lines(self):
+        """Test the expression is run for every line of stdin."""
+        with mock.patch("sys.stdin", io.StringIO("a\nb\n")):
+            self.assertEqual(self.run_main("-n", "(upper line)"), (0, "A\nB\n", ""))
+
+    def test_errors(self):
+        """Test errors are written to stderr with a failing status."""
+        status, stdout, stderr = self.run_main("-e", "(+ 1")
+        self.assertEqual((status, stdout), (1, ""))
+        self.assertNotEqual(stderr, "")
+
+        status, stdout, stderr = self.run_main("-e", "1.2.3")
+        self.assertEqual((status, stdout), (1, ""))
+        self.assertEqual(stderr, "Cannot parse 1.2.3 as a number.\n")
+
+        status, stdout, stderr = self.run_main("-e", "(+ 1 missing)")
+        self.assertEqual((status, stdout), (1, ""))
+        self.assertIn("missing", stderr)
+
+        status, _, stderr = self.run_main(str(Path(self.directory.name) / "no.bs"))
+        self.assertEqual(status, 1)
+        self.assertIn("Cannot read", stderr)
+
+        path = Path(self.directory.name) / "latin.bs"
+        path.write_bytes(b'(print "caf\xe9")')
+        reason = "not utf-8, invalid continuation byte at byte 11"
+        for argv in ([str(path)], ["--no-cache", str(path)]):
+            self.assertEqual(
+                self.run_main(*argv), (1, "", f"Cannot read {path}: {reason}\n")
+            )
+
+    def test_usage(self):
+        """Test wrong arguments print the usage."""
+        for argv in (["-e"], ["--unknown", "a.bs"], ["a.bs", "b.bs"]):
+            status, _, stderr = self.run_main(*argv)
+            self.assertEqual(status, 2)
+            self.assertIn("usage", stderr)
+
+        status, stdout, _ = self.run_main("--help")
+        self.assertEqual(status, 0)
+        self.assertIn("usage", stdout)
+
+    def test_lazy_imports(self):
+        """Test running a script imports no REPL, shell or debugging module."""
+        path = self.script("(print 1)\n")
+        check = (
+            "import sys\n"
+            "from bsharp.__main__ import main\n"
+            f"main([{path!r}])\n"
+            "modules = {'bsharp.repl', 'bsharp.shell', 'pprint', 'typing'}\n"
+            "print(sorted(modules & set(sys.modules)))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", check], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout, "1\n[]\n")
@@ -0,0 +1,134 @@
+"""Test memoizing functions."""
+
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.lexer import Lexer
+from bsharp.memo import Memo
+from bsharp.parser import Parser
+
+
+class TestMemo(TestCase):
+    """Test memoizing functions."""
+
+    def evaluate(self, input: str, memo: Memo) -> str:
+        """Evaluate the input with the memo, return it's value."""
+        program = Parser(Lexer(input)).parse_program()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            value = Evaluator(memo=memo).eval(program, Environment())
+        return repr(value)
+
+    def memoized(self, input: str) -> set[str]:
+        """Return the names of the functions found pure in the input."""
+        memo = Memo()
+        self.evaluate(input, memo)
+        return {declaration.function.getValue() for declaration in memo.memoized}
+
+    def test_purity(self):
+        """Test only functions of their arguments and pure calls are memoized."""
+        pure = self.memoized(
+            "(fn sq [x] (* x x)) "
+            "(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2))))) "
+            '(fn local [x] (set x (sq x)) [x (len (upper "a"))])'
+        )
+        self.assertEqual(pure, {"sq", "fib", "local"})
+
+        impure = self.memoized(
+            "(set g 1) "
+            "(fn shows [x] (print x)) "
+            "(fn global [x] (+ x g)) "
+            "(fn calls [x] (shows x)) "
+            "(fn declares [x] (fn inner [y] (+ x y)) x) "
+            "(fn unknown [x] (missing x)) "
+            "(fn upper [x] (print x)) (fn shadowed [x] (upper x)) "
+            '(fn runs [x] (run "true")) '
+            "(fn unset [x] (if x (set y 1)) y)"
+        )
+        self.assertEqual(impure, set())
+
+    def test_unset_local(self):
+        """Test a variable set on one branch only reads the global on the other."""
+        input = (
+            "(fn f [a] (if (gt a 0) (set t 1)) t) "
+            "(set t 99) (print (f 0)) (set t 5) (print (f 0))"
+        )
+        for memo in (None, Memo()):
+            program = Parser(Lexer(input)).parse_program()
+            output = io.StringIO()
+            with redirect_stdout(output):
+                Evaluator(memo=memo).eval(program, Environment())
+            self.assertEqual(output.getvalue().split(), ["99", "5"])
+
+    def test_hits(self):
+        """Test repeated calls are answered from the cache."""
+        memo = Memo()
+        value = self.evaluate(
+            "(fn fib [n] (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2))))) (fib 60)",
+            memo,
+        )
+
+        self.assertEqual(value, "1548008755920")
+        self.assertEqual(
+            memo.stats(), {"hits": 58, "misses": 61, "evictions": 0, "size": 61}
+        )
+
+    def test_keys(self):
+        """Test arguments are told apart by their type, arrays are never kept."""
+        memo = Memo()
+        value = self.evaluate(
+            "(fn half [x] (/ x 2)) (half 1) (half 1.0) (half 1) (len [1]) "
+            "(fn size [a] (len a)) (size [1 2]) (size [1 2]) (half 1.0)",
+            memo,
+        )
+
+        self.assertEqual(value, "0.5")
+        self.assertEqual(memo.hits, 2)
+        self.assertEqual(memo.misses, 2)
+
+    def test_eviction(self):
+        """Test the least recently used result is evicted once the cache is full."""
+        memo = Memo(size=2)
+        self.evaluate(
+            "(fn sq [x] (* x x)) (sq 1) (sq 2) (sq 1) (sq 3) (sq 1) (sq 2)", memo
+        )
+
+        self.assertEqual(
+            memo.stats(), {"hits": 2, "misses": 4, "evictions": 2, "size": 2}
+        )
+
+    def test_mark(self):
+        """Test a marked function is memoized even if it is not pure."""
+        program = Parser(Lexer("(fn shows [x] (print x) x) (shows 1) (shows 1)"))
+        program = program.parse_program()
+        memo = Memo(automatic=False)
+        memo.mark(program.expressions[0])
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            Evaluator(memo=memo).eval(program, Environment())
+
+        self.assertEqual(output.getvalue(), "1\n")
+        self.assertEqual(memo.hits, 1)
+
+    def test_redeclare(self):
+        """Test declaring a function again forgets the results of it's callers."""
+        value = self.evaluate(
+            "(fn g [x] 1) (fn f [x] (g x)) (f 1) (fn g [x] 2) (f 1)", Memo()
+        )
+        self.assertEqual(value, "2")
+
+    def test_tail_calls(self):
+        """Test every call of a chain of tail calls keeps the final result."""
+        memo = Memo()
+        self.evaluate(
+            "(fn count [n total] (if (lt n 1) total (count (- n 1) (+ total n)))) "
+            "(count 10 0) (count 5 40)",
+            memo,
+        )
+
+        self.assertEqual(memo.stats()["size"], 11)
+        self.assertEqual(memo.hits, 1)
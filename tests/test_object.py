@@ -0,0 +1,66 @@
+"""Test the objects of the evaluation."""
+
+from unittest import TestCase
+
+from bsharp import object
+from bsharp.builtins import BUILTINS
+
+
+class TestObject(TestCase):
+    """Test the objects of the evaluation."""
+
+    def test_slots(self):
+        """Test no object carries a __dict__, the type tag belongs to the class."""
+        objects = [
+            object.Number(1),
+            object.String("a"),
+            object.Boolean(True),
+            object.Nil(),
+            object.Error("message"),
+            object.makeArray([1, 2]),
+        ]
+
+        for obj in objects:
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj))
+        self.assertEqual(object.Object.__slots__, ("value",))
+        self.assertEqual(object.Number(1).type, object.NUMBER_OBJ)
+
+    def test_small_ints(self):
+        """Test small integers are shared, other numbers are made."""
+        self.assertIs(object.makeNumber(-5), object.makeNumber(-5))
+        self.assertIs(object.makeNumber(256), object.makeNumber(256))
+        self.assertIsNot(object.makeNumber(257), object.makeNumber(257))
+        self.assertIsNot(object.makeNumber(1.0), object.makeNumber(1.0))
+        self.assertEqual(object.makeNumber(7).value, 7)
+
+        self.assertIs(
+            BUILTINS["+"]([object.Number(1), object.Number(2)]),
+            object.makeNumber(3),
+        )
+
+    def test_interned_strings(self):
+        """Test short strings and literals are shared, long strings are made."""
+        short = "a" * object.SHORT_STRING
+        long = "a" * (object.SHORT_STRING + 1)
+
+        self.assertIs(object.makeString(short), object.makeString(short))
+        self.assertIsNot(object.makeString(long), object.makeString(long))
+        self.assertIs(
+            object.makeString(long, literal=True), object.makeString(long, literal=True)
+        )
+
+    def test_arrays(self):
+        """Test arrays store integers, or floats once a element is a float."""
+        self.assertEqual(object.makeArray([1, 2]).value.typecode, object.INT_ARRAY)
+        self.assertEqual(object.makeArray([1, 2.0]).value.typecode, object.FLOAT_ARRAY)
+        self.assertEqual(object.makeArray([2**63]).type, object.ERROR_OBJ)
+        self.assertEqual(object.makeArray([1.5, 10**400]).type, object.ERROR_OBJ)
+
+    def test_booleans(self):
+        """Test booleans are the two shared constants."""
+        self.assertIs(object.makeBoolean(True), object.CONST_TRUE)
+        self.assertIs(object.makeBoolean(0), object.CONST_FALSE)
+
+        two = [object.Number(2), object.Number(2)]
+        self.assertIs(BUILTINS["eq"](two), object.CONST_TRUE)
+        self.assertIs(BUILTINS["lt"](two), object.CONST_FALSE)
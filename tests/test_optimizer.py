@@ -0,0 +1,91 @@
+"""Test the optimizer."""
+
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from bsharp import ast
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.lexer import Lexer
+from bsharp.optimizer import Optimizer, source
+from bsharp.parser import Parser
+from tests.test_closures import PROGRAMS
+
+
+def parse(input: str) -> ast.Program:
+    """Parse the input into a Program."""
+    return Parser(Lexer(input)).parse_program()
+
+
+class TestOptimizer(TestCase):
+    """Test the optimizer."""
+
+    def assertFolded(self, input: str, expected: str) -> Optimizer:
+        """Assert the folded program has the expected source."""
+        optimizer = Optimizer()
+        self.assertEqual(source(optimizer.optimize(parse(input))), expected)
+        return optimizer
+
+    def test_fold_builtins(self):
+        """Test pure builtins on literals are folded, nested calls first."""
+        optimizer = self.assertFolded("(+ 1 (* 2 3)) (- 5)", "7\n-5")
+
+        self.assertEqual(
+            optimizer.report(), "(* 2 3) => 6\n(+ 1 (* 2 3)) => 7\n(- 5) => -5"
+        )
+        self.assertFolded("(+ 1 1.5) (/ 7.0 2)", "2.5\n3.5")
+
+    def test_fold_inside(self):
+        """Test constant expressions inside functions, arrays and set are folded."""
+        self.assertFolded(
+            "(fn f [x] (+ x (/ 10 2))) [(- 5) (* 2 2)] (set a (+ 1 1))",
+            "(fn f [x] (+ x 5))\n[-5 4]\n(set a 2)",
+        )
+
+    def test_fold_if(self):
+        """Test a if on a constant condition is replaced by the branch it takes."""
+        self.assertFolded('(if (lt 1 2) "yes" "no")', '"yes"')
+        self.assertFolded("(if (gt 1 2) x (+ 1 1))", "2")
+        self.assertFolded("(if (gt 1 2) 1)", "(if (gt 1 2) 1)")
+        self.assertFolded("(if x 1 2)", "(if x 1 2)")
+
+    def test_not_folded(self):
+        """Test errors, booleans, impure and redeclared builtins are not folded."""
+        inputs = [
+            "(/ 1 0)",
+            '(+ 1 "a")',
+            "(lt 1 2)",
+            "(print 1)",
+            "(+ 1 x)",
+            "(+ 1 1.2.3)",
+            "(* 100000000000000000.0 1)",
+            "(eq 1 1) (fn eq [a b] a)",
+        ]
+
+        for input in inputs:
+            optimizer = self.assertFolded(input, source(parse(input)))
+            self.assertEqual(optimizer.folded, [], input)
+
+    def test_same_results(self):
+        """Test folded programs give the same results as the original ones."""
+        inputs = PROGRAMS + [
+            "(set a (+ 1 (* 2 3))) (* a (- 10 (/ 9 3)))",
+            '(if (eq "a" "a") (print "same") (print "different"))',
+            "(fn f [n] (if (lt 1 2) (+ n (* 2 2)) 0)) (f 1)",
+            "(fn lt [a b] 5) (if (lt 1 2) 1 2)",
+        ]
+
+        for input in inputs:
+            expectedOutput = io.StringIO()
+            with redirect_stdout(expectedOutput):
+                expected = Evaluator().eval(parse(input), Environment())
+
+            actualOutput = io.StringIO()
+            with redirect_stdout(actualOutput):
+                program = Optimizer().optimize(parse(input))
+                actual = Evaluator().eval(program, Environment())
+
+            self.assertEqual(expected.type, actual.type, input)
+            self.assertEqual(expected.value, actual.value, input)
+            self.assertEqual(expectedOutput.getvalue(), actualOutput.getvalue())
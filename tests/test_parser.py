@@ -1,9 +1,9 @@
 """Test the bsharp parser."""
 
 from unittest import TestCase
-from bsharp.lexer import Lexer
+from bsharp.lexer import BACKEND_REGEX, Lexer
 from bsharp import token
-from bsharp.parser import Parser
+from bsharp.parser import MODE_ITERATIVE, MODE_RECURSIVE, Parser
 from bsharp import ast
 
 
@@ -140,6 +140,14 @@ class TestParser(TestCase):
         self.assertEqual(statement.value, "1")
         self.assertEqual(statement.token.getValue(), "1")
 
+    def test_malformed_number(self):
+        """Test a literal which is not a number is a error, in every mode."""
+        for mode in (MODE_RECURSIVE, MODE_ITERATIVE):
+            parser = Parser(Lexer("(+ 1 1.2.3) [1.2.3]"), mode=mode)
+            parser.parse_program()
+
+            self.assertEqual(parser.errors, ["Cannot parse 1.2.3 as a number."] * 2)
+
     def test_string_expression(self):
         """Test simple function calls."""
         input = '"hello"'
@@ -375,3 +383,69 @@ class TestParser(TestCase):
         self.assertIsInstance(subargs[0], ast.IdentifierExpression)
 
         self.assertEqual(subargs[0].value, "reallygoodvariable")
+
+    def test_packed_tokens(self):
+        """Test parsing packed tokens gives the same tree."""
+        input = '(fn foo [x y] (+ x 10)) ["hello" 1]'
+
+        parser = Parser(Lexer(input).packTokens())
+        program = parser.parse_program()
+
+        self.assertEqual(parser.errors, [])
+        self.assertEqual(len(program.expressions), 2)
+
+        statement = program.expressions[0]
+
+        self.assertIsInstance(statement, ast.FunctionExpression)
+        self.assertEqual(statement.function.getValue(), "foo")
+        self.assertEqual([arg.value for arg in statement.args], ["x", "y"])
+        self.assertEqual(statement.body[0].function.getType(), token.PLUS)
+        self.assertEqual(statement.body[0].args[1].value, "10")
+
+        statement = program.expressions[1]
+
+        self.assertIsInstance(statement, ast.ArrayExpression)
+        self.assertEqual(statement.elements[0].value, "hello")
+
+    def test_iterative_mode(self):
+        """Test the iterative mode builds the same tree and errors as the recursive mode."""
+        inputs = [
+            """ (+  (* variable 2) othervariable (sin reallygoodvariable)) """,
+            '(fn foo [x y] (+ x [1 "two" three]) 10) [1 [2 [3]]] "hello" 5',
+            "(fn foo [x 1] 10) (fn bar 1 2)",
+            "(1 2) ) [1 ) 2] (+ 1 (",
+            "(fn foo [x] (+ x",
+        ]
+
+        for input in inputs:
+            recursive = Parser(Lexer(input), mode=MODE_RECURSIVE)
+            iterative = Parser(Lexer(input), mode=MODE_ITERATIVE)
+
+            self.assertEqual(
+                repr(recursive.parse_program()), repr(iterative.parse_program())
+            )
+            self.assertEqual(recursive.errors, iterative.errors)
+
+    def test_iterative_deep_nesting(self):
+        """Test the iterative mode is not limited by the recursion limit."""
+        depth = 100_000
+        input = "(+ 1 " * depth + "[2]" + ")" * depth
+
+        parser = Parser(Lexer(input, backend=BACKEND_REGEX), mode=MODE_ITERATIVE)
+        program = parser.parse_program()
+
+        self.assertEqual(parser.errors, [])
+        self.assertEqual(len(program.expressions), 1)
+
+        statement = program.expressions[0]
+        for _ in range(depth - 1):
+            self.assertEqual(len(statement.args), 2)
+            statement = statement.args[1]
+
+        self.assertIsInstance(statement.args[1], ast.ArrayExpression)
+        self.assertEqual(statement.args[1].elements[0].value, "2")
+
+    def test_unknown_mode(self):
+        """Test an unknown mode is rejected."""
+        with self.assertRaises(ValueError):
+            Parser(Lexer("1"), mode="unknown")
@@ -0,0 +1,76 @@
+"""Test profiling the calls of a Program."""
+
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from bsharp.environment import Environment
+from bsharp.lexer import Lexer
+from bsharp.parser import Parser
+from bsharp.profiler import BUILTIN, Profiler
+
+SOURCE = """(fn fib [n]
+  (if (lt n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+(fn count [n total] (if (lt n 1) total (count (- n 1) (+ total n))))
+(fn shout [x] (upper x))
+(print (fib 10) (count 100 0) (len (concat (shout "a") "fn")))
+"""
+
+
+class TestProfiler(TestCase):
+    """Test profiling the calls of a Program."""
+
+    def setUp(self):
+        """Profile the source."""
+        program = Parser(Lexer(SOURCE)).parse_program()
+        self.profiler = Profiler()
+        self.profiler.locate(program, SOURCE, "script.bs")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.profiler.eval(program, Environment())
+        self.assertEqual(output.getvalue(), "55 5050 3\n")
+
+    def test_calls(self):
+        """Test every function is counted by name and location, tail calls too."""
+        calls = {key: entry[0] for key, entry in self.profiler.entries.items()}
+
+        self.assertEqual(calls[("fib", "script.bs:1")], 177)
+        self.assertEqual(calls[("count", "script.bs:3")], 101)
+        self.assertEqual(calls[("shout", "script.bs:4")], 1)
+        self.assertEqual(calls[("upper", BUILTIN)], 1)
+        self.assertEqual(calls[("lt", BUILTIN)], 177 + 101)
+
+    def test_times(self):
+        """Test the cumulative time of a function is the self time of it's stacks."""
+        entries = self.profiler.entries
+        for key in (("fib", "script.bs:1"), ("count", "script.bs:3")):
+            _, own, cumulative = entries[key]
+            below = sum(
+                elapsed
+                for stack, elapsed in self.profiler.stacks.items()
+                if stack[0] == key
+            )
+            self.assertLessEqual(own, cumulative)
+            self.assertEqual(cumulative, below)
+
+    def test_stacks(self):
+        """Test the stacks are written in the collapsed format."""
+        self.profiler.stacks = {
+            (("count", "script.bs:3"),): 5000,
+            (("count", "script.bs:3"), ("lt", BUILTIN)): 2000,
+            (("print", BUILTIN),): 10,
+        }
+        self.assertEqual(
+            self.profiler.collapsed(),
+            "count (script.bs:3) 5\ncount (script.bs:3);lt (builtin) 2",
+        )
+
+    def test_report(self):
+        """Test the report lists the largest self time first."""
+        lines = self.profiler.report().splitlines()
+        own = [float(line.split()[1]) for line in lines[1:]]
+
+        self.assertIn("cumulative", lines[0])
+        self.assertEqual(own, sorted(own, reverse=True))
+        self.assertEqual(len(lines), len(self.profiler.entries) + 1)
@@ -0,0 +1,95 @@
+"""Test the resolver."""
+
+import gc
+from unittest import TestCase
+
+from bsharp import ast
+from bsharp.builtins import BUILTINS
+from bsharp.lexer import Lexer
+from bsharp.parser import Parser
+from bsharp.resolver import Resolver
+
+
+class TestResolver(TestCase):
+    """Test the resolver."""
+
+    def resolve(self, input: str) -> tuple[ast.Program, Resolver]:
+        """Parse and resolve the input."""
+        program = Parser(Lexer(input)).parse_program()
+        resolver = Resolver()
+        resolver.resolve(program)
+        return program, resolver
+
+    def test_parameters(self):
+        """Test parameters take the first slots of the function."""
+        program, resolver = self.resolve("(fn add [x y] (+ y x))")
+        declaration = program.expressions[0]
+        y, x = declaration.body[0].args
+
+        self.assertEqual(resolver.slots[x], (0, 0))
+        self.assertEqual(resolver.slots[y], (0, 1))
+        self.assertEqual(resolver.sizes[declaration], 2)
+
+    def test_globals(self):
+        """Test variables outside of every function get no slot."""
+        program, resolver = self.resolve("(set x 1) x (fn f [] x)")
+        target = program.expressions[0].args[0]
+        reference = program.expressions[1]
+        inside = program.expressions[2].body[0]
+
+        for ex in (target, reference, inside):
+            self.assertNotIn(ex, resolver.slots)
+
+    def test_set_binds_from_there_on(self):
+        """Test a set binds a new slot only for the rest of the function."""
+        program, resolver = self.resolve("(fn f [a] x (set x a) x)")
+        declaration = program.expressions[0]
+        before, assign, after = declaration.body
+
+        self.assertNotIn(before, resolver.slots)
+        self.assertEqual(resolver.slots[assign.args[1]], (0, 0))
+        self.assertEqual(resolver.slots[assign.args[0]], (0, 1))
+        self.assertEqual(resolver.slots[after], (0, 1))
+        self.assertEqual(resolver.sizes[declaration], 2)
+
+    def test_enclosing_function(self):
+        """Test a nested function refers to the slots of the enclosing one."""
+        program, resolver = self.resolve("(fn outer [a] (fn inner [b] (+ a b)))")
+        inner = program.expressions[0].body[0]
+        a, b = inner.body[0].args
+
+        self.assertEqual(resolver.slots[a], (1, 0))
+        self.assertEqual(resolver.slots[b], (0, 0))
+
+    def test_size_of_unresolved_function(self):
+        """Test a function is resolved on it's own when needed."""
+        program = Parser(Lexer("(fn f [a] (set b a) b)")).parse_program()
+        declaration = program.expressions[0]
+
+        self.assertEqual(Resolver().sizeOf(declaration), 2)
+
+    def test_builtins(self):
+        """Test calls to builtins are resolved, unless the name is redeclared."""
+        program, resolver = self.resolve(
+            "(+ 1 (f 2)) (fn f [x] (* x (eq x 1))) (eq 1 1) (fn eq [a b] a)"
+        )
+        add, declaration, equal, _ = program.expressions
+        multiply = declaration.body[0]
+
+        self.assertIs(resolver.builtins[add], BUILTINS["+"])
+        self.assertIs(resolver.builtins[multiply], BUILTINS["*"])
+        self.assertNotIn(add.args[1], resolver.builtins)
+        self.assertNotIn(equal, resolver.builtins)
+        self.assertNotIn(multiply.args[1], resolver.builtins)
+
+    def test_collected_program(self):
+        """Test a collected Program is forgotten, the functions it declared are not."""
+        program, resolver = self.resolve('(fn f [x] (+ x 1)) (print (len "a"))')
+        add = program.expressions[0].body[0]
+        self.assertEqual(len(resolver.builtins), 3)
+
+        del program
+        gc.collect()
+
+        self.assertEqual(len(resolver.programs), 0)
+        self.assertEqual(list(resolver.builtins), [add])
@@ -0,0 +1,59 @@
+"""Test every stage scales linearly with the size of it's input."""
+
+import os
+import unittest
+from unittest import TestCase
+
+from bsharp import parser
+from benchmarks import suite
+from benchmarks.bench_parser import TokenReplay, lex
+
+
+class TestScaling(TestCase):
+    """Test every stage scales linearly on the quick benchmark workloads."""
+
+    def units(self, source: str, evaluate: bool) -> dict[str, int]:
+        """Return the units of the source, parsed like the suite does."""
+        replay = TokenReplay(lex(source))
+        program = parser.Parser(replay, mode=parser.MODE_ITERATIVE).parse_program()
+        return suite.units(source, program, evaluate)
+
+    def test_units(self):
+        """Test the bytes, nodes parsed, calls made and nodes evaluated per size.
+
+        The work done per unit of size of no workload grows with the size,
+        counted rather than timed so the test does not depend on the machine.
+        """
+        for name, (generate, size, evaluate) in suite.WORKLOADS.items():
+            size //= suite.QUICK
+            small = self.units(generate(size), evaluate)
+            large = self.units(generate(size * suite.GROWTH), evaluate)
+
+            for unit in small:
+                growth = large[unit] / small[unit] / suite.GROWTH
+                self.assertLessEqual(growth, suite.TOLERANCE, f"{name} {unit}")
+
+    @unittest.skipUnless(
+        os.environ.get("BSHARP_BENCHMARKS"), "timings, set BSHARP_BENCHMARKS to run"
+    )
+    def test_linear(self):
+        """Test the cost per unit of no stage grows with the input.
+
+        A workload found not linear is measured again once, timings are noisy.
+        """
+        workloads = {}
+        for name in suite.WORKLOADS:
+            workloads[name] = suite.run_workload(name, quick=True)
+            if suite.nonlinear({"workloads": {name: workloads[name]}}):
+                workloads[name] = suite.run_workload(name, quick=True)
+        self.assertEqual(suite.nonlinear({"workloads": workloads}), [])
+
+    def test_regressions(self):
+        """Test rates below the baseline by more than the threshold are reported."""
+        baseline = {"workloads": {"wide": {"lexer_mb_s": 2.0, "parser_nodes_s": 10}}}
+        results = {"workloads": {"wide": {"lexer_mb_s": 1.5, "parser_nodes_s": 9}}}
+
+        self.assertEqual(
+            suite.regressions(results, baseline, 0.2),
+            ["wide lexer_mb_s: -25% against the baseline"],
+        )
@@ -0,0 +1,76 @@
+"""Test running commands with the sh, pipe and run builtins."""
+
+import io
+import shutil
+from contextlib import redirect_stdout
+from unittest import TestCase, skipUnless
+
+from bsharp import object
+from bsharp.builtins import BUILTINS
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.lexer import Lexer
+from bsharp.parser import Parser
+from bsharp.shell import Process
+
+
+def evaluate(input: str) -> tuple[object.Object, str]:
+    """Return the value of the input and what it printed."""
+    program = Parser(Lexer(input)).parse_program()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        value = Evaluator().eval(program, Environment())
+    return value, output.getvalue()
+
+
+@skipUnless(shutil.which("sort") and shutil.which("yes"), "needs POSIX commands")
+class TestShell(TestCase):
+    """Test running commands with the sh, pipe and run builtins."""
+
+    def test_sh(self):
+        """Test the lines of a command are read as a Sequence."""
+        value, _ = evaluate('(array (map "number" (sh "printf" "1\\n2\\n%s" 3)))')
+        self.assertEqual(repr(value), "[1 2 3]")
+
+        value, _ = evaluate('(sh "no-such-command")')
+        self.assertEqual(value.type, object.ERROR_OBJ)
+
+    def test_pipe(self):
+        """Test elements and the lines of commands are piped to a command."""
+        _, output = evaluate('(print (pipe [3 1 2] "sort" "-n"))')
+        self.assertEqual(output, "1\n2\n3\n")
+
+        _, output = evaluate(
+            '(fn shout [x] (upper x)) (print (map "shout" (pipe (sh "printf" "b\\na") '
+            '"sort")))'
+        )
+        self.assertEqual(output, "A\nB\n")
+
+        value, _ = evaluate('(array (pipe [1 "a"] "cat"))')
+        self.assertEqual(value.type, object.ERROR_OBJ)
+
+    def test_connected(self):
+        """Test the lines of a command not read yet go straight to the next one."""
+        first = BUILTINS["sh"]([object.String("echo"), object.String("a")])
+        second = BUILTINS["pipe"]([first, object.String("cat")])
+
+        self.assertIs(type(first.value), Process)
+        self.assertIs(second.value.upstream, first.value)
+        self.assertIsNone(second.value.process.stdin)
+        self.assertEqual([line.value for line in second.value], ["a"])
+
+    def test_stop_early(self):
+        """Test a endless command is stopped once it's lines are no longer read."""
+        lines = BUILTINS["sh"]([object.String("yes")])
+        process = lines.value.process
+
+        taken = BUILTINS["take"]([object.makeNumber(2), lines])
+        self.assertEqual([line.value for line in taken.value], ["y", "y"])
+        del taken, lines
+
+        self.assertIsNotNone(process.poll())
+
+    def test_run(self):
+        """Test run waits for the command and returns it's status."""
+        value, _ = evaluate('(+ (run "true") (run "false"))')
+        self.assertEqual(value.value, 1)
@@ -0,0 +1,112 @@
+"""Test running a expression for every line of a input."""
+
+import io
+from unittest import TestCase
+
+from bsharp import stream
+from bsharp.stream import Stream
+
+LINES = ["apple 3", "banana 12", "cherry 7"]
+
+
+class TestStream(TestCase):
+    """Test running a expression for every line of a input."""
+
+    def assertOutputs(self, expression: str, expected: list[str]) -> Stream:
+        """Assert the outputs of the expression for every line of LINES."""
+        lines = Stream(expression)
+        self.assertEqual(list(lines.outputs(LINES)), expected, expression)
+        self.assertEqual(lines.errors, [])
+        return lines
+
+    def test_outputs(self):
+        """Test the value of every line is the output, the line for true."""
+        self.assertOutputs("(upper (field line 1))", ["APPLE", "BANANA", "CHERRY"])
+        self.assertOutputs("(concat nr line)", ["1apple 3", "2banana 12", "3cherry 7"])
+        self.assertOutputs('(contains line "an")', ["banana 12"])
+        self.assertOutputs(
+            "(if (gt (number (field line 2)) 5) (field line 1))", ["banana", "cherry"]
+        )
+
+    def test_environment_kept(self):
+        """Test functions and variables are kept for the next lines."""
+        self.assertOutputs(
+            "(fn twice [x] (* 2 x)) (twice (number (field line 2)))",
+            ["6", "24", "14"],
+        )
+        self.assertOutputs("(set last line) (field last 2)", ["3", "12", "7"])
+
+    def test_errors(self):
+        """Test a error stops the stream, parse errors stop it before any line."""
+        lines = Stream("(number (field line 1))")
+        self.assertEqual(list(lines.outputs(LINES, start=10)), [])
+        self.assertEqual(
+            lines.errors, ["line 10: ERROR: Cannot convert 'apple' to a number"]
+        )
+
+        lines = Stream("(+ 1")
+        self.assertEqual(list(lines.outputs(LINES)), [])
+        self.assertNotEqual(lines.errors, [])
+
+    def test_parallel(self):
+        """Test chunks run in worker processes keep the order of the input."""
+        lines = [f"line {index}" for index in range(100)]
+        expected = list(Stream("(field line 2)").outputs(lines))
+
+        parallel = Stream("(field line 2)")
+        outputs = stream.parallel_outputs(parallel, lines, workers=3, chunkSize=7)
+        self.assertEqual(list(outputs), expected)
+        self.assertEqual(parallel.errors, [])
+
+        parallel = Stream('(if (eq nr 50) missing "ok")')
+        outputs = stream.parallel_outputs(parallel, lines, workers=2, chunkSize=10)
+        self.assertEqual(list(outputs), ["ok"] * 49)
+        self.assertEqual(
+            parallel.errors, ["line 50: ERROR: No variable named missing found"]
+        )
+
+    def test_chunked(self):
+        """Test lines are chunked with the number of their first line."""
+        self.assertEqual(
+            list(stream.chunked("abcde", 2)),
+            [(1, ["a", "b"]), (3, ["c", "d"]), (5, ["e"])],
+        )
+
+    def test_read_write(self):
+        """Test lines are read without line breaks and written in batches."""
+        input = io.StringIO("a\n\nc")
+        self.assertEqual(list(stream.read_lines(input)), ["a", "", "c"])
+
+        output = io.StringIO()
+        stream.write_batched(map(str, range(5)), output, batchSize=2)
+        self.assertEqual(output.getvalue(), "0\n1\n2\n3\n4\n")
+
+    def test_printed(self):
+        """Test what a line prints is output in order with the values of the lines."""
+        self.assertOutputs(
+            '(print "got" nr) line',
+            ["got 1", LINES[0], "got 2", LINES[1], "got 3", LINES[2]],
+        )
+
+        output = io.StringIO()
+        self.assertEqual(stream.run('(print "got") line', ["a", "b"], output), 0)
+        self.assertEqual(output.getvalue(), "got\na\ngot\nb\n")
+
+    def test_parallel_printed(self):
+        """Test what a line prints in a worker is output in order with the lines."""
+        parallel = Stream('(print "got" nr) line')
+        outputs = stream.parallel_outputs(parallel, LINES, workers=2, chunkSize=1)
+        self.assertEqual(
+            list(outputs),
+            ["got 1", LINES[0], "got 2", LINES[1], "got 3", LINES[2]],
+        )
+
+    def test_run(self):
+        """Test the exit status of a run."""
+        output = io.StringIO()
+        self.assertEqual(stream.run("(field line 2)", LINES, output), 0)
+        self.assertEqual(output.getvalue(), "3\n12\n7\n")
+
+        output = io.StringIO()
+        self.assertEqual(stream.run("(field line 2)", LINES, output, 2, 1), 0)
+        self.assertEqual(output.getvalue(), "3\n12\n7\n")
@@ -0,0 +1,74 @@
+"""Test the bytecode compiler and the virtual machine."""
+
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from bsharp import compiler
+from bsharp.compiler import Compiler
+from bsharp.environment import Environment
+from bsharp.evaluator import Evaluator
+from bsharp.lexer import Lexer
+from bsharp.parser import Parser
+from bsharp.vm import VM, disassemble
+from tests.test_closures import PROGRAMS
+
+
+def compile(input: str) -> compiler.Code:
+    """Parse and compile the input."""
+    return Compiler().compile(Parser(Lexer(input)).parse_program())
+
+
+class TestVM(TestCase):
+    """Test the bytecode compiler and the virtual machine."""
+
+    def assertSameResult(self, input: str) -> None:
+        """Assert the virtual machine and the evaluator give the same result."""
+        program = Parser(Lexer(input)).parse_program()
+
+        expectedOutput = io.StringIO()
+        with redirect_stdout(expectedOutput):
+            expected = Evaluator().eval(program, Environment())
+
+        actualOutput = io.StringIO()
+        with redirect_stdout(actualOutput):
+            actual = VM().run(Compiler().compile(program), Environment())
+
+        self.assertEqual(expected.type, actual.type, input)
+        self.assertEqual(expected.value, actual.value, input)
+        self.assertEqual(expectedOutput.getvalue(), actualOutput.getvalue(), input)
+
+    def test_same_results(self):
+        """Test every program gives the same result as the evaluator."""
+        for input in PROGRAMS:
+            self.assertSameResult(input)
+
+    def test_deep_recursion(self):
+        """Test recursion deeper than the Python stack."""
+        code = compile(
+            "(fn count [n] (if (eq n 0) 0 (+ 1 (count (- n 1))))) (count 5000)"
+        )
+        self.assertEqual(VM().run(code, Environment()).value, 5000)
+
+    def test_disassemble(self):
+        """Test the listing of the code and of the declared functions."""
+        code = compile("(fn double [x] (* x 2)) (double 21)")
+
+        expected = "\n".join(
+            [
+                "<program>:",
+                "     0 DEFINE         0      (<Function double>)",
+                "     1 POP",
+                "     2 CHECK_FUNCTION 0      (double, else to 5)",
+                "     3 CONST          1      (21)",
+                "     4 CALL           0      (double, 1 arguments)",
+                "     5 RETURN",
+                "",
+                "double:",
+                "     0 LOAD_LOCAL     0      (x)",
+                "     1 CONST          0      (2)",
+                "     2 CALL_BUILTIN   1      (*, 2 arguments)",
+                "     3 RETURN",
+            ]
+        )
+        self.assertEqual(disassemble(code), expected)